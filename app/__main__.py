@@ -1,69 +1,72 @@
+from application import build_application
 from dotenv import load_dotenv
-from handlers.callback.todo_actions import todo_actions_handler
-from handlers.callback.todo_details import todo_details_handler
-from handlers.command.help import help_handler
-from handlers.command.news import news_handler
-from handlers.command.todos import todos_handler
-from handlers.command.weather import weather_handler
-from handlers.conversation.start import start_handler
-from handlers.conversation.set_location import set_location_handler
-from handlers.conversation.todo import create_todo_handler
-from handlers.message_reaction.todo import message_reaction_handler
-from handlers.post_init.post_init import post_init
+from logging_config import configure_logging
 from os import getenv
-from telegram import LinkPreviewOptions, Update
-from telegram.constants import ParseMode
-from telegram.ext import ApplicationBuilder, Defaults
+from re import fullmatch
+from sharding.shard import WORKERS
+from sharding.workers import build_ingress_application
+from telegram import Update
 
 
 # Load environment variables from local .env
 load_dotenv()
 
+# Get the specified .env variables
+# Ingress mode of the updates: "polling" (default), or "webhook"
+BOT_MODE: str = getenv("BOT_MODE", "polling")
+
+# Webhook settings (used only in webhook mode)
+# The webhook server listens on WEBHOOK_LISTEN:WEBHOOK_PORT/WEBHOOK_URL_PATH,
+# and Telegram is told to send the updates to WEBHOOK_URL (the public URL of the server).
+# The requests without the secret token in the
+# "X-Telegram-Bot-Api-Secret-Token" header are rejected,
+# so the bot refuses to start in webhook mode without a valid one
+WEBHOOK_LISTEN: str = getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT: int = int(getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_URL_PATH: str = getenv("WEBHOOK_URL_PATH", "webhook")
+WEBHOOK_URL: str = getenv("WEBHOOK_URL")
+WEBHOOK_SECRET_TOKEN: str = getenv("WEBHOOK_SECRET_TOKEN")
+WEBHOOK_MAX_CONNECTIONS: int = int(getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+
+# Configure the logs of the bot (and of the libraries)
+configure_logging()
+
 # If the bot token has been found and it is valorized
 if BOT_TOKEN := getenv("BOT_TOKEN"):
 
-    # Add default values to the bot settings
-    defaults = Defaults(
-        parse_mode=ParseMode.HTML,
-        link_preview_options=LinkPreviewOptions(is_disabled=True))
-    
     # Create the app
-    app = ApplicationBuilder() \
-        .token(BOT_TOKEN) \
-        .post_init(post_init=post_init) \
-        .defaults(defaults=defaults) \
-        .build()
-    
-    
-    # ----------  (callback) ----------
-    app.add_handler(handler=todo_details_handler)
+    # With multiple workers, this process only receives the updates,
+    # and routes them to the worker processes (by Telegram user id)
+    if WORKERS > 1:
+        app = build_ingress_application(bot_token=BOT_TOKEN, workers=WORKERS)
+    else:
+        app = build_application(bot_token=BOT_TOKEN)
+
+    match BOT_MODE:
 
-    # ----------  (callback) ----------
-    app.add_handler(handler=todo_actions_handler)
-    
-    # ---------- (message reaction) ----------
-    app.add_handler(handler=message_reaction_handler)
+        case "webhook":
 
-    # ---------- /help (command) ----------
-    app.add_handler(handler=help_handler)
-    
-    # ---------- /news (command) ----------
-    app.add_handler(handler=news_handler)
-    
-    # ---------- /setlocation (conversation) ----------
-    app.add_handler(handler=set_location_handler)
-    
-    # ---------- /start (conversation) ----------
-    app.add_handler(handler=start_handler)
+            # Without the secret token, anybody knowing the webhook URL could send fake updates
+            if not (WEBHOOK_SECRET_TOKEN and fullmatch(r"[A-Za-z0-9_-]{1,256}", WEBHOOK_SECRET_TOKEN)):
+                raise SystemExit(
+                    "WEBHOOK_SECRET_TOKEN must be set in webhook mode "
+                    "(1-256 characters: letters, digits, \"_\" and \"-\")"
+                )
 
-    # ---------- /todo (conversation) ----------
-    app.add_handler(handler=create_todo_handler)
+            # Run the webhook server, allowing all the updates to be processed
+            # Every update is acknowledged (200) as soon as it's received and
+            # put in the application update queue, and then processed
+            app.run_webhook(
+                listen=WEBHOOK_LISTEN,
+                port=WEBHOOK_PORT,
+                url_path=WEBHOOK_URL_PATH,
+                webhook_url=WEBHOOK_URL,
+                secret_token=WEBHOOK_SECRET_TOKEN,
+                max_connections=WEBHOOK_MAX_CONNECTIONS,
+                allowed_updates=Update.ALL_TYPES
+            )
 
-    # ---------- /todos (command) ----------
-    app.add_handler(handler=todos_handler)
+        case _:
 
-    # ---------- /weather (command) ----------
-    app.add_handler(handler=weather_handler)
-    
-    # Run bot polling, allowing all the updates to be processed
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+            # Run bot polling, allowing all the updates to be processed
+            app.run_polling(allowed_updates=Update.ALL_TYPES)
@@ -0,0 +1,90 @@
+from clients.rate_limiter import PriorityRateLimiter
+from dotenv import load_dotenv
+from handlers.callback.todo_actions import todo_actions_handler
+from handlers.callback.todo_details import todo_details_handler
+from handlers.command.help import help_handler
+from handlers.command.news import news_handler
+from handlers.command.todos import todos_handler
+from handlers.command.weather import weather_handler
+from handlers.conversation.start import start_handler
+from handlers.conversation.set_location import set_location_handler
+from handlers.conversation.todo import create_todo_handler
+from handlers.message_reaction.todo import message_reaction_handler
+from handlers.post_init.post_init import post_init
+from handlers.post_shutdown.post_shutdown import post_shutdown
+from os import getenv
+from telegram import LinkPreviewOptions
+from telegram.constants import ParseMode
+from telegram.ext import Application, ApplicationBuilder, Defaults
+from updates.update_processor import PerUserUpdateProcessor
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Max number of updates processed at the same time
+# (the updates of the same user are always processed one at a time, in order)
+CONCURRENT_UPDATES: int = int(getenv("CONCURRENT_UPDATES", "64"))
+
+# Base URL of the Bot API (e.g. of a local Bot API server), if not the default one
+BOT_API_BASE_URL: str | None = getenv("BOT_API_BASE_URL")
+
+
+def build_application(bot_token: str, with_updater: bool = True) -> Application:
+
+    # Add default values to the bot settings
+    defaults = Defaults(
+        parse_mode=ParseMode.HTML,
+        link_preview_options=LinkPreviewOptions(is_disabled=True))
+    
+    # Create the app builder
+    app_builder = ApplicationBuilder() \
+        .token(bot_token) \
+        .post_init(post_init=post_init) \
+        .post_shutdown(post_shutdown=post_shutdown) \
+        .defaults(defaults=defaults) \
+        .concurrent_updates(PerUserUpdateProcessor(max_concurrent_updates=CONCURRENT_UPDATES)) \
+        .rate_limiter(PriorityRateLimiter())
+    
+    if BOT_API_BASE_URL:
+        app_builder = app_builder.base_url(base_url=BOT_API_BASE_URL)
+
+    # The workers don't fetch the updates (they're routed by the ingress process)
+    if not with_updater:
+        app_builder = app_builder.updater(None)
+
+    # Create the app
+    app = app_builder.build()
+    
+    
+    # ----------  (callback) ----------
+    app.add_handler(handler=todo_details_handler)
+
+    # ----------  (callback) ----------
+    app.add_handler(handler=todo_actions_handler)
+    
+    # ---------- (message reaction) ----------
+    app.add_handler(handler=message_reaction_handler)
+
+    # ---------- /help (command) ----------
+    app.add_handler(handler=help_handler)
+    
+    # ---------- /news (command) ----------
+    app.add_handler(handler=news_handler)
+    
+    # ---------- /setlocation (conversation) ----------
+    app.add_handler(handler=set_location_handler)
+    
+    # ---------- /start (conversation) ----------
+    app.add_handler(handler=start_handler)
+
+    # ---------- /todo (conversation) ----------
+    app.add_handler(handler=create_todo_handler)
+
+    # ---------- /todos (command) ----------
+    app.add_handler(handler=todos_handler)
+
+    # ---------- /weather (command) ----------
+    app.add_handler(handler=weather_handler)
+
+    return app
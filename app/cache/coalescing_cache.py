@@ -0,0 +1,90 @@
+from asyncio import Task, create_task, shield
+from cache.ttl_cache import TTLCache
+from typing import Any, Awaitable, Callable, Hashable
+
+
+# Sentinel for the missing entries (since None is a valid value)
+MISSING = object()
+
+
+class CoalescingCache:
+
+    # TTL cache for values loaded from an upstream service, with request coalescing:
+    # concurrent misses for the same key trigger exactly one upstream call,
+    # and all the callers wait for (and share) its result
+    
+    def __init__(self, maxsize: int, ttl: float) -> None:
+
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        # Loads in progress, by key
+        self._in_flight: dict[Hashable, Task] = {}
+
+        # Counters for monitoring
+        self.loads: int = 0
+        self.coalesced: int = 0
+
+    async def get_or_load(
+        self, 
+        key: Hashable, 
+        loader: Callable[[], Awaitable[Any]], 
+        ttl: float | None = None
+    ) -> Any:
+
+        # Serve the value from the cache, if present
+        if (value := self.cache.get(key, MISSING)) is not MISSING:
+            return value
+        
+        # The task is shielded, so that a cancelled caller
+        # doesn't cancel the load for the other ones
+        return await shield(self._start_load(key=key, loader=loader, ttl=ttl))
+
+    def _start_load(
+        self, 
+        key: Hashable, 
+        loader: Callable[[], Awaitable[Any]], 
+        ttl: float | None
+    ) -> Task:
+
+        # If there isn't a load in progress for the key, start it
+        if (task := self._in_flight.get(key)) is None:
+            self.loads += 1
+
+            task = create_task(self._load(key=key, loader=loader, ttl=ttl))
+            self._in_flight[key] = task
+
+        # Otherwise, join the one in progress
+        else:
+            self.coalesced += 1
+
+        return task
+    
+    async def _load(
+        self, 
+        key: Hashable, 
+        loader: Callable[[], Awaitable[Any]], 
+        ttl: float | None
+    ) -> Any:
+
+        try:
+            value = await loader()
+
+            # Failed loads (None) are not cached
+            if value is not None:
+                self._store(key=key, value=value, ttl=ttl)
+
+            return value
+        
+        finally:
+            self._in_flight.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any, ttl: float | None) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats,
+            "loads": self.loads,
+            "coalesced": self.coalesced
+        }
@@ -0,0 +1,113 @@
+from asyncio import Task, shield
+from cache.coalescing_cache import MISSING, CoalescingCache
+from collections import Counter
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class StaleWhileRevalidateCache(CoalescingCache):
+
+    # Coalescing cache whose entries stay fresh for "ttl" seconds,
+    # and can then be served stale for "stale_ttl" more seconds:
+    # a stale hit returns the cached value immediately, and refreshes it
+    # in the background (only one refresh per key is in progress at a time).
+    # The requests are counted by key, so that the most requested entries
+    # can be refreshed ahead of their expiration
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float) -> None:
+
+        # The entries are kept until they can't be served stale anymore
+        super().__init__(maxsize=maxsize, ttl=ttl + stale_ttl)
+
+        self.fresh_ttl: float = ttl
+        self.stale_ttl: float = stale_ttl
+
+        # Number of requests, by key
+        self.requests: Counter = Counter()
+
+        # Counters for monitoring
+        self.stale_hits: int = 0
+        self.refreshes: int = 0
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None
+    ) -> Any:
+
+        self.requests[key] += 1
+
+        # If the entry is present, serve it (even if stale)
+        if (entry := self.cache.get(key, MISSING)) is not MISSING:
+
+            fresh_until, value = entry
+
+            # If the entry is stale, refresh it in the background
+            if fresh_until <= monotonic():
+                self.stale_hits += 1
+                self.refresh(key=key, loader=loader, ttl=ttl)
+
+            return value
+
+        # Otherwise, load it (joining the load in progress, if any)
+        return await shield(self._start_load(key=key, loader=loader, ttl=ttl))
+
+    def refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None
+    ) -> Task:
+
+        # Start (or join) the load of the key, without waiting for it
+        if key not in self._in_flight:
+            self.refreshes += 1
+
+        task = self._start_load(key=key, loader=loader, ttl=ttl)
+
+        # The refreshes are not awaited by the callers, so their failures
+        # are retrieved here (the stale value is kept until it expires)
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+        return task
+
+    def most_requested_expiring(self, count: int, within: float) -> list:
+
+        # Get the most requested keys (up to count) that are cached,
+        # and whose entry won't be fresh anymore in the next "within" seconds
+        expiring_before: float = monotonic() + within
+
+        return [
+            key
+            for key, _ in self.requests.most_common(count)
+            if (entry := self.cache.peek(key, MISSING)) is not MISSING
+            and entry[0] <= expiring_before
+        ]
+
+    def decay_requests(self) -> None:
+
+        # Halve the request counters (dropping the keys that reach zero),
+        # so that the ranking follows the recent requests,
+        # and the counters don't grow without bounds
+        self.requests = Counter({
+            key: requests // 2
+            for key, requests in self.requests.items()
+            if requests > 1
+        })
+
+    def _store(self, key: Hashable, value: Any, ttl: float | None) -> None:
+
+        ttl = self.fresh_ttl if ttl is None else ttl
+
+        # Store the value with the time until which it's fresh
+        self.cache.set(key, (monotonic() + ttl, value), ttl=ttl + self.stale_ttl)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            **super().stats,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "tracked_keys": len(self.requests)
+        }
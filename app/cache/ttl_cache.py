@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable
+
+
+class TTLCache:
+
+    # Bounded in-memory cache, with LRU eviction and a time-to-live for every entry.
+    # It's not thread-safe, but it doesn't need to be, since all the handlers
+    # and jobs run in the same event loop
+    
+    def __init__(self, maxsize: int, ttl: float) -> None:
+
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+
+        # Entries are stored as key: (expires_at, value),
+        # ordered from the least to the most recently used
+        self._entries: OrderedDict = OrderedDict()
+
+        # Counters for monitoring
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+
+        # If the key is present
+        if (entry := self._entries.get(key)) is not None:
+
+            expires_at, value = entry
+
+            # If the entry didn't expire, mark it as the most recently used
+            if expires_at > monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+                return value
+            
+            # Otherwise, drop it
+            del self._entries[key]
+        
+        self.misses += 1
+
+        return default
+    
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+
+        # Calculate the expiration time of the entry
+        expires_at: float = monotonic() + (self.ttl if ttl is None else ttl)
+
+        # Add (or replace) the entry, as the most recently used
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        # Evict the least recently used entries, if the cache is full
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+
+        # Lookup without touching the counters or the LRU order
+        if (entry := self._entries.get(key)) is not None and entry[0] > monotonic():
+            return entry[1]
+        
+        return default
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+
+        # Remove the entry (if present), without touching the counters
+        if (entry := self._entries.pop(key, None)) is not None:
+            return entry[1]
+        
+        return default
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        
+        # Membership test without touching the counters or the LRU order
+        entry = self._entries.get(key)
+
+        return entry is not None and entry[0] > monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+
+        # Total number of lookups
+        lookups: int = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
+        }
@@ -0,0 +1,62 @@
+from asyncio import Semaphore
+from dotenv import load_dotenv
+from httpx import AsyncClient, Limits, Response, Timeout, URL
+from os import getenv
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+HTTP_MAX_CONNECTIONS: int = int(getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_MAX_CONNECTIONS_PER_HOST: int = int(getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+HTTP_TIMEOUT: float = float(getenv("HTTP_TIMEOUT", "10"))
+HTTP2: bool = getenv("HTTP2", "True") == "True"
+
+# Shared HTTP client (created at the first request, and closed on shutdown)
+http_client: AsyncClient | None = None
+
+# Semaphores limiting the concurrent requests towards every host
+host_semaphores: dict[str, Semaphore] = {}
+
+
+def get_http_client() -> AsyncClient:
+
+    global http_client
+
+    # Create the client, if it doesn't exist (or it has been closed)
+    if http_client is None or http_client.is_closed:
+
+        http_client = AsyncClient(
+            http2=HTTP2,
+            follow_redirects=True,
+            timeout=Timeout(timeout=HTTP_TIMEOUT),
+            limits=Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+
+    return http_client
+
+
+async def http_get(url: str, params: dict | None = None) -> Response:
+
+    # Get the semaphore of the host (creating it, if needed)
+    host: str = URL(url).host
+    semaphore = host_semaphores.setdefault(host, Semaphore(value=HTTP_MAX_CONNECTIONS_PER_HOST))
+
+    # Send the request through the shared client,
+    # waiting for a free slot for the host
+    async with semaphore:
+        return await get_http_client().get(url=url, params=params)
+
+
+async def close_http_client() -> None:
+
+    global http_client
+
+    # Close the client (and all its pooled connections)
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
@@ -0,0 +1,256 @@
+from asyncio import Future, Task, create_task, get_running_loop, sleep
+from dotenv import load_dotenv
+from enum import IntEnum
+from heapq import heappop, heappush
+from itertools import count
+from os import getenv
+from sharding.shard import WORKERS
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+from time import monotonic
+from typing import Any, Callable, Coroutine
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Telegram limits: ~30 messages per second overall, ~1 message per second
+# in the same private chat, and ~20 messages per minute in the same group.
+# With multiple workers, the global limit is split among them
+RATE_LIMIT_GLOBAL: float = float(getenv("RATE_LIMIT_GLOBAL", "30"))
+RATE_LIMIT_PER_CHAT: float = float(getenv("RATE_LIMIT_PER_CHAT", "1"))
+RATE_LIMIT_PER_GROUP_MINUTE: float = float(getenv("RATE_LIMIT_PER_GROUP_MINUTE", "20"))
+RATE_LIMIT_MAX_RETRIES: int = int(getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+
+# Max number of idle chat buckets kept in memory
+CHAT_BUCKETS_MAXSIZE: int = 10000
+
+
+class Priority(IntEnum):
+
+    # Priority lanes of the requests (the lower, the sooner),
+    # passed to the bot methods as rate_limit_args
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class TokenBucket:
+
+    # Token bucket: up to "capacity" requests in a burst,
+    # refilled with "rate" tokens per second.
+    # The waiting requests are given the tokens by priority (and then in order),
+    # and no token is given while the bucket is paused
+
+    def __init__(self, rate: float, capacity: float) -> None:
+
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated_at: float = monotonic()
+
+        # Requests waiting for a token, as (priority, sequence, future)
+        self.waiting: list = []
+        self.sequence = count()
+        self.dispatcher: Task | None = None
+
+        # Time until which no token is given
+        self.paused_until: float = 0.0
+
+    def refill(self) -> None:
+
+        now: float = monotonic()
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+
+        self.refill()
+
+        # Take a token right away, if there's one and no request is waiting
+        if not self.waiting and self.tokens >= 1 and self.paused_until <= monotonic():
+            self.tokens -= 1
+
+            return None
+
+        future: Future = get_running_loop().create_future()
+
+        heappush(self.waiting, (priority, next(self.sequence), future))
+
+        # Start the dispatcher (if it's not running)
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = create_task(self.dispatch())
+
+        await future
+
+    async def dispatch(self) -> None:
+
+        # Give the tokens to the waiting requests, by priority
+        while self.waiting:
+
+            # Wait until the pause (if any) is over
+            if (pause := self.paused_until - monotonic()) > 0:
+                await sleep(pause)
+
+                continue
+
+            self.refill()
+
+            # Wait for the next token, if there are none left
+            if self.tokens < 1:
+                await sleep((1 - self.tokens) / self.rate)
+
+                continue
+
+            # Skip the requests cancelled in the meanwhile
+            _, _, future = heappop(self.waiting)
+
+            if not future.done():
+                self.tokens -= 1
+
+                future.set_result(None)
+
+    def pause(self, until: float) -> None:
+        self.paused_until = max(self.paused_until, until)
+
+    def close(self) -> None:
+
+        if self.dispatcher:
+            self.dispatcher.cancel()
+
+    @property
+    def is_idle(self) -> bool:
+
+        # A full bucket, without waiting requests, can be dropped
+        self.refill()
+
+        return self.tokens >= self.capacity and not self.waiting
+
+
+class PriorityRateLimiter(BaseRateLimiter[Priority]):
+
+    # Rate limiter for the requests to the Bot API.
+    # Every request waits for a token of its chat bucket (if it's sent to a chat),
+    # and then for a token of the global bucket: in both, the tokens are given
+    # to the waiting requests by priority (and then in order), so that an interactive
+    # reply overtakes the background messages queued for the same chat too.
+    # When Telegram answers with RetryAfter, all the requests are paused
+    # for the requested time, and the request is retried (up to max_retries)
+
+    def __init__(
+        self,
+        global_rate: float = RATE_LIMIT_GLOBAL / WORKERS,
+        chat_rate: float = RATE_LIMIT_PER_CHAT,
+        group_rate: float = RATE_LIMIT_PER_GROUP_MINUTE / 60,
+        max_retries: int = RATE_LIMIT_MAX_RETRIES
+    ) -> None:
+
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self.chat_rate: float = chat_rate
+        self.group_rate: float = group_rate
+        self.max_retries: int = max_retries
+
+        # Buckets of the chats, by chat id
+        self.chat_buckets: dict[int | str, TokenBucket] = {}
+
+        # Counters for monitoring
+        self.sent: int = 0
+        self.retries: int = 0
+        self.queue_time: float = 0.0
+        self.max_queue_time: float = 0.0
+        self.send_time: float = 0.0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+
+        for bucket in (self.global_bucket, *self.chat_buckets.values()):
+            bucket.close()
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, bool | dict | list]],
+        args: Any,
+        kwargs: dict,
+        endpoint: str,
+        data: dict,
+        rate_limit_args: Priority | None
+    ) -> bool | dict | list:
+
+        priority: Priority = Priority.INTERACTIVE if rate_limit_args is None else rate_limit_args
+
+        for attempt in range(self.max_retries + 1):
+
+            queued_at: float = monotonic()
+
+            # Wait for the chat token (if any), and then for the global one
+            if (chat_id := data.get("chat_id")) is not None:
+                await self.get_chat_bucket(chat_id=chat_id).acquire(priority=priority)
+
+            await self.global_bucket.acquire(priority=priority)
+
+            sent_at: float = monotonic()
+
+            self.update_queue_time(queue_time=sent_at - queued_at)
+
+            try:
+                result = await callback(*args, **kwargs)
+
+                self.sent += 1
+                self.send_time += monotonic() - sent_at
+
+                return result
+
+            except RetryAfter as retry_after:
+
+                # Give up, if the request has been retried too many times
+                if attempt == self.max_retries:
+                    raise
+
+                self.retries += 1
+
+                # Pause all the requests (for the requested seconds), and retry
+                self.global_bucket.pause(until=monotonic() + retry_after.retry_after + 0.1)
+
+    def get_chat_bucket(self, chat_id: int | str) -> TokenBucket:
+
+        if (bucket := self.chat_buckets.get(chat_id)) is None:
+
+            # Drop the idle buckets, if there are too many
+            if len(self.chat_buckets) >= CHAT_BUCKETS_MAXSIZE:
+                self.chat_buckets = {
+                    key: value
+                    for key, value in self.chat_buckets.items()
+                    if not value.is_idle
+                }
+
+            # The groups (and channels) have negative ids (or a @username)
+            rate: float = self.chat_rate if isinstance(chat_id, int) and chat_id > 0 else self.group_rate
+
+            bucket = self.chat_buckets[chat_id] = TokenBucket(rate=rate, capacity=max(rate, 1))
+
+        return bucket
+
+    def update_queue_time(self, queue_time: float) -> None:
+        self.queue_time += queue_time
+        self.max_queue_time = max(self.max_queue_time, queue_time)
+
+    @property
+    def stats(self) -> dict:
+
+        # Number of attempts (every retry is queued again)
+        attempts: int = self.sent + self.retries
+
+        return {
+            "queue_depth": len(self.global_bucket.waiting),
+            "queue_depth_by_priority": {
+                priority.name: sum(1 for entry in self.global_bucket.waiting if entry[0] == priority)
+                for priority in Priority
+            },
+            "sent": self.sent,
+            "retries": self.retries,
+            "avg_queue_time": self.queue_time / attempts if attempts else 0.0,
+            "max_queue_time": self.max_queue_time,
+            "avg_send_time": self.send_time / self.sent if self.sent else 0.0
+        }
@@ -1,8 +1,8 @@
+from database.migrations import run_migrations
 from dotenv import load_dotenv
-from models.base.base import Base
 from os import getenv
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # Load environment variables from local .env
 load_dotenv()
@@ -18,31 +18,56 @@ DB_DATABASE: str = getenv("DB_DATABASE")
 CREATE_MODELS: bool = getenv("CREATE_MODELS") == "True"
 DEBUG: bool = getenv("DEBUG") == "True"
 
+# Connection pool settings
+DB_POOL_SIZE: int = int(getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW: int = int(getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT: int = int(getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(getenv("DB_POOL_RECYCLE", "1800"))
+
 # Compose the DB URL (the connection string),
-# depending on the DB_DIALECT
+# depending on the DB_DIALECT.
+# The driver must be an async one (aiosqlite for SQLite, asyncpg for PostgreSQL)
 match DB_DIALECT:
 
     case "sqlite":
-        DB_URL: str = f"{DB_DIALECT}:///{DB_DATABASE}"
-    
+        DB_URL: str = f"{DB_DIALECT}+{DB_DRIVER or "aiosqlite"}:///{DB_DATABASE}"
+
     case "postgresql":
         DB_URL: str = (
-            f"{DB_DIALECT}+{DB_DRIVER}://{DB_USERNAME}:{DB_PASSWORD}"
+            f"{DB_DIALECT}+{DB_DRIVER or "asyncpg"}://{DB_USERNAME}:{DB_PASSWORD}"
             f"@{DB_HOST}:{DB_PORT}/{DB_DATABASE}"
         )
 
-# Create the engine (and the database if it doesn't exist)
-db_engine: Engine = create_engine(url=DB_URL, echo=DEBUG)
+# Create the async engine, with an explicit connection pool,
+# so the number of connections opened towards the db is bounded
+db_engine: AsyncEngine = create_async_engine(
+    url=DB_URL,
+    echo=DEBUG,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True
+)
 
 # Create a session maker
 # Everytime the SessionLocal is instatiated,
-# it will expose all the properties and methods of a Session
-SessionLocal = sessionmaker(bind=db_engine)
+# it will expose all the properties and methods of an AsyncSession.
+# The records are not expired on commit, since their attributes
+# can't be lazily refreshed once the session is closed
+SessionLocal = async_sessionmaker(bind=db_engine, expire_on_commit=False)
+
+
+async def init_db() -> None:
+
+    # Create the missing tables (and columns), and migrate the existing ones
+    if CREATE_MODELS:
+        async with db_engine.begin() as connection:
+            await connection.run_sync(run_migrations)
+
 
-# Create all the tables in the db
-# This action should be executed just one time, but since the tables are
-# already existing, from the second time the module is accessed,
-# the tables won't be created again thanks to the parameter "checkfirst"
+async def dispose_db() -> None:
 
-if CREATE_MODELS:
-    Base.metadata.create_all(bind=db_engine)
+    # Close all the pooled connections
+    await db_engine.dispose()
@@ -0,0 +1,171 @@
+from models.base.base import Base
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
+from models.todo.todo import Todo
+from models.user.user import User
+from sqlalchemy import Connection, DateTime, Select, insert, inspect, select, text
+
+# Indexes created by the previous versions of the models, and not needed anymore
+# (e.g. covered by a composite index), as (table, index)
+OUTDATED_INDEXES: tuple = (
+    ("schedule_entries", "ix_schedule_entries_due_at"),
+)
+
+
+def run_migrations(connection: Connection) -> None:
+
+    # Get the names of the tables already in the db
+    existing_tables: set = set(inspect(connection).get_table_names())
+
+    # Create all the tables in the db
+    # This action should be executed just one time, but since the tables are
+    # already existing, from the second time the function is called,
+    # the tables won't be created again thanks to the parameter "checkfirst"
+    Base.metadata.create_all(connection)
+
+    # Add the columns that are missing in the existing tables
+    added_columns: set = add_missing_columns(connection)
+
+    # Make the datetime columns of the existing tables timezone-aware
+    convert_naive_datetime_columns(connection)
+
+    # Create the indexes that are missing in the existing tables (and drop the outdated ones)
+    create_missing_indexes(connection)
+
+    # The data migrations run only once, when the table (or column) they refer to is added
+    if "schedule_entries" not in existing_tables and "todos" in existing_tables:
+        create_schedule_entries(connection)
+
+    if ("locations", "geocoding_retry_at") in added_columns:
+        reset_unresolved_addresses(connection)
+
+
+def add_missing_columns(connection: Connection) -> set:
+
+    # create_all only creates the missing tables, so the (nullable) columns
+    # added to the models after a table has been created are added here
+    inspector = inspect(connection)
+
+    # Initialize an empty set of the added (table, column) pairs
+    added_columns: set = set()
+
+    for table in Base.metadata.sorted_tables:
+
+        # Skip the tables that don't exist (yet)
+        if not inspector.has_table(table.name):
+            continue
+
+        # Get the names of the columns already in the table
+        existing_columns: set = {column["name"] for column in inspector.get_columns(table.name)}
+
+        for column in table.columns:
+
+            # Only nullable columns can be added to a table with records
+            if column.name not in existing_columns and column.nullable:
+
+                # Get the column type, as defined by the db dialect
+                column_type: str = column.type.compile(dialect=connection.dialect)
+
+                connection.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                )
+
+                added_columns.add((table.name, column.name))
+
+    return added_columns
+
+
+def create_missing_indexes(connection: Connection) -> None:
+
+    # create_all only creates the indexes of the tables it creates, so the indexes
+    # added to the models after a table has been created are created here
+    inspector = inspect(connection)
+
+    for table in Base.metadata.sorted_tables:
+
+        # Skip the tables that don't exist (yet)
+        if not inspector.has_table(table.name):
+            continue
+
+        # Get the names of the indexes already in the table
+        existing_indexes: set = {index["name"] for index in inspector.get_indexes(table.name)}
+
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(connection, checkfirst=True)
+
+        for table_name, index_name in OUTDATED_INDEXES:
+            if table_name == table.name and index_name in existing_indexes:
+                connection.execute(text(f"DROP INDEX {index_name}"))
+
+
+def convert_naive_datetime_columns(connection: Connection) -> None:
+
+    # SQLite has no timezone-aware type, so only PostgreSQL needs it
+    if connection.dialect.name != "postgresql":
+        return
+
+    # The tables created before the datetimes were made timezone-aware
+    # still have "timestamp without time zone" columns, that are converted
+    # in place (the stored values were always saved in UTC)
+    inspector = inspect(connection)
+
+    for table in Base.metadata.sorted_tables:
+
+        # Skip the tables that don't exist (yet)
+        if not inspector.has_table(table.name):
+            continue
+
+        # Get the types of the columns already in the table
+        existing_columns: dict = {
+            column["name"]: column["type"] for column in inspector.get_columns(table.name)
+        }
+
+        for column in table.columns:
+
+            # Only the timezone-aware columns of the models are converted
+            if not (isinstance(column.type, DateTime) and column.type.timezone):
+                continue
+
+            existing_type = existing_columns.get(column.name)
+
+            if isinstance(existing_type, DateTime) and not existing_type.timezone:
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {column.name} "
+                        f"TYPE TIMESTAMP WITH TIME ZONE USING {column.name} AT TIME ZONE 'UTC'"
+                    )
+                )
+
+
+def reset_unresolved_addresses(connection: Connection) -> None:
+
+    # The locations that couldn't be resolved used to be marked with an empty city,
+    # which is now left empty (NULL), so that they're attempted again by the backfill
+    connection.execute(text("UPDATE locations SET city = NULL WHERE city = ''"))
+
+
+def create_schedule_entries(connection: Connection) -> None:
+
+    # The uncompleted todos (and their reminders) created before the schedule
+    # was stored in the db are scheduled once, when the schedule table is created.
+    # The entries already missed are then dropped by the dispatcher
+    for kind, due_at_column in (
+        (ScheduleKind.TODO, Todo.due_date),
+        (ScheduleKind.REMINDER, Reminder.remind_at)
+    ):
+
+        sql_statement: Select = select(
+                                    Todo.id.label("todo_id"),
+                                    User.telegram_id.label("chat_id"),
+                                    due_at_column.label("due_at")
+                                ) \
+                                .join(User, User.id == Todo.user_id) \
+                                .where(Todo.done.is_(False))
+
+        if kind == ScheduleKind.REMINDER:
+            sql_statement = sql_statement.join(Reminder, Reminder.todo_id == Todo.id)
+
+        # Insert the entries (executemany), if any
+        if entries := [{**row._asdict(), "kind": kind} for row in connection.execute(sql_statement)]:
+            connection.execute(insert(ScheduleEntry), entries)
@@ -0,0 +1,256 @@
+from contextlib import contextmanager
+from csv import DictReader
+from hashlib import sha256
+from math import cos, inf, radians, sin
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from typing import Iterator
+import numpy as np
+import os
+
+# fcntl is available only on POSIX systems: elsewhere, the index is built without locks
+try:
+    from fcntl import LOCK_EX, LOCK_SH, flock
+except ImportError:
+    flock = None
+
+
+# Mean Earth radius (in km)
+EARTH_RADIUS_KM: float = 6371.0088
+
+# Files of the (memory-mapped) index, built from the dataset
+INDEX_FILES: tuple = ("points", "axes", "cities", "countries")
+
+
+class OfflineGeocoder:
+
+    # Reverse geocoder backed by a local cities dataset.
+    # The cities are indexed in an implicit (array-backed) KD-tree over the
+    # 3D unit vectors of their coordinates: the node of every [lo, hi) range
+    # is the element in the middle, and its children are the two halves.
+    # The arrays are saved as .npy files next to the dataset, and memory-mapped,
+    # so that multiple processes share the same pages.
+    # Every version of the dataset (by content hash) has its own index folder,
+    # which is never modified once created
+
+    def __init__(self, index_path: Path, max_distance_km: float) -> None:
+
+        # Load the index arrays (memory-mapped, read only)
+        arrays: dict = {
+            name: np.load(file=index_path / f"{name}.npy", mmap_mode="r")
+            for name in INDEX_FILES
+        }
+
+        # The points are accessed element by element during the search,
+        # so a flat view of them is kept
+        self.points = arrays["points"].reshape(-1)
+        self.axes = arrays["axes"]
+        self.cities = arrays["cities"]
+        self.countries = arrays["countries"]
+        self.size: int = len(self.axes)
+
+        # Convert the max distance (on the sphere) to a squared chord length
+        self.max_chord2: float = (2 * sin(max_distance_km / (2 * EARTH_RADIUS_KM))) ** 2
+
+    @classmethod
+    def load(cls, dataset_path: str, max_distance_km: float) -> "OfflineGeocoder":
+
+        dataset = Path(dataset_path)
+        indexes_path = dataset.with_name(f"{dataset.name}.index")
+        index_path = indexes_path / get_dataset_version(dataset=dataset)
+
+        indexes_path.mkdir(exist_ok=True)
+
+        # Open the index of the dataset, if it has already been built
+        # (the shared lock keeps it from being removed while its files are opened)
+        with lock_indexes(indexes_path=indexes_path, exclusive=False):
+
+            if index_path.exists():
+                return cls(index_path=index_path, max_distance_km=max_distance_km)
+
+        # Otherwise, build it, one process at a time
+        with lock_indexes(indexes_path=indexes_path, exclusive=True):
+
+            # Another process may have built it while waiting for the lock
+            if not index_path.exists():
+                build_index(dataset=dataset, index_path=index_path)
+
+                # Remove the indexes of the previous versions of the dataset
+                remove_outdated_indexes(indexes_path=indexes_path, index_path=index_path)
+
+            return cls(index_path=index_path, max_distance_km=max_distance_km)
+
+    def lookup(self, latitude: float, longitude: float) -> dict | None:
+
+        # Get the unit vector of the coordinates
+        query: tuple = to_unit_vector(latitude=latitude, longitude=longitude)
+
+        points = self.points
+        axes = self.axes
+
+        # Best (squared) distance found so far, and its node
+        best_distance: float = inf
+        best_node: int = -1
+
+        # Ranges to visit, with the (squared) distance from the splitting plane
+        stack: list = [(0, self.size, 0.0)]
+
+        while stack:
+
+            lo, hi, plane_distance = stack.pop()
+
+            # Skip the empty ranges, and the ones that can't contain a closer point
+            if lo >= hi or plane_distance >= best_distance:
+                continue
+
+            node: int = (lo + hi) // 2
+
+            # Coordinates of the node
+            x = points.item(3 * node)
+            y = points.item(3 * node + 1)
+            z = points.item(3 * node + 2)
+
+            # (Squared) distance between the node and the query
+            distance: float = (x - query[0]) ** 2 + (y - query[1]) ** 2 + (z - query[2]) ** 2
+
+            if distance < best_distance:
+                best_distance, best_node = distance, node
+
+            # Distance from the splitting plane of the node
+            axis: int = axes.item(node)
+            difference: float = query[axis] - (x, y, z)[axis]
+
+            # Visit the half on the same side of the query first (pushed last),
+            # and the other one only if the splitting plane is close enough
+            if difference < 0:
+                stack.append((node + 1, hi, difference * difference))
+                stack.append((lo, node, plane_distance))
+            else:
+                stack.append((lo, node, difference * difference))
+                stack.append((node + 1, hi, plane_distance))
+
+        # If there's no city close enough, it's a miss
+        if best_node < 0 or best_distance > self.max_chord2:
+            return None
+
+        return {
+            "city": str(self.cities[best_node]),
+            "country": str(self.countries[best_node])
+        }
+
+
+def to_unit_vector(latitude: float, longitude: float) -> tuple:
+
+    latitude, longitude = radians(latitude), radians(longitude)
+
+    return (
+        cos(latitude) * cos(longitude),
+        cos(latitude) * sin(longitude),
+        sin(latitude)
+    )
+
+
+def get_dataset_version(dataset: Path) -> str:
+
+    # Hash the content of the dataset, in chunks
+    dataset_hash = sha256()
+
+    with dataset.open(mode="rb") as dataset_file:
+        while chunk := dataset_file.read(1024 * 1024):
+            dataset_hash.update(chunk)
+
+    return dataset_hash.hexdigest()[:16]
+
+
+@contextmanager
+def lock_indexes(indexes_path: Path, exclusive: bool) -> Iterator[None]:
+
+    # Lock the indexes folder (shared for the readers, exclusive for the builders)
+    # The lock is released when the lock file is closed
+    with (indexes_path / ".lock").open(mode="a") as lock_file:
+
+        if flock is not None:
+            flock(lock_file.fileno(), LOCK_EX if exclusive else LOCK_SH)
+
+        yield
+
+
+def remove_outdated_indexes(indexes_path: Path, index_path: Path) -> None:
+
+    # The processes still using an outdated index keep its (memory-mapped) files
+    # until they close them, even if they're removed
+    for path in indexes_path.iterdir():
+
+        if path == index_path or path.name == ".lock":
+            continue
+
+        if path.is_dir():
+            rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+
+def build_index(dataset: Path, index_path: Path) -> None:
+
+    # Read the dataset, a CSV file with (at least) the columns:
+    # city, country, latitude, longitude
+    with dataset.open(encoding="utf-8", newline="") as dataset_file:
+        rows: list = list(DictReader(dataset_file))
+
+    cities = np.array([row["city"] for row in rows])
+    countries = np.array([row["country"] for row in rows])
+    latitudes = np.radians(np.array([float(row["latitude"]) for row in rows]))
+    longitudes = np.radians(np.array([float(row["longitude"]) for row in rows]))
+
+    # Convert the coordinates to unit vectors
+    points = np.column_stack(
+        (
+            np.cos(latitudes) * np.cos(longitudes),
+            np.cos(latitudes) * np.sin(longitudes),
+            np.sin(latitudes)
+        )
+    )
+
+    # Build the implicit KD-tree: for every range, the points are partitioned
+    # around the median of the axis with the largest spread, which becomes the node
+    size: int = len(points)
+    order = np.arange(size)
+    axes = np.zeros(size, dtype=np.int8)
+    ranges: list = [(0, size)]
+
+    while ranges:
+
+        lo, hi = ranges.pop()
+
+        if lo >= hi:
+            continue
+
+        indexes = order[lo:hi]
+        node: int = (lo + hi) // 2
+
+        # Get the axis with the largest spread
+        range_points = points[indexes]
+        axis: int = int((range_points.max(axis=0) - range_points.min(axis=0)).argmax())
+
+        # Partition the range around the median
+        order[lo:hi] = indexes[np.argpartition(range_points[:, axis], node - lo)]
+        axes[node] = axis
+
+        ranges.extend(((lo, node), (node + 1, hi)))
+
+    arrays: dict = {
+        "points": points[order],
+        "axes": axes,
+        "cities": cities[order],
+        "countries": countries[order]
+    }
+
+    # Save the index in a temporary folder, and then rename it (atomically),
+    # so that other processes never see a partially written index
+    temporary_path = Path(mkdtemp(dir=index_path.parent))
+
+    for name, array in arrays.items():
+        np.save(file=temporary_path / f"{name}.npy", arr=array)
+
+    os.replace(temporary_path, index_path)
@@ -0,0 +1,121 @@
+from asyncio import Lock, sleep, to_thread
+from cache.coalescing_cache import CoalescingCache
+from dotenv import load_dotenv
+from geocoding.offline import OfflineGeocoder
+from geopy import Nominatim
+from logging import Logger, getLogger
+from os import getenv
+from pathlib import Path
+from time import monotonic
+import h3
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+GEOCODER_USER_AGENT: str = getenv("GEOCODER_USER_AGENT", "sample-assistant-bot")
+
+# Geocoding engine: "nominatim" (default), or "offline" to resolve the addresses
+# with the local cities dataset first, falling back to Nominatim only on a miss.
+# The dataset isn't shipped with the bot: by default, it's looked up in the data folder
+# next to this module (without it, the addresses are resolved by Nominatim only)
+GEOCODER: str = getenv("GEOCODER", "nominatim")
+OFFLINE_GEOCODER_DATASET: str = getenv(
+    "OFFLINE_GEOCODER_DATASET", str(Path(__file__).resolve().parent / "data" / "cities.csv")
+)
+OFFLINE_GEOCODER_MAX_DISTANCE_KM: float = float(getenv("OFFLINE_GEOCODER_MAX_DISTANCE_KM", "30"))
+
+# The resolved addresses are cached by H3 cell (at the specified resolution),
+# so that the users close to each other share the same geocoding
+GEOCODING_H3_RESOLUTION: int = int(getenv("GEOCODING_H3_RESOLUTION", "7"))
+GEOCODING_CACHE_MAXSIZE: int = int(getenv("GEOCODING_CACHE_MAXSIZE", "10000"))
+GEOCODING_CACHE_TTL: int = int(getenv("GEOCODING_CACHE_TTL", str(7 * 24 * 60 * 60)))
+
+# Nominatim usage policy: at most 1 request per second
+NOMINATIM_MIN_INTERVAL: float = 1.0
+
+# Address fields to use as "city", in order of preference
+CITY_FIELDS: tuple = ("city", "town", "village", "municipality", "county", "state")
+
+logger: Logger = getLogger(__name__)
+
+# Geolocator (shared by all the requests)
+geolocator = Nominatim(user_agent=GEOCODER_USER_AGENT)
+
+# Offline geocoder (loaded at startup, if enabled)
+offline_geocoder: OfflineGeocoder | None = None
+
+# Lock (and time of the last request) to throttle the requests to Nominatim
+nominatim_lock = Lock()
+nominatim_last_request: float = 0.0
+
+# Cache of the resolved addresses, keyed by H3 cell
+geocoding_cache = CoalescingCache(maxsize=GEOCODING_CACHE_MAXSIZE, ttl=GEOCODING_CACHE_TTL)
+
+
+async def load_offline_geocoder() -> None:
+
+    global offline_geocoder
+
+    # Load (building it, the first time) the index of the local cities dataset
+    # The index is built in a thread, since it can take a while for large datasets
+    if GEOCODER == "offline" and offline_geocoder is None:
+
+        if not Path(OFFLINE_GEOCODER_DATASET).is_file():
+            logger.warning(
+                "Offline geocoder dataset %s not found, resolving the addresses with Nominatim only",
+                OFFLINE_GEOCODER_DATASET
+            )
+
+            return None
+
+        offline_geocoder = await to_thread(
+            OfflineGeocoder.load,
+            dataset_path=OFFLINE_GEOCODER_DATASET,
+            max_distance_km=OFFLINE_GEOCODER_MAX_DISTANCE_KM
+        )
+
+
+async def reverse_geocode(latitude: float, longitude: float) -> dict | None:
+
+    # Get the H3 cell of the location
+    h3_cell: str = h3.geo_to_h3(lat=latitude, lng=longitude, resolution=GEOCODING_H3_RESOLUTION)
+
+    # Get the address from the cache, or from Nominatim
+    return await geocoding_cache.get_or_load(
+        key=h3_cell,
+        loader=lambda: fetch_address(latitude=latitude, longitude=longitude)
+    )
+
+
+async def fetch_address(latitude: float, longitude: float) -> dict | None:
+
+    global nominatim_last_request
+
+    # Look up the address in the local cities dataset first (if enabled)
+    if offline_geocoder and (address := offline_geocoder.lookup(latitude=latitude, longitude=longitude)):
+        return address
+
+    # Set the coordinates
+    coordinates = f"{latitude},{longitude}"
+
+    async with nominatim_lock:
+
+        # Wait, if needed, to respect the Nominatim rate limit
+        if (wait := nominatim_last_request + NOMINATIM_MIN_INTERVAL - monotonic()) > 0:
+            await sleep(wait)
+
+        try:
+            # Get the location (the geolocator is synchronous, so it runs in a thread)
+            location = await to_thread(geolocator.reverse, query=coordinates, language="en")
+        
+        finally:
+            nominatim_last_request = monotonic()
+
+    if not (location and (address := location.raw.get("address"))):
+        return None
+    
+    return {
+        "city": next((address[field] for field in CITY_FIELDS if address.get(field)), None),
+        "country": address.get("country")
+    }
@@ -0,0 +1,41 @@
+from asyncio import Lock, to_thread
+from dotenv import load_dotenv
+from os import getenv
+from timezonefinder import TimezoneFinder
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# In memory mode, the polygons are read once (at the first lookup),
+# instead of being read from the files for every lookup
+TIMEZONE_FINDER_IN_MEMORY: bool = getenv("TIMEZONE_FINDER_IN_MEMORY", "True") == "True"
+
+# Timezone finder (shared by all the requests, created at the first lookup)
+timezone_finder: TimezoneFinder | None = None
+
+# Lock to create the timezone finder only once
+timezone_finder_lock = Lock()
+
+
+async def get_timezone_finder() -> TimezoneFinder:
+
+    global timezone_finder
+
+    if timezone_finder is None:
+
+        async with timezone_finder_lock:
+
+            # Load the timezone data in a thread, since it can take a while
+            if timezone_finder is None:
+                timezone_finder = await to_thread(TimezoneFinder, in_memory=TIMEZONE_FINDER_IN_MEMORY)
+
+    return timezone_finder
+
+
+async def resolve_timezone(latitude: float, longitude: float) -> str | None:
+
+    # Get the IANA timezone (e.g. "Europe/Rome") of the coordinates
+    timezone_finder = await get_timezone_finder()
+
+    return timezone_finder.timezone_at(lat=latitude, lng=longitude)
@@ -1,17 +1,17 @@
 from constants.emoji import Emoji
-from datetime import datetime, timedelta
+from handlers.utils.local_datetimes import format_todos_due_dates
 from models.todo.crud.retrieve import retrieve_todos
-from models.user.crud.retrieve import retrieve_user
+from models.user.crud.retrieve import retrieve_user_record
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 
 async def create_todos_keyboard(user_telegram_id: int) -> InlineKeyboardMarkup | None:
 
     # Retrieve the user
-    if user := retrieve_user(user_telegram_id=user_telegram_id):
+    if user := await retrieve_user_record(user_telegram_id=user_telegram_id):
 
         # Get the uncompleted list of user's todos
-        if user_uncompleted_todos := retrieve_todos(user_id=user.id, is_done=False):
+        if user_uncompleted_todos := await retrieve_todos(user_id=user.id, is_done=False):
 
             # Prepare the keyboard for the todos list
             keyboard: list = [
@@ -27,13 +27,12 @@ async def create_todos_keyboard(user_telegram_id: int) -> InlineKeyboardMarkup |
                 ]
             ]
 
+            # Format the due dates of all the todos in the user's local time
+            todos_user_due_dates: list = format_todos_due_dates(todos=user_uncompleted_todos)
+
             # Create the list of todos (details) for the inline keyboard
-            for todo in user_uncompleted_todos:
+            for todo, todo_user_due_date in zip(user_uncompleted_todos, todos_user_due_dates):
 
-                # Set the todo user due date
-                todo_user_due_date: datetime = \
-                    f"{todo.due_date + timedelta(seconds=todo.utc_offset):%Y-%m-%d %H:%M}"
-                
                 # Add the todo information to the keyboard
                 keyboard.append(
                     [
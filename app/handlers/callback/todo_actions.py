@@ -1,11 +1,12 @@
 from constants.emoji import Emoji
 from datetime import UTC, datetime, timedelta
 from handlers.callback.keyboards.todos import create_todos_keyboard
-from jobs.utils import get_jobs_by_name_custom
-from models.reminder.crud.delete import delete_reminder
+from handlers.utils.local_datetimes import format_local_datetime, get_todo_tzinfo
+from jobs.cleanup_pending_messages_job import PENDING_MESSAGES_TTL
+from jobs.dispatch_reminders_job import cancel_reminders
 from models.todo.crud.retrieve import retrieve_todo
 from models.todo.crud.delete import delete_todo
-from models.todo.crud.update import update_todo
+from models.todo.crud.update import complete_todo
 from telegram import Update
 from telegram.ext import CallbackQueryHandler, ContextTypes
 from uuid import UUID
@@ -34,107 +35,65 @@ async def handle_todo_actions(update: Update, context: ContextTypes.DEFAULT_TYPE
             # Transform the todo_id as a UUID (because it was a string)
             todo_id = todo_id = UUID(hex=todo_info, version=4)
             
-            # Prepare the data to update
-            todo_data: dict = {"done": True}
-
-            # Mark the todo as completed
-            if update_todo(todo_id=todo_id, todo_data=todo_data):
-
-                # Get the todo
-                if todo := retrieve_todo(todo_id=todo_id):
-
-                    # If the reminder is still present in the db because it hasn't been triggered yet
-                    if reminder := todo.reminder:
-
-                        # Delete the reminder
-                        delete_reminder(reminder_id=reminder.id)
-
-                    # Get the user UTC offset
-                    user_utc_offset = todo.utc_offset
+            # Mark the todo as completed, deleting its reminder (if it hasn't been triggered yet)
+            # and expiring its pending messages, in a single transaction
+            if todo := await complete_todo(
+                todo_id=todo_id, 
+                messages_expire_at=datetime.now(UTC) + timedelta(seconds=PENDING_MESSAGES_TTL)
+            ):
+
+                # Drop its reminders (if any) from the timing wheel
+                cancel_reminders(bot_data=context.bot_data, todo_id=todo_id)
+
+                # Calculate the completed time for the current to-do (in user local time)
+                todo_completed_time: str = format_local_datetime(
+                    value=datetime.now(UTC), 
+                    value_tzinfo=get_todo_tzinfo(todo=todo)
+                )
 
-                    # Calculate the completed time for the current to-do
-                    todo_completed_time = datetime.now(UTC) + timedelta(seconds=user_utc_offset)
+                # User text
+                user_text = (
+                    f"{Emoji.WHITE_HEAVY_CHECK_MARK} To-Do ({todo.details}) checked as completed on "
+                    f"{todo_completed_time}"
+                )
                 
-                    # Delete the pending todo(s)
-                    if user_data := context.bot_data.get(user_telegram_id):
-                    
-                        # Since we can't delete keys in the same dictionary we're iterating through,
-                        # we need to make a copy of it, so we can do whatever we want on the original one
-                        pending_todos = user_data["pending_todos"].copy()
-                        
-                        # If there's a pending_todo, delete it
-                        # (just after the reminder remind_at and/or the todo due time is passed)
-                        for k, v in pending_todos.items():
-                            if v == todo_id:
-                                del context.bot_data[user_telegram_id]["pending_todos"][k]
-
-                    # NOTE: here I'm using a custom version of "get_jobs_by_name" function,
-                    # that supports searching the jobs through regular expressions
-                    # For each job that has the todo_id, disable it and remove it
-                    for job in await get_jobs_by_name_custom(context=context, name=f".*{todo_id.hex}"):
-                        job.enabled = False
-                        job.schedule_removal()
-
-                    # User text
-                    user_text = (
-                        f"{Emoji.WHITE_HEAVY_CHECK_MARK} To-Do ({todo.details}) checked as completed on "
-                        f"{todo_completed_time:%Y-%m-%d %H:%M}"
-                    )
-                    
-                    await context.bot.send_message(
-                        chat_id=update.effective_user.id,
-                        text=user_text
-                    )
+                await context.bot.send_message(
+                    chat_id=update.effective_user.id,
+                    text=user_text
+                )
 
         case "delete":
             
             # Here we need to delete:
             # - the to-do (and associated reminder, if present)
-            # - the pending to-do (used to be completed with a message reaction)
+            # - the pending messages (used to complete it with a message reaction)
 
             # Transform the todo_id as a UUID (because it was a string)
             todo_id = todo_id = UUID(hex=todo_info, version=4)
 
             # Get the todo
-            if todo := retrieve_todo(todo_id=todo_id):
+            if todo := await retrieve_todo(todo_id=todo_id):
 
                 # Answer the query
                 await query.answer()
 
-                # Get the user UTC offset
-                user_utc_offset = todo.utc_offset
-
-                # Delete the pending todo(s)
-                if user_data := context.bot_data.get(user_telegram_id):
-                
-                    # Since we can't delete keys in the same dictionary we're iterating through,
-                    # we need to make a copy of it, so we can do whatever we want on the original one
-                    pending_todos = user_data["pending_todos"].copy()
-                    
-                    # If there's a pending_todo, delete it
-                    # (just after the reminder remind_at and/or the todo due time is passed)
-                    for k, v in pending_todos.items():
-                        if v == todo_id:
-                            del context.bot_data[user_telegram_id]["pending_todos"][k]
-
-                # NOTE: here I'm using a custom version of "get_jobs_by_name" function,
-                # that supports searching the jobs through regular expressions
-                # For each job that has the todo_id, disable it and remove it
-                for job in await get_jobs_by_name_custom(context=context, name=f".*{todo_id.hex}"):
-                    job.enabled = False
-                    job.schedule_removal()
-
-                # Set the deletion time
-                todo_deletion_time = datetime.now(UTC) + timedelta(seconds=user_utc_offset)
+                # Set the deletion time (in user local time)
+                todo_deletion_time: str = format_local_datetime(
+                    value=datetime.now(UTC), 
+                    value_tzinfo=get_todo_tzinfo(todo=todo)
+                )
 
                 # User text
                 user_text = (
                     f"{Emoji.CROSS_MARK} To-Do ({todo.details}) deleted on "
-                    f"{todo_deletion_time:%Y-%m-%d %H:%M}"
+                    f"{todo_deletion_time}"
                 )
 
                 # Delete the to-do
-                delete_todo(todo_id=todo_id)
+                await delete_todo(todo_id=todo_id)
+
+                # Drop its reminders (if any) from the timing wheel
+                cancel_reminders(bot_data=context.bot_data, todo_id=todo_id)
 
                 await context.bot.send_message(
                     chat_id=update.effective_user.id,
@@ -1,6 +1,6 @@
 from uuid import UUID
 from constants.emoji import Emoji
-from datetime import datetime, timedelta
+from handlers.utils.local_datetimes import format_local_datetime, get_todo_tzinfo
 from models.todo.crud.retrieve import retrieve_todo
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import CallbackQueryHandler, ContextTypes
@@ -16,22 +16,25 @@ async def open_todo_details(update: Update, context: ContextTypes.DEFAULT_TYPE):
     todo_id = UUID(hex=query.data.split(":")[1], version=4)
 
     # Get the todo
-    if todo := retrieve_todo(todo_id=todo_id):
+    if todo := await retrieve_todo(todo_id=todo_id, with_reminder=True):
 
-        # Transfrom the due_date in user_due_date, adding the UTC offset (to user local time)
-        user_due_date: datetime = todo.due_date + timedelta(seconds=todo.utc_offset)
+        # Get the user's timezone (to show the dates in local time)
+        user_tzinfo = get_todo_tzinfo(todo=todo)
+
+        # Transfrom the due_date in user_due_date (in user local time)
+        user_due_date: str = format_local_datetime(value=todo.due_date, value_tzinfo=user_tzinfo)
 
         user_text = (
             f"<b>{Emoji.MEMO} Todo:</b>\n"
             f"<b>Details</b>:\n" 
             f"<code>{todo.details}</code>\n"
-            f"<b>Due to:</b> {user_due_date:%Y-%m-%d %H:%M}\n"
+            f"<b>Due to:</b> {user_due_date}\n"
         )
 
         # If there's a reminder, then add more information
         if todo.reminder:
-            user_reminder_date: datetime = todo.reminder.remind_at + timedelta(seconds=todo.utc_offset)
-            user_text += f"<b>Reminder:</b> {user_reminder_date:%Y-%m-%d %H:%M}"
+            user_reminder_date: str = format_local_datetime(value=todo.reminder.remind_at, value_tzinfo=user_tzinfo)
+            user_text += f"<b>Reminder:</b> {user_reminder_date}"
 
         # Create the keyboard for the todo
         keyboard = [
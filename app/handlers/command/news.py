@@ -1,15 +1,42 @@
 from __future__ import annotations
-from bs4 import BeautifulSoup, ResultSet
+from cache.stale_while_revalidate_cache import StaleWhileRevalidateCache
+from clients.http import http_get
 from constants.emoji import Emoji
-from difflib import SequenceMatcher
-from geopy import Nominatim
-from models.user.crud.retrieve import retrieve_user
-from requests.compat import quote
+from dotenv import load_dotenv
+from handlers.utils.near_duplicates import find_unique
+from handlers.utils.news_extraction import extract_news
+from jobs.backfill_locations_job import enqueue_locations_backfill
+from models.user.cache import invalidate_user_record
+from models.user.crud.retrieve import retrieve_user_record
 from telegram import Update
 from telegram.constants import ChatAction
+from os import getenv
 from telegram.ext import ContextTypes, CommandHandler
-from uuid import uuid4
-import requests
+from urllib.parse import quote
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Two news are considered the same if the similarity of their titles
+# (estimated Jaccard similarity of their shingles) is at least the threshold
+NEWS_SIMILARITY_THRESHOLD: float = float(getenv("NEWS_SIMILARITY_THRESHOLD", "0.5"))
+
+# Max number of articles extracted from a news page
+NEWS_EXTRACTION_LIMIT: int = int(getenv("NEWS_EXTRACTION_LIMIT", "100"))
+
+# The local news are cached by URL (so by city), fresh for NEWS_CACHE_TTL seconds,
+# and then served stale (while being refreshed) for NEWS_CACHE_STALE_TTL more seconds
+NEWS_CACHE_MAXSIZE: int = int(getenv("NEWS_CACHE_MAXSIZE", "1000"))
+NEWS_CACHE_TTL: int = int(getenv("NEWS_CACHE_TTL", "900"))
+NEWS_CACHE_STALE_TTL: int = int(getenv("NEWS_CACHE_STALE_TTL", "3600"))
+
+# Cache of the local news, keyed by the composed local news URL
+news_cache = StaleWhileRevalidateCache(
+    maxsize=NEWS_CACHE_MAXSIZE,
+    ttl=NEWS_CACHE_TTL,
+    stale_ttl=NEWS_CACHE_STALE_TTL
+)
 
 
 # Entry point
@@ -34,7 +61,7 @@ async def get_local_news_job(context: ContextTypes.DEFAULT_TYPE) -> None:
     )
 
     # Check if the user exists
-    if not (user := retrieve_user(user_telegram_id=context.job.user_id)):
+    if not (user := await retrieve_user_record(user_telegram_id=context.job.user_id)):
 
         user_text = (
             f"{Emoji.CROSS_MARK} It seems that you didn't sign-up.\n"
@@ -65,17 +92,68 @@ async def get_local_news_job(context: ContextTypes.DEFAULT_TYPE) -> None:
 
         return None
     
-    # Get the user detailed location
-    user_detailed_location = get_user_detailed_location(
-        latitude=user_location.latitude,
-        longitude=user_location.longitude
-    )
+    # The address of the location is resolved in background, when the location is set,
+    # or by the backfill job (possibly in another worker, whose cache is the only one updated):
+    # if the cached record doesn't have it yet, the user is read again from the db
+    if not user_location.city:
+
+        invalidate_user_record(user_telegram_id=context.job.user_id)
+
+        if (user := await retrieve_user_record(user_telegram_id=context.job.user_id)) and user.location:
+            user_location = user.location
+
+    # If the location has not been resolved yet, it's never resolved here
+    # (the geocoding is rate limited, and it backs off the failures):
+    # the backfill job is woken up instead (if it runs in this process)
+    if not user_location.city:
+
+        enqueue_locations_backfill(job_queue=context.job_queue)
+
+        user_text = (
+            f"{Emoji.HOURGLASS} Your location is still being resolved.\n"
+            "Try again later."
+        )
+
+        # Send the message
+        await context.bot.send_message(
+            chat_id=context.job.chat_id,
+            text=user_text
+        )
+
+        return None
+
+    # Get the user detailed location, resolved when the location has been set
+    user_detailed_location: dict = {
+        "city": user_location.city,
+        "country": user_location.country
+    }
+
+    # If the location can't be resolved
+    if not (
+        user_detailed_location 
+        and user_detailed_location.get("city") 
+        and user_detailed_location.get("country")
+    ):
+
+        user_text = (
+            f"{Emoji.CROSS_MARK} Unable to retrieve local news at the moment.\n"
+            "Try again later."
+        )
+
+        # Send the message
+        await context.bot.send_message(
+            chat_id=context.job.chat_id,
+            text=user_text
+        )
+
+        return None
     
     # Compose the local news URL for the user
     url = compose_user_local_news_url(location=user_detailed_location)
     
-    # Extract the information from the "get_local_news" function
-    news_list: dict = await get_local_news(url=url)
+    # Get the local news from the cache (shared by all the users in the same city),
+    # or extract them with the "get_local_news" function
+    news_list: list = await get_cached_local_news(url=url)
 
     # If data has been gathered correctly
     if news_list:
@@ -100,78 +178,55 @@ async def get_local_news_job(context: ContextTypes.DEFAULT_TYPE) -> None:
     )
 
 
-async def get_local_news(url: str):
+async def get_cached_local_news(url: str) -> list | None:
+
+    return await news_cache.get_or_load(
+        key=url,
+        loader=lambda: get_local_news(url=url)
+    )
+
+
+async def get_local_news(url: str) -> list | None:
 
     # Get the news content (to scrape)
-    news_content = await get_news_content(url=url)
+    if not (news_content := await get_news_content(url=url)):
+        return None
     
     # Get the news from content (scraped)
-    all_news = get_news_from_content(content=news_content)
+    all_news = get_news_from_content(content=news_content, url=url)
     
     # Filter news (remove similiar news),
     # sorted by post time
-    return filter_news(news_list=all_news)
+    # If no news have been found, None is returned, so that it's not cached
+    return filter_news(news_list=all_news) or None
 
 
 async def get_news_content(url: str) -> bytes:
 
     # Get the Google News results
-    response = requests.get(url=url)
+    response = await http_get(url=url)
 
     return response.content or None
 
 
-def get_news_from_content(content: bytes) -> list:
-
-    # Define the source to append to the links
-    source: str = "https://news.google.com"
-    
-    # Initialize an empty list of news
-    news_list: list = []
-    
-    # Create the scraper
-    soup = BeautifulSoup(markup=content, features="html.parser")
-
-    # Get all the c-wiz tags with the specified class class
-    c_wizs: ResultSet = soup.find_all(name="c-wiz", class_="XBspb")
-
-    # If at least of tag has been found
-    if c_wizs:
-
-        # For each tag found
-        for c_wiz in c_wizs:
-            
-            # Extract the anchor tag with the specified class in the c-wiz
-            a = c_wiz.find(name="a", class_="JtKRv")
-            
-            # Get the time tag with the specified class in the c-wiz
-            time = c_wiz.find(name="time", class_="hvbAAd")
+def get_news_from_content(content: bytes, url: str | None = None) -> list:
 
-            # Extract the text, href and datetime of the tags
-            news_title: str = a.text
-            news_link: str = f"{source}/{a['href'][2:]}"
-            news_datetime: str = time['datetime']
-            
-            # Set the row of news with the various information
-            news = [news_title, news_link, news_datetime]
-
-            # Append the news row to the news list
-            news_list.append(news)
-
-    return news_list
+    # Extract the news with the configured engine,
+    # stopping after the first NEWS_EXTRACTION_LIMIT articles
+    return extract_news(content=content, limit=NEWS_EXTRACTION_LIMIT, url=url)
 
 
 def filter_news(news_list: list, count: int = 10) -> list:
-        
-    # Initialize a list of filtered news
-    filtered_news: list = []
-
-    # Threshold to avoid similiar results
-    threshold: float = 0.2
 
-    for news in news_list:
-        if not any(is_similar(text1=news, text2=filtered, threshold=threshold) for filtered in filtered_news):
-            filtered_news.append(news)
+    # Get the indexes of the news whose title is not similar
+    # to the title of a previous news (near-duplicates removal)
+    unique_indexes: list = find_unique(
+        texts=[title for title, link, news_datetime in news_list],
+        threshold=NEWS_SIMILARITY_THRESHOLD
+    )
+        
+    # Keep only the unique news
+    filtered_news: list = [news_list[i] for i in unique_indexes]
     
     # Sort the filtered news by post datetime, in descending order
     filtered_news = sorted(filtered_news, key=lambda row: row[2], reverse=True)
@@ -180,29 +235,6 @@ def filter_news(news_list: list, count: int = 10) -> list:
     return filtered_news[:count]
 
 
-def is_similar(text1, text2, threshold):
-    return SequenceMatcher(
-        isjunk=None,
-        a=text1,
-        b=text2,
-        autojunk=True
-   ).ratio() > threshold
-
-
-def get_user_detailed_location(latitude: float, longitude: float) -> dict:
-
-    # Set the coordinates
-    coordinates = f"{latitude},{longitude}"
-    
-    # Instatiate the geolocator with a random UUID as User-Agent
-    geolocator = Nominatim(user_agent=uuid4().hex)
-
-    # Get the location
-    location = geolocator.reverse(query=coordinates, language="en")
-
-    return location.raw['address'] if location else None
-
-
 def compose_user_local_news_url(location: dict):
 
     # Get the city (quoted), safe for HTML
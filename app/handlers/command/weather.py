@@ -1,17 +1,38 @@
 from __future__ import annotations
+from cache.coalescing_cache import CoalescingCache
+from clients.http import http_get
 from constants.emoji import Emoji
 from constants.wmo_codes import WMO_CODES
+from dotenv import load_dotenv
 from math import ceil
-from models.user.crud.retrieve import retrieve_user
+from models.user.crud.retrieve import retrieve_user_record
+from os import getenv
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler
-import requests
+from time import time
+import h3
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# The weather is cached by H3 cell (at the specified resolution),
+# so that the users close to each other share the same upstream call
+WEATHER_H3_RESOLUTION: int = int(getenv("WEATHER_H3_RESOLUTION", "7"))
+WEATHER_CACHE_MAXSIZE: int = int(getenv("WEATHER_CACHE_MAXSIZE", "10000"))
+
+# Open-Meteo updates the "current" values every 15 minutes,
+# so the cache entries are bucketed (and expire) with the same cadence
+WEATHER_UPDATE_INTERVAL: int = 15 * 60
+
+# Cache of the weather info, keyed by (H3 cell, time bucket)
+weather_cache = CoalescingCache(maxsize=WEATHER_CACHE_MAXSIZE, ttl=WEATHER_UPDATE_INTERVAL)
 
 
 async def weather(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
     # Check if the user exists
-    if user := retrieve_user(user_telegram_id=update.effective_user.id):
+    if user := await retrieve_user_record(user_telegram_id=update.effective_user.id):
         
         # Check if the user has a location
         if location := user.location:
@@ -78,6 +99,33 @@ async def get_weather_info_job(context: ContextTypes.DEFAULT_TYPE) -> None:
 
 async def get_weather_info(location_data: dict) -> dict | None:
 
+    # Get the H3 cell of the location
+    h3_cell: str = h3.geo_to_h3(
+        lat=location_data.get("latitude"), 
+        lng=location_data.get("longitude"), 
+        resolution=WEATHER_H3_RESOLUTION
+    )
+
+    # Get the current time bucket (aligned to the Open-Meteo updates),
+    # and the seconds left until the next one
+    now: float = time()
+    time_bucket: int = int(now // WEATHER_UPDATE_INTERVAL)
+    ttl: float = (time_bucket + 1) * WEATHER_UPDATE_INTERVAL - now
+
+    # Get the weather info from the cache, or from Open-Meteo
+    # (just one call for all the concurrent requests for the same cell)
+    return await weather_cache.get_or_load(
+        key=(h3_cell, time_bucket),
+        loader=lambda: fetch_weather_info(h3_cell=h3_cell),
+        ttl=ttl
+    )
+
+
+async def fetch_weather_info(h3_cell: str) -> dict | None:
+
+    # Get the coordinates of the center of the H3 cell
+    latitude, longitude = h3.h3_to_geo(h=h3_cell)
+
     # Base URL for the Open-Meteo APIs
     base_url: str = "https://api.open-meteo.com/v1"
     
@@ -98,8 +146,8 @@ async def get_weather_info(location_data: dict) -> dict | None:
 
     # Format query parameters
     query_parameters: dict = {
-        "latitude": location_data.get("latitude"),
-        "longitude": location_data.get("longitude"),
+        "latitude": latitude,
+        "longitude": longitude,
         "current": ",".join([variable for variable in variables])
     }
 
@@ -107,10 +155,10 @@ async def get_weather_info(location_data: dict) -> dict | None:
     url = f"{base_url}/{endpoint}"
 
     # Call the APIs
-    response = requests.get(url=url, params=query_parameters)
+    response = await http_get(url=url, params=query_parameters)
 
-    # If the response is ok (200)
-    if response.ok:
+    # If the response is ok (2xx)
+    if response.is_success:
 
         # Get the response body in JSON format
         response_body: dict = response.json()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 from constants.emoji import Emoji
+from geocoding.timezone import resolve_timezone
+from jobs.backfill_locations_job import resolve_location_address
 from models.location.crud.create import create_location
 from models.location.crud.update import update_location
-from models.user.crud.retrieve import retrieve_user
+from models.user.crud.retrieve import retrieve_user_record
 from telegram import KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove, Update
 from telegram.ext import (
     ApplicationHandlerStop, 
@@ -26,8 +28,8 @@ async def set_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     # Get the user Telegram id
     user_telegram_id = update.effective_user.id
     
-    # Get the user from db
-    if user := retrieve_user(user_telegram_id=user_telegram_id):
+    # Get the user (from cache or db)
+    if user := await retrieve_user_record(user_telegram_id=user_telegram_id):
 
         # Save the user id in the context user data dictionary
         context.user_data["user_id"] = user.id
@@ -172,22 +174,30 @@ async def input_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # If the location is correctly obtained
     if latitude and longitude:
 
-        # Get (and delete) the user id from its context user_data's dictionary
-        user_id = context.user_data.pop("user_id")
+        # Resolve the timezone of the location once, here (locally),
+        # so that it doesn't need to be resolved for every to-do
+        timezone: str | None = await resolve_timezone(latitude=latitude, longitude=longitude)
 
         # Set the location data
+        # The address (city and country) is resolved after the location has been saved,
+        # so the user doesn't wait for the (rate limited) geocoder
         location_data: dict = {
-            "user_id": user_id,
+            "user_id": context.user_data.get("user_id"),
             "latitude": latitude,
-            "longitude": longitude
+            "longitude": longitude,
+            "city": None,
+            "country": None,
+            "timezone": timezone,
+            "geocoding_attempts": None,
+            "geocoding_retry_at": None
         }
 
-        # If a location id is found (and deleted) in the context user data dictionary,
+        # If a location id is found in the context user data dictionary,
         # it means that the location was already set, and so it needs to be updated
-        if location_id := context.user_data.pop("location_id", None):
+        if location_id := context.user_data.get("location_id"):
 
             # Update the user's location in the db
-            location_id = update_location(
+            location_id = await update_location(
                 location_id=location_id,
                 location_data=location_data
             )
@@ -206,7 +216,7 @@ async def input_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         else:
 
             # Save the user's location in the db
-            location_id = create_location(location_data=location_data)
+            location_id = await create_location(location_data=location_data)
 
             # Check if the location has been correctly created
             if location_id:
@@ -231,6 +241,23 @@ async def input_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
                 await update.message.reply_text(text=user_text)
 
+        # Context user's data dictionary clean-up
+        # (only now that the location is saved: if saving it fails, the user can send it again)
+        context.user_data.pop("user_id", None)
+        context.user_data.pop("location_id", None)
+
+        # Resolve the address of the location in background
+        # If it fails, it's attempted again by the backfill job
+        if location_id:
+            context.application.create_task(
+                resolve_location_address(
+                    location_id=location_id,
+                    latitude=latitude,
+                    longitude=longitude
+                ),
+                update=update
+            )
+
     return ConversationHandler.END
 
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from constants.emoji import Emoji
 from models.user.crud.create import create_user
-from models.user.crud.retrieve import retrieve_user
+from models.user.crud.retrieve import retrieve_user_record
 from telegram import KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove, Update, User
 from telegram.ext import (
     ApplicationHandlerStop, 
@@ -32,7 +32,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user_first_name: str = telegram_user.first_name
 
     # If the user doesn't already exist in the db
-    if not (user := retrieve_user(user_telegram_id=user_telegram_id)):
+    if not (user := await retrieve_user_record(user_telegram_id=user_telegram_id)):
 
         # User text
         user_text: str = (
@@ -116,7 +116,7 @@ async def user_choice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         user_data = get_user_info(telegram_user=update.effective_user)
 
         # Save user's info
-        user_id = create_user(user_data=user_data)
+        user_id = await create_user(user_data=user_data)
 
         # Check if the user has been correctly created
         if user_id:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 from constants.emoji import Emoji
 from datetime import datetime, timedelta, UTC
+from geocoding.timezone import resolve_timezone
 from handlers.utils.inline_calendar import create_calendar
-from jobs.remind_user_job import remind_user_job
+from jobs.dispatch_reminders_job import schedule_reminder
+from models.location.crud.update import update_location
 from models.reminder.crud.create import create_reminder
 from models.todo.crud.create import create_todo
-from models.user.crud.retrieve import retrieve_user
+from models.schedule.schedule import ScheduleKind
+from models.user.crud.retrieve import retrieve_user_record
 from re import compile, IGNORECASE, X
 from telegram import KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove, Update
 from telegram.ext import (
@@ -18,7 +21,6 @@ from telegram.ext import (
     filters
 )
 from telegram.warnings import PTBUserWarning
-from timezonefinder import TimezoneFinder
 from uuid import UUID
 from warnings import filterwarnings
 from zoneinfo import ZoneInfo
@@ -74,8 +76,8 @@ async def todo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     # Get the user Telegram id
     user_telegram_id = update.effective_user.id
     
-    # Get the user from db
-    if user := retrieve_user(user_telegram_id=user_telegram_id):
+    # Get the user (from cache or db)
+    if user := await retrieve_user_record(user_telegram_id=user_telegram_id):
 
         # If the user has a location associated
         if user.location:
@@ -221,14 +223,11 @@ async def input_todo_due_time(update: Update, context: ContextTypes.DEFAULT_TYPE
     # Convert the due date and time datetime format
     due_dt = datetime.strptime(due_full, "%Y-%m-%d %H:%M")
 
-    # Get the user time zone and UTC offset based on the user's location and the (local) due_dt
-    user_tzinfo, utc_offset =  await get_user_utc_offset(
-        user_telegram_id=update.effective_user.id, 
-        local_naive_dt=due_dt
-    )
+    # Get the user time zone based on the user's location
+    user_tzinfo = await get_user_tzinfo(user_telegram_id=update.effective_user.id)
 
-    # If the user_tzinfo and UTC offset have been correctly extracted
-    if user_tzinfo and utc_offset:
+    # If the user_tzinfo has been correctly extracted
+    if user_tzinfo:
 
         # Convert the naive datetime in an aware datetime in the user tzinfo
         due_dt = due_dt.replace(tzinfo=user_tzinfo)
@@ -261,8 +260,10 @@ async def input_todo_due_time(update: Update, context: ContextTypes.DEFAULT_TYPE
         # Overwrite the due_date value with full converted due datetime
         context.user_data["todo_data"]["due_date"] = due_dt_utc
         
-        # Save the utc offset to the context user data dictionary
-        context.user_data["todo_data"]["utc_offset"] = utc_offset
+        # Save the user timezone (and the UTC offset in seconds at the due date)
+        # to the context user data dictionary
+        context.user_data["todo_data"]["timezone"] = user_tzinfo.key
+        context.user_data["todo_data"]["utc_offset"] = int(due_dt.utcoffset().total_seconds())
 
         user_text = f"{Emoji.ALARM_CLOCK} Would you like to be reminded of this to-do?"
 
@@ -377,39 +378,18 @@ async def user_choice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 
     elif user_choice == "no":
 
-        # Get the user Telegram id
-        user_telegram_id: int = update.effective_user.id
-
         # If there is the todo_data dictionary
         if todo_data := context.user_data.pop("todo_data"):
                 
             # If the todo is correctly saved
-            if todo_id := save_todo(todo_data=todo_data):
+            # (the user is reminded by the reminders dispatcher, at the todo due date)
+            if await save_todo(todo_data=todo_data, bot_data=context.bot_data):
                 user_text = (
                     f"{Emoji.WHITE_HEAVY_CHECK_MARK} To-Do without reminder saved correctly.\n"
                     "You'll be reminded at the to-do specified time.\n"
                     "Press on the /todo command if you want to add another to-do."
                 )
 
-                # Set the todo job name
-                todo_job_name: str = f"todo_user_job_{todo_id.hex}"
-
-                # Prepare the PTB job data (for the reminder at todo specified date)
-                todo_job_data: dict = {
-                    "callback": remind_user_job,
-                    "name": todo_job_name,
-                    "when": todo_data["due_date"],
-                    "data": todo_id,
-                    "chat_id": user_telegram_id,
-                    "user_id": user_telegram_id
-                }
-
-                # Get the job queue
-                job_queue = context.job_queue
-
-                # Run the todo job
-                job_queue.run_once(**todo_job_data)
-
             await update.message.reply_text(
                 text=user_text,
                 reply_markup=ReplyKeyboardRemove()
@@ -493,120 +473,91 @@ async def select_reminder_time(update: Update, context: ContextTypes.DEFAULT_TYP
     if todo_data := context.user_data.pop("todo_data"):
             
         # If the todo is correctly saved
-        if todo_id := save_todo(todo_data=todo_data):
-
-            # Get the job queue
-            job_queue = context.job_queue
-
-            # Get the user Telegram id
-            user_telegram_id: int = update.effective_user.id
-
-            # Set the todo job name
-            todo_job_name: str = f"todo_user_job_{todo_id.hex}"
-
-            # If the todo job is not already in the jobs queue
-            # (because the user choose a reminder)
-            if not (job_queue.get_jobs_by_name(name=todo_job_name)):
-
-                # Prepare the PTB job data (for the reminder at todo specified date)
-                todo_job_data: dict = {
-                    "callback": remind_user_job,
-                    "name": todo_job_name,
-                    "when": todo_data["due_date"],
-                    "data": todo_id,
-                    "chat_id": user_telegram_id,
-                    "user_id": user_telegram_id
-                }
-
-                # Run the todo job
-                job_queue.run_once(**todo_job_data)
+        # (the user is reminded by the reminders dispatcher, at the reminder
+        # time and at the todo due date)
+        if todo_id := await save_todo(todo_data=todo_data, bot_data=context.bot_data):
             
             # Set the job name
             reminder_job_name: str = f"remind_user_job_{todo_id.hex}"
 
-            # Prepare the PTB job data (for the reminder before the todo)
-            reminder_job_data: dict = {
-                "callback": remind_user_job,
+            # Prepare the reminder data
+            reminder_data: dict = {
                 "name": reminder_job_name,
-                "when": reminder_datetime,
-                "data": todo_id,
-                "chat_id": user_telegram_id,
-                "user_id": user_telegram_id
+                "todo_id": todo_id,
+                "remind_at": reminder_datetime
             }
-            
-            # Schedule the job to run
-            reminder_job = job_queue.run_once(**reminder_job_data)
-
-            # If the job have been correctly added to the queue
-            if reminder_job:
-
-                # Prepare the reminder data
-                reminder_data: dict = {
-                    "name": reminder_job_name,
-                    "todo_id": todo_id,
-                    "remind_at": reminder_datetime
-                }
-
-                # Create the reminder
-                if create_reminder(reminder_data=reminder_data):
-
-                    user_text = (
-                        f"{Emoji.WHITE_HEAVY_CHECK_MARK} To-Do with reminder saved correctly.\n"
-                        "You'll be notified at the specified reminder time, and, if the to-do "
-                        "will not be marked as 'done', you'll be reminded a second time at the "
-                        "to-do specified time.\n"
-                        "Press on the /todo command if you want to add another to-do."
-                    )
 
-                    await update.message.reply_text(
-                        text=user_text,
-                        reply_markup=ReplyKeyboardRemove()
-                    )
+            # Create the reminder
+            if await create_reminder(reminder_data=reminder_data):
 
-                    return ConversationHandler.END
+                schedule_reminder(
+                    bot_data=context.bot_data,
+                    todo_id=todo_id,
+                    kind=ScheduleKind.REMINDER,
+                    due_at=reminder_datetime
+                )
 
+                user_text = (
+                    f"{Emoji.WHITE_HEAVY_CHECK_MARK} To-Do with reminder saved correctly.\n"
+                    "You'll be notified at the specified reminder time, and, if the to-do "
+                    "will not be marked as 'done', you'll be reminded a second time at the "
+                    "to-do specified time.\n"
+                    "Press on the /todo command if you want to add another to-do."
+                )
 
-async def get_user_utc_offset(user_telegram_id: int, local_naive_dt: datetime):
+                await update.message.reply_text(
+                    text=user_text,
+                    reply_markup=ReplyKeyboardRemove()
+                )
+
+                return ConversationHandler.END
 
-    # Transform the local dt (datetime) in a timestamp object
-    local_dt_timestamp = local_naive_dt.timestamp()
 
-    # Tranform the local timestamp in utc dt (datetime)
-    utc_dt = datetime.fromtimestamp(local_dt_timestamp, tz=UTC)
+async def get_user_tzinfo(user_telegram_id: int) -> ZoneInfo | None:
 
     # Get the user location to find out what is its timezone
-    if user := retrieve_user(user_telegram_id=user_telegram_id):
+    if user := await retrieve_user_record(user_telegram_id=user_telegram_id):
 
         # If the location is correctly retrieved
         if location := user.location:
 
-            # Get the latitude and longitude from the user's location
-            latitude, longitude = location.latitude, location.longitude
+            # Get the user's timezone, resolved when the location has been set
+            # If it's missing (location saved before the timezone was stored),
+            # resolve it now, and save it for the next to-dos
+            if not (user_timezone := location.timezone):
+                
+                if user_timezone := await resolve_timezone(
+                    latitude=location.latitude, 
+                    longitude=location.longitude
+                ):
+                    await update_location(
+                        location_id=location.id, 
+                        location_data={"timezone": user_timezone}
+                    )
 
             # If the user's timezone is correctly obtained
-            if user_timezone := TimezoneFinder().timezone_at(lat=latitude, lng=longitude):
+            if user_timezone:
 
                 # Get the user time zone info
-                user_tzinfo = ZoneInfo(key=user_timezone)
-
-                # Get the UTC offset by the user_timezone
-                utc_offset = utc_dt.replace(tzinfo=user_tzinfo).strftime("%z")
-
-                # Get the sign, hours an minutes for the offset
-                sign, hours, minutes = utc_offset[0], int(utc_offset[1:3]), int(utc_offset[3:5])
-
-                # Convert the utc offset in seconds
-                utc_offset = int(f"{sign}{(hours * 60 * 60) + (minutes * 60)}")
-
-                return [user_tzinfo, utc_offset]
+                return ZoneInfo(key=user_timezone)
             
     return None
 
 
-def save_todo(todo_data: dict) -> UUID:
+async def save_todo(todo_data: dict, bot_data: dict) -> UUID:
 
     # Save the todo to db
-    return create_todo(todo_data=todo_data)
+    if todo_id := await create_todo(todo_data=todo_data):
+
+        # Schedule it in memory too (if the timing wheel is enabled)
+        schedule_reminder(
+            bot_data=bot_data,
+            todo_id=todo_id,
+            kind=ScheduleKind.TODO,
+            due_at=todo_data["due_date"]
+        )
+
+    return todo_id
 
 
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
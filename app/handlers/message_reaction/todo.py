@@ -1,7 +1,10 @@
 from datetime import UTC, datetime, timedelta
 from constants.emoji import Emoji
-from models.todo.crud.retrieve import retrieve_todo
-from models.todo.crud.update import update_todo
+from handlers.utils.local_datetimes import format_local_datetime, get_todo_tzinfo
+from jobs.cleanup_pending_messages_job import PENDING_MESSAGES_TTL
+from jobs.dispatch_reminders_job import cancel_reminders
+from models.pending_message.crud.retrieve import retrieve_pending_message_todo_id
+from models.todo.crud.update import complete_todo
 from telegram import Update
 from telegram.ext import (
     ApplicationHandlerStop, 
@@ -18,76 +21,46 @@ async def mark_todo_as_done(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_telegram_id = message_reaction_updated.user.id
 
     # Guards
-    if not (user_data := context.bot_data.get(user_telegram_id)):
+    # (only a "thumbs-up" completes a to-do, so any other reaction,
+    # custom emojis included, is dropped before looking up the message)
+    if not (reaction := message_reaction_updated.new_reaction) \
+       or getattr(reaction[0], "emoji", None) != Emoji.THUMBS_UP_SIGN:
         raise ApplicationHandlerStop()
-    if not (pending_todos := user_data.get("pending_todos")):
-        raise ApplicationHandlerStop()
-    if message_id not in pending_todos.keys(): 
+
+    # (the pending messages are stored in the db, and cached)
+    if not (todo_id := await retrieve_pending_message_todo_id(
+        chat_id=message_reaction_updated.chat.id, 
+        message_id=message_id
+    )):
         raise ApplicationHandlerStop()
 
-    # If there's a todo_id assigned to the specified message
-    if todo_id := pending_todos.get(message_id):
+    # Mark the to-do as completed (if it's not in the state of "done"),
+    # deleting its reminder and expiring its pending messages, in a single transaction
+    if todo := await complete_todo(
+        todo_id=todo_id,
+        messages_expire_at=datetime.now(UTC) + timedelta(seconds=PENDING_MESSAGES_TTL)
+    ):
+
+        # Calculate the completed time for the current to-do (in user local time)
+        todo_completed_time: str = format_local_datetime(
+            value=datetime.now(UTC), 
+            value_tzinfo=get_todo_tzinfo(todo=todo)
+        )
+
+        # Drop its next reminder (if any) from the timing wheel
+        cancel_reminders(bot_data=context.bot_data, todo_id=todo_id)
+
+        # User text
+        user_text = (
+            f"To-Do checked as completed on "
+            f"{todo_completed_time}"
+        )
         
-        # If there is a todo with the specified id
-        if todo := retrieve_todo(todo_id=todo_id):
-
-            # If there is a new_reaction for the current message_reaction_updated
-            if reaction := message_reaction_updated.new_reaction:
-
-                # Get the 0-th reaction's emoji
-                emoji = reaction[0].emoji
-            
-                # If the to-do is not in the state of "done",
-                # and the user's reaction to the todo-reminder is a "thumbs-up"
-                if (not todo.done) and emoji == Emoji.THUMBS_UP_SIGN:
-
-                    # Prepare the data to update
-                    todo_data: dict = {
-                        "done": True
-                    }
-
-                    # Update the todo
-                    if update_todo(
-                        todo_id=todo_id,
-                        todo_data=todo_data
-                    ):
-                        
-                        # Get the user UTC offset
-                        user_utc_offset = todo.utc_offset
-
-                        # Calculate the completed time for the current to-do
-                        todo_completed_time = datetime.now(UTC) + timedelta(seconds=user_utc_offset)
-                        
-                        # Delete the pending todo
-                        context.bot_data[user_telegram_id]["pending_todos"].pop(message_id)
-
-                        # Set the job name
-                        todo_job_name: str = f"todo_user_job_{todo_id.hex}"
-
-                        # Delete the other job
-                        jobs = context.job_queue.get_jobs_by_name(name=todo_job_name)
-
-                        # If the job has been found
-                        if(jobs):
-
-                            # Get the job
-                            todo_job = jobs[0]
-
-                            # Disable and delete the job
-                            todo_job.enabled = False
-                            todo_job.schedule_removal()
-
-                        # User text
-                        user_text = (
-                            f"To-Do checked as completed on "
-                            f"{todo_completed_time:%Y-%m-%d %H:%M}"
-                        )
-                        
-                        await context.bot.send_message(
-                            chat_id=user_telegram_id,
-                            text=user_text,
-                            reply_to_message_id=message_id
-                        )
+        await context.bot.send_message(
+            chat_id=user_telegram_id,
+            text=user_text,
+            reply_to_message_id=message_id
+        )
 
 
 # Create the handler
@@ -1,10 +1,27 @@
 from constants.bot_commands import BOT_COMMANDS
-from jobs.utils import reload_jobs_post_init
+from database.db import init_db
+from geocoding.reverse import load_offline_geocoder
+from jobs.backfill_locations_job import GEOCODING_BACKFILL_INTERVAL, backfill_locations_job
+from jobs.cleanup_pending_messages_job import PENDING_MESSAGES_CLEANUP_INTERVAL, cleanup_pending_messages_job
+from jobs.cleanup_todos_job import TODOS_CLEANUP_INTERVAL, cleanup_todos_job
+from jobs.dispatch_reminders_job import start_reminders_dispatcher
+from jobs.log_stats_job import STATS_LOG_INTERVAL, log_stats_job
+from jobs.refresh_news_job import NEWS_REFRESH_INTERVAL, refresh_news_job
+from sharding.shard import get_current_shard
 from telegram import BotCommand
 from telegram.ext import Application
 
 
-async def post_init(application: Application) -> None:
+async def setup_bot(application: Application) -> None:
+
+    # One-time setup of the bot, shared by all the processes:
+    # with multiple workers, it's run by the ingress process before starting them
+
+    # Create the db tables (if needed)
+    await init_db()
+
+    # Build the index of the offline geocoder (if enabled and needed)
+    await load_offline_geocoder()
 
     # Initialize an empty list of bot commands
     bot_commands: list = []
@@ -18,7 +35,62 @@ async def post_init(application: Application) -> None:
     # Set bot commands
     await application.bot.set_my_commands(bot_commands)
 
-    # Reload jobs from db
-    await reload_jobs_post_init(application=application)
 
-    return None
\ No newline at end of file
+async def post_init(application: Application) -> None:
+
+    # In a single process, the bot is set up here
+    if not (shard := get_current_shard()):
+        await setup_bot(application=application)
+
+    # A worker only loads the offline geocoder (if enabled),
+    # memory-mapping the index built by the ingress process
+    else:
+        await load_offline_geocoder()
+
+    # Start the dispatcher of the todos (and reminders) due
+    await start_reminders_dispatcher(application=application)
+
+    # Resolve the address of the locations saved without it, in batches
+    # (if the bot runs in multiple workers, only the first one runs the backfill)
+    if not shard or shard.index == 0:
+        application.job_queue.run_repeating(
+            callback=backfill_locations_job,
+            interval=GEOCODING_BACKFILL_INTERVAL,
+            first=GEOCODING_BACKFILL_INTERVAL,
+            name="backfill_locations_job"
+        )
+
+        # Delete the expired pending messages (in the first worker too)
+        application.job_queue.run_repeating(
+            callback=cleanup_pending_messages_job,
+            interval=PENDING_MESSAGES_CLEANUP_INTERVAL,
+            first=PENDING_MESSAGES_CLEANUP_INTERVAL,
+            name="cleanup_pending_messages_job"
+        )
+
+        # Delete the expired reminders and the closed todos (in the first worker too)
+        application.job_queue.run_repeating(
+            callback=cleanup_todos_job,
+            interval=TODOS_CLEANUP_INTERVAL,
+            first=TODOS_CLEANUP_INTERVAL,
+            name="cleanup_todos_job"
+        )
+
+    # Refresh the most requested local news before they expire
+    application.job_queue.run_repeating(
+        callback=refresh_news_job,
+        interval=NEWS_REFRESH_INTERVAL,
+        first=NEWS_REFRESH_INTERVAL,
+        name="refresh_news_job"
+    )
+
+    # Log the stats of the caches of the process
+    if STATS_LOG_INTERVAL > 0:
+        application.job_queue.run_repeating(
+            callback=log_stats_job,
+            interval=STATS_LOG_INTERVAL,
+            first=STATS_LOG_INTERVAL,
+            name="log_stats_job"
+        )
+
+    return None
@@ -0,0 +1,14 @@
+from clients.http import close_http_client
+from database.db import dispose_db
+from telegram.ext import Application
+
+
+async def post_shutdown(application: Application) -> None:
+
+    # Close the shared HTTP client
+    await close_http_client()
+
+    # Close the db connection pool
+    await dispose_db()
+
+    return None
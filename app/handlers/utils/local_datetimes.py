@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone, tzinfo, UTC
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+
+# Format of the (local) datetimes shown to the users
+LOCAL_DATETIME_FORMAT: str = "%Y-%m-%d %H:%M"
+
+
+@lru_cache(maxsize=1024)
+def get_tzinfo(timezone_key: str | None, utc_offset: int | None = None) -> tzinfo:
+
+    # Get the IANA timezone (DST aware) if present, otherwise the fixed UTC offset
+    # (in seconds) of the to-dos created before the timezone was stored.
+    # The tzinfo objects are cached, since they're shared by many rows
+    if timezone_key:
+        return ZoneInfo(key=timezone_key)
+
+    return timezone(timedelta(seconds=utc_offset or 0))
+
+
+def get_todo_tzinfo(todo) -> tzinfo:
+    return get_tzinfo(timezone_key=todo.timezone, utc_offset=todo.utc_offset)
+
+
+def format_local_datetimes(values: list, tzinfos: list) -> list:
+
+    # Format all the (UTC) datetimes in their local time, in one pass.
+    # The naive datetimes (e.g. returned by SQLite) are stored in UTC.
+    # Many rows share the same datetime and timezone (e.g. the todos due
+    # in the same minute), so every pair is converted and formatted only once
+    formatted: dict = {}
+
+    for value, value_tzinfo in zip(values, tzinfos):
+        if (value, value_tzinfo) not in formatted:
+            utc_value: datetime = value if value.tzinfo else value.replace(tzinfo=UTC)
+            formatted[(value, value_tzinfo)] = f"{utc_value.astimezone(tz=value_tzinfo):{LOCAL_DATETIME_FORMAT}}"
+
+    return [formatted[(value, value_tzinfo)] for value, value_tzinfo in zip(values, tzinfos)]
+
+
+def format_local_datetime(value: datetime, value_tzinfo: tzinfo) -> str:
+    return format_local_datetimes(values=[value], tzinfos=[value_tzinfo])[0]
+
+
+def format_todos_due_dates(todos: list) -> list:
+
+    # Format the due dates of a page of to-dos
+    return format_local_datetimes(
+        values=[todo.due_date for todo in todos],
+        tzinfos=[get_todo_tzinfo(todo=todo) for todo in todos]
+    )
@@ -0,0 +1,103 @@
+from re import compile
+from zlib import crc32
+import numpy as np
+
+
+# Number of hash functions of the MinHash signatures
+NUM_PERMUTATIONS: int = 64
+
+# Length of the character shingles
+SHINGLE_SIZE: int = 3
+
+# Mersenne prime used by the (universal) hash functions
+MERSENNE_PRIME: int = (1 << 31) - 1
+
+# Pattern of the characters removed while normalizing the texts
+NON_WORD_PATTERN = compile(pattern=r"[\W_]+")
+
+# Coefficients of the hash functions (a * x + b) % prime
+# They're generated with a fixed seed, so that the signatures are stable
+random_generator = np.random.default_rng(seed=42)
+HASH_A = random_generator.integers(low=1, high=MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.int64)
+HASH_B = random_generator.integers(low=0, high=MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.int64)
+
+
+def find_unique(texts: list, threshold: float) -> list:
+
+    # Return the indexes of the texts that are not near-duplicates
+    # of a previous text (estimated Jaccard similarity of the shingles >= threshold).
+    # Instead of comparing every pair of texts, the MinHash signatures are split
+    # in bands (LSH), and only the texts sharing at least a band are compared.
+    # The LSH threshold is set a bit lower than the requested one, to not miss
+    # the pairs whose similarity is just above it
+    bands, rows = get_lsh_parameters(threshold=threshold * 0.8)
+
+    # Buckets of every band, as band hash -> indexes of the unique texts
+    buckets: list = [{} for _ in range(bands)]
+
+    # MinHash signatures of the unique texts, by index
+    signatures: dict = {}
+
+    unique_indexes: list = []
+
+    for index, text in enumerate(texts):
+
+        signature = get_minhash_signature(text=text)
+
+        # Get the band keys of the signature
+        band_keys: list = [signature[band * rows:(band + 1) * rows].tobytes() for band in range(bands)]
+
+        # Get the (unique) texts sharing at least a band with the current one
+        candidates: set = {
+            candidate
+            for band, band_key in enumerate(band_keys)
+            for candidate in buckets[band].get(band_key, ())
+        }
+
+        # If the text is similar to one of the candidates, it's a duplicate
+        if any(
+            np.mean(signature == signatures[candidate]) >= threshold
+            for candidate in candidates
+        ):
+            continue
+
+        # Otherwise, add it to the unique texts (and to the buckets)
+        unique_indexes.append(index)
+        signatures[index] = signature
+
+        for band, band_key in enumerate(band_keys):
+            buckets[band].setdefault(band_key, []).append(index)
+
+    return unique_indexes
+
+
+def get_minhash_signature(text: str) -> np.ndarray:
+
+    # Normalize the text (lowercase, without punctuation and extra spaces)
+    text = NON_WORD_PATTERN.sub(" ", text.lower()).strip()
+
+    # Get the hashes of the (unique) character shingles of the text
+    shingles: set = {text[i:i + SHINGLE_SIZE] for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))}
+    hashes = np.fromiter(
+        (crc32(shingle.encode()) % MERSENNE_PRIME for shingle in shingles),
+        dtype=np.int64,
+        count=len(shingles)
+    )
+
+    # Apply all the hash functions to all the shingles,
+    # and keep the minimum value for every hash function
+    return ((HASH_A[:, None] * hashes[None, :] + HASH_B[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+
+def get_lsh_parameters(threshold: float) -> tuple:
+
+    # Get the number of bands (and rows per band) whose LSH threshold,
+    # (1 / bands) ^ (1 / rows), is the closest to the requested one
+    return min(
+        (
+            (NUM_PERMUTATIONS // rows, rows)
+            for rows in range(1, NUM_PERMUTATIONS + 1)
+            if NUM_PERMUTATIONS % rows == 0
+        ),
+        key=lambda parameters: abs((1 / parameters[0]) ** (1 / parameters[1]) - threshold)
+    )
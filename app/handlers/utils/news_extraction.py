@@ -0,0 +1,125 @@
+from bs4 import BeautifulSoup, ResultSet
+from dotenv import load_dotenv
+from logging import Logger, getLogger
+from os import getenv
+
+# lxml is optional: if it's not installed, the BeautifulSoup extractor is used
+try:
+    from lxml.etree import HTMLPullParser
+except ImportError:
+    HTMLPullParser = None
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Extraction engine: "lxml" (default, streaming), or "soup"
+NEWS_EXTRACTOR: str = getenv("NEWS_EXTRACTOR", "lxml")
+
+# Source to append to the links
+NEWS_SOURCE: str = "https://news.google.com"
+
+# Size of the chunks fed to the streaming parser
+CHUNK_SIZE: int = 64 * 1024
+
+logger: Logger = getLogger(__name__)
+
+
+def extract_news(content: bytes, limit: int, url: str | None = None) -> list:
+
+    # Use the streaming extractor (if enabled and available),
+    # and fall back to the BeautifulSoup one otherwise
+    if NEWS_EXTRACTOR == "lxml" and HTMLPullParser is not None:
+
+        try:
+            return extract_news_with_lxml(content=content, limit=limit)
+
+        except Exception:
+            logger.warning("lxml extraction failed for %s, falling back to soup", url, exc_info=True)
+
+    return extract_news_with_soup(content=content, limit=limit)
+
+
+def extract_news_with_lxml(content: bytes, limit: int) -> list:
+
+    # Initialize an empty list of news
+    news_list: list = []
+
+    # Create the (C-backed, streaming) parser,
+    # which emits an event every time a c-wiz tag is closed
+    parser = HTMLPullParser(events=("end",), tag="c-wiz")
+
+    # Feed the page in chunks, and stop as soon as enough news are found
+    for start in range(0, len(content), CHUNK_SIZE):
+
+        parser.feed(content[start:start + CHUNK_SIZE])
+
+        for _, c_wiz in parser.read_events():
+
+            # Skip the c-wiz tags without the specified class
+            if "XBspb" not in (c_wiz.get("class") or "").split():
+                continue
+
+            # Extract the anchor and time tags with the specified classes in the c-wiz
+            a = next(iter(c_wiz.xpath(".//a[contains(concat(' ', @class, ' '), ' JtKRv ')]")), None)
+            time = next(iter(c_wiz.xpath(".//time[contains(concat(' ', @class, ' '), ' hvbAAd ')]")), None)
+
+            if a is not None and time is not None:
+
+                # Set the row of news with the text, href and datetime of the tags
+                news_list.append(
+                    [
+                        a.xpath("string()"),
+                        f"{NEWS_SOURCE}/{a.get('href')[2:]}",
+                        time.get("datetime")
+                    ]
+                )
+
+                if len(news_list) >= limit:
+                    return news_list
+
+            # Free the memory used by the tag (it's not needed anymore)
+            c_wiz.clear()
+
+    return news_list
+
+
+def extract_news_with_soup(content: bytes, limit: int) -> list:
+
+    # Initialize an empty list of news
+    news_list: list = []
+
+    # Create the scraper
+    soup = BeautifulSoup(markup=content, features="html.parser")
+
+    # Get all the c-wiz tags with the specified class
+    c_wizs: ResultSet = soup.find_all(name="c-wiz", class_="XBspb")
+
+    # For each tag found
+    for c_wiz in c_wizs:
+
+        # Extract the anchor tag with the specified class in the c-wiz
+        a = c_wiz.find(name="a", class_="JtKRv")
+
+        # Get the time tag with the specified class in the c-wiz
+        time = c_wiz.find(name="time", class_="hvbAAd")
+
+        # Skip the articles without a title or a datetime (as the lxml extractor does)
+        if a is None or time is None:
+            continue
+
+        # Extract the text, href and datetime of the tags
+        news_title: str = a.text
+        news_link: str = f"{NEWS_SOURCE}/{a['href'][2:]}"
+        news_datetime: str = time['datetime']
+
+        # Set the row of news with the various information
+        news = [news_title, news_link, news_datetime]
+
+        # Append the news row to the news list
+        news_list.append(news)
+
+        if len(news_list) >= limit:
+            break
+
+    return news_list
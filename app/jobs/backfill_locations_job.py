@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, UTC
+from dotenv import load_dotenv
+from geocoding.reverse import reverse_geocode
+from logging import Logger, getLogger
+from models.location.crud.retrieve import retrieve_locations_without_address
+from models.location.crud.update import update_location
+from os import getenv
+from telegram.ext import ContextTypes, JobQueue
+from uuid import UUID
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# The locations are resolved in batches (every interval, in seconds),
+# and every request to Nominatim is throttled to 1 request per second
+GEOCODING_BACKFILL_BATCH_SIZE: int = int(getenv("GEOCODING_BACKFILL_BATCH_SIZE", "30"))
+GEOCODING_BACKFILL_INTERVAL: int = int(getenv("GEOCODING_BACKFILL_INTERVAL", "60"))
+
+# A location that can't be resolved is attempted again after GEOCODING_RETRY_DELAY seconds,
+# doubling the delay at every failed attempt, up to GEOCODING_RETRY_MAX_DELAY seconds
+GEOCODING_RETRY_DELAY: int = int(getenv("GEOCODING_RETRY_DELAY", "300"))
+GEOCODING_RETRY_MAX_DELAY: int = int(getenv("GEOCODING_RETRY_MAX_DELAY", "86400"))
+
+logger: Logger = getLogger(__name__)
+
+
+async def backfill_locations_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+
+    # Get the next batch of locations saved without address
+    # (the job keeps running, since new locations are saved without address)
+    locations = await retrieve_locations_without_address(
+        retry_before=datetime.now(UTC),
+        limit=GEOCODING_BACKFILL_BATCH_SIZE
+    )
+
+    for location in locations:
+
+        await resolve_location_address(
+            location_id=location.id,
+            latitude=location.latitude,
+            longitude=location.longitude,
+            geocoding_attempts=location.geocoding_attempts
+        )
+
+
+def enqueue_locations_backfill(job_queue: JobQueue) -> None:
+
+    # Run the backfill right away, if it runs in this process
+    # (with multiple workers, only in the first one) and it's not queued already.
+    # Otherwise, the location is resolved by the next scheduled run
+    if job_queue.get_jobs_by_name("backfill_locations_job") \
+       and not job_queue.get_jobs_by_name("backfill_locations_now_job"):
+        job_queue.run_once(
+            callback=backfill_locations_job,
+            when=0,
+            name="backfill_locations_now_job"
+        )
+
+
+async def resolve_location_address(
+    location_id: UUID,
+    latitude: float,
+    longitude: float,
+    geocoding_attempts: int | None = None
+) -> dict | None:
+
+    # Resolve the address of the location (rate limited)
+    try:
+        address: dict | None = await reverse_geocode(latitude=latitude, longitude=longitude)
+
+    except Exception:
+        logger.warning("Unable to resolve the address of the location %s", location_id, exc_info=True)
+
+        address = None
+
+    # Save the address, clearing the failed attempts
+    if address and address.get("city"):
+
+        location_data: dict = {
+            "city": address.get("city"),
+            "country": address.get("country"),
+            "geocoding_attempts": None,
+            "geocoding_retry_at": None
+        }
+
+    # Otherwise, leave the address empty and delay the next attempt
+    else:
+
+        geocoding_attempts = (geocoding_attempts or 0) + 1
+        retry_delay: int = min(
+            GEOCODING_RETRY_DELAY * 2 ** (geocoding_attempts - 1),
+            GEOCODING_RETRY_MAX_DELAY
+        )
+
+        location_data: dict = {
+            "geocoding_attempts": geocoding_attempts,
+            "geocoding_retry_at": datetime.now(UTC) + timedelta(seconds=retry_delay)
+        }
+
+        address = None
+
+    # Update the location
+    await update_location(location_id=location_id, location_data=location_data)
+
+    return address
@@ -0,0 +1,27 @@
+from datetime import UTC, datetime
+from dotenv import load_dotenv
+from models.pending_message.crud.delete import delete_expired_pending_messages
+from os import getenv
+from telegram.ext import ContextTypes
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# The messages of a closed to-do are kept for the specified time (in seconds),
+# and then deleted in batches (every interval, in seconds)
+PENDING_MESSAGES_TTL: int = int(getenv("PENDING_MESSAGES_TTL", "86400"))
+PENDING_MESSAGES_CLEANUP_INTERVAL: int = int(getenv("PENDING_MESSAGES_CLEANUP_INTERVAL", "3600"))
+PENDING_MESSAGES_CLEANUP_BATCH_SIZE: int = int(getenv("PENDING_MESSAGES_CLEANUP_BATCH_SIZE", "1000"))
+
+
+async def cleanup_pending_messages_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+
+    now: datetime = datetime.now(UTC)
+
+    # Delete the expired messages, a batch at a time
+    while await delete_expired_pending_messages(
+        expires_before=now, 
+        limit=PENDING_MESSAGES_CLEANUP_BATCH_SIZE
+    ) == PENDING_MESSAGES_CLEANUP_BATCH_SIZE:
+        pass
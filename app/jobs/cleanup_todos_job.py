@@ -0,0 +1,39 @@
+from datetime import UTC, datetime, timedelta
+from dotenv import load_dotenv
+from jobs.dispatch_reminders_job import SCHEDULER_GRACE_PERIOD
+from models.reminder.crud.delete import delete_reminders
+from models.reminder.crud.retrieve import retrieve_expired_reminder_ids
+from models.todo.crud.delete import delete_todos
+from models.todo.crud.retrieve import retrieve_closed_todo_ids
+from os import getenv
+from telegram.ext import ContextTypes
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# The completed todos are kept for the specified time (in seconds) after their due date,
+# and then deleted in batches (every interval, in seconds), together with the reminders
+# missed for longer than the scheduler grace period
+CLOSED_TODOS_RETENTION: int = int(getenv("CLOSED_TODOS_RETENTION", "2592000"))
+TODOS_CLEANUP_INTERVAL: int = int(getenv("TODOS_CLEANUP_INTERVAL", "3600"))
+TODOS_CLEANUP_BATCH_SIZE: int = int(getenv("TODOS_CLEANUP_BATCH_SIZE", "1000"))
+
+
+async def cleanup_todos_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+
+    now: datetime = datetime.now(UTC)
+
+    # Delete the expired reminders, a batch at a time
+    while reminder_ids := await retrieve_expired_reminder_ids(
+        remind_before=now - timedelta(seconds=SCHEDULER_GRACE_PERIOD), 
+        limit=TODOS_CLEANUP_BATCH_SIZE
+    ):
+        await delete_reminders(reminder_ids=reminder_ids)
+
+    # Delete the closed todos (with their pending messages), a batch at a time
+    while todo_ids := await retrieve_closed_todo_ids(
+        due_before=now - timedelta(seconds=CLOSED_TODOS_RETENTION), 
+        limit=TODOS_CLEANUP_BATCH_SIZE
+    ):
+        await delete_todos(todo_ids=todo_ids)
@@ -0,0 +1,316 @@
+from asyncio import as_completed
+from clients.rate_limiter import Priority
+from constants.emoji import Emoji
+from datetime import UTC, datetime, timedelta
+from dotenv import load_dotenv
+from handlers.utils.local_datetimes import format_local_datetimes, get_tzinfo
+from logging import Logger, getLogger
+from models.pending_message.cache import cache_pending_message
+from models.pending_message.crud.create import create_pending_messages
+from models.schedule.crud.delete import delete_missed_schedule_entries, delete_schedule_entries
+from models.schedule.crud.retrieve import retrieve_schedule_entries
+from models.schedule.crud.update import claim_due_schedule_entries
+from models.schedule.schedule import ScheduleKind, ScheduleState
+from os import getenv
+from scheduling.timing_wheel import TimingWheel
+from sharding.shard import get_current_shard
+from sqlalchemy import Row
+from telegram import Message
+from telegram.ext import Application, ContextTypes
+from uuid import UUID
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Every interval (in seconds), the dispatcher claims the schedule entries due
+# (in batches), and sends their messages
+DISPATCHER_TICK_INTERVAL: int = int(getenv("DISPATCHER_TICK_INTERVAL", "10"))
+DISPATCHER_SEND_BATCH_SIZE: int = int(getenv("DISPATCHER_SEND_BATCH_SIZE", "500"))
+
+# The pending messages are saved in the db in chunks, as their messages are sent
+DISPATCHER_SAVE_BATCH_SIZE: int = int(getenv("DISPATCHER_SAVE_BATCH_SIZE", "50"))
+
+# The entries due up to the grace period ago (in seconds) are still dispatched
+# (e.g. after a restart), the older ones are dropped.
+# The entries claimed by a dispatcher that didn't complete them within
+# the claim timeout (in seconds) are claimed again
+SCHEDULER_GRACE_PERIOD: int = int(getenv("SCHEDULER_GRACE_PERIOD", "3600"))
+SCHEDULER_CLAIM_TIMEOUT: int = int(getenv("SCHEDULER_CLAIM_TIMEOUT", "300"))
+
+# Scheduling engine: "db" (default), which looks for the entries due in the db
+# at every run, or "wheel", which keeps the pending entries in an in-memory
+# timing wheel (by minute), and claims from the db only the ones that fire.
+# The wheel only knows the entries created by its own process,
+# so it's meant for a single bot instance (with any number of workers)
+SCHEDULER_ENGINE: str = getenv("SCHEDULER_ENGINE", "db")
+
+logger: Logger = getLogger(__name__)
+
+
+async def start_reminders_dispatcher(application: Application) -> None:
+
+    # Load the entries in the timing wheel (if enabled)
+    if SCHEDULER_ENGINE == "wheel":
+
+        application.bot_data["reminders_wheel"] = reminders_wheel = TimingWheel(now=datetime.now(UTC).timestamp())
+
+        for schedule_entry in await retrieve_schedule_entries(
+            due_after=datetime.now(UTC) - timedelta(seconds=SCHEDULER_GRACE_PERIOD),
+            shard=get_current_shard()
+        ):
+            reminders_wheel.schedule(
+                key=(schedule_entry.todo_id, schedule_entry.kind),
+                due_at=get_schedule_timestamp(schedule_entry=schedule_entry),
+                item=schedule_entry.todo_id
+            )
+
+    # The schedule is stored in the db, so the first run
+    # dispatches the entries due while the bot was offline
+    application.job_queue.run_repeating(
+        callback=dispatch_reminders_job,
+        interval=DISPATCHER_TICK_INTERVAL,
+        first=0,
+        name="dispatch_reminders_job"
+    )
+
+
+async def dispatch_reminders_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+
+    now: datetime = datetime.now(UTC)
+    due_after: datetime = now - timedelta(seconds=SCHEDULER_GRACE_PERIOD)
+
+    # Drop the entries missed for longer than the grace period
+    await delete_missed_schedule_entries(due_before=due_after)
+
+    # Claim the entries of the todos fired by the timing wheel (if enabled)
+    if (reminders_wheel := context.bot_data.get("reminders_wheel")) is not None:
+        await dispatch_fired_reminders(context=context, reminders_wheel=reminders_wheel, now=now)
+
+        return None
+
+    # Otherwise, claim the entries due, a batch at a time
+    while due_entries := await claim_due_schedule_entries(
+        due_after=due_after,
+        due_until=now,
+        claimed_before=now - timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT),
+        limit=DISPATCHER_SEND_BATCH_SIZE,
+        shard=get_current_shard()
+    ):
+
+        await send_reminders(context=context, due_entries=due_entries)
+
+        # Stop at the last (partial) batch
+        if len(due_entries) < DISPATCHER_SEND_BATCH_SIZE:
+            break
+
+
+async def dispatch_fired_reminders(
+    context: ContextTypes.DEFAULT_TYPE,
+    reminders_wheel: TimingWheel,
+    now: datetime
+) -> None:
+
+    due_after: datetime = now - timedelta(seconds=SCHEDULER_GRACE_PERIOD)
+
+    # The wheel fires all the entries of the current tick (of a minute),
+    # so some of them may be due later than now
+    fired: dict = dict(reminders_wheel.advance(now=now.timestamp()))
+    todo_ids: list = list(set(fired.values()))
+
+    # Keys of the entries claimed and sent
+    dispatched: set = set()
+
+    try:
+
+        for start in range(0, len(todo_ids), DISPATCHER_SEND_BATCH_SIZE):
+
+            batch: list = todo_ids[start:start + DISPATCHER_SEND_BATCH_SIZE]
+
+            # A todo has (at most) an entry per kind
+            if due_entries := await claim_due_schedule_entries(
+                due_after=due_after,
+                due_until=now,
+                claimed_before=now - timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT),
+                limit=len(batch) * len(ScheduleKind),
+                shard=get_current_shard(),
+                todo_ids=batch
+            ):
+                failed_entries: list = await send_reminders(context=context, due_entries=due_entries)
+
+                dispatched.update((due_entry.todo_id, due_entry.kind) for due_entry in due_entries)
+                dispatched.difference_update((due_entry.todo_id, due_entry.kind) for due_entry in failed_entries)
+
+        # Put back in the wheel the fired entries not dispatched that still exist:
+        # the ones due later in the tick, the ones claimed by another dispatcher,
+        # and the ones not sent (due again when their claim expires).
+        # The others have been completed or dropped
+        if undispatched := fired.keys() - dispatched:
+
+            for schedule_entry in await retrieve_schedule_entries(
+                due_after=due_after,
+                todo_ids=list({todo_id for todo_id, _ in undispatched})
+            ):
+                key: tuple = (schedule_entry.todo_id, schedule_entry.kind)
+
+                # Skip the entries scheduled again in the meanwhile (e.g. by a handler)
+                if key in undispatched and key not in reminders_wheel.items:
+                    reminders_wheel.schedule(
+                        key=key,
+                        due_at=get_schedule_timestamp(schedule_entry=schedule_entry),
+                        item=schedule_entry.todo_id
+                    )
+
+    except Exception:
+
+        # Put back in the wheel the fired entries not dispatched, to retry them at the next run
+        # (the entries already claimed are claimed again when their claim expires)
+        logger.exception("Unable to dispatch the fired reminders, retrying them at the next run")
+
+        for key in fired.keys() - dispatched:
+            if key not in reminders_wheel.items:
+                reminders_wheel.schedule(key=key, due_at=now.timestamp(), item=fired[key])
+
+
+async def send_reminders(context: ContextTypes.DEFAULT_TYPE, due_entries: list) -> list:
+
+    # Ids of the entries completed: the ones of the todos completed in the meanwhile
+    # (which are skipped), and the ones sent
+    completed_entry_ids: list = [due_entry.entry_id for due_entry in due_entries if due_entry.done]
+
+    # Entries not sent
+    failed_entries: list = []
+
+    if due_todos := [due_entry for due_entry in due_entries if not due_entry.done]:
+
+        # Render all the messages
+        users_texts: list = render_reminders(due_todos=due_todos)
+
+        # Send the messages (the rate limiter spreads them over time,
+        # giving the precedence to the interactive replies)
+        pending_messages_data: list = []
+
+        for send in as_completed(
+            [
+                send_reminder(context=context, due_todo=due_todo, text=user_text)
+                for due_todo, user_text in zip(due_todos, users_texts)
+            ]
+        ):
+            due_todo, pending_message_data = await send
+
+            if not pending_message_data:
+                failed_entries.append(due_todo)
+
+                continue
+
+            completed_entry_ids.append(due_todo.entry_id)
+            pending_messages_data.append(pending_message_data)
+
+            # Save the pending messages (the to-dos can be completed with a message reaction)
+            # a chunk at a time, with a single statement, while the other messages are sent
+            if len(pending_messages_data) >= DISPATCHER_SAVE_BATCH_SIZE:
+                await create_pending_messages(pending_messages_data=pending_messages_data)
+
+                pending_messages_data = []
+
+        await create_pending_messages(pending_messages_data=pending_messages_data)
+
+    # Delete the completed entries (and the fired reminders).
+    # The entries not sent are left claimed, so that they're claimed again
+    # when their claim expires (until they're missed for longer than the grace period)
+    await delete_schedule_entries(entry_ids=completed_entry_ids)
+
+    return failed_entries
+
+
+async def send_reminder(context: ContextTypes.DEFAULT_TYPE, due_todo: Row, text: str) -> tuple:
+
+    # Return the entry, with the data of its pending message (None, if it's not sent)
+
+    try:
+        message: Message = await context.bot.send_message(
+            chat_id=due_todo.chat_id,
+            text=text,
+            rate_limit_args=Priority.BACKGROUND
+        )
+
+    except Exception:
+        logger.warning("Unable to send the reminder of the to-do %s", due_todo.todo_id, exc_info=True)
+
+        return due_todo, None
+
+    # Cache the pending message right away, since the user can react to it
+    # before it's saved in the db
+    cache_pending_message(chat_id=due_todo.chat_id, message_id=message.id, todo_id=due_todo.todo_id)
+
+    return due_todo, {
+        "chat_id": due_todo.chat_id,
+        "message_id": message.id,
+        "todo_id": due_todo.todo_id
+    }
+
+
+def render_reminders(due_todos: list) -> list:
+
+    # Get the due dates and the reminder dates (if any) in the users' local time,
+    # formatting all of them in one pass
+    tzinfos: list = [
+        get_tzinfo(timezone_key=due_todo.timezone, utc_offset=due_todo.utc_offset)
+        for due_todo in due_todos
+    ]
+
+    users_due_dates: list = format_local_datetimes(
+        values=[due_todo.due_date for due_todo in due_todos],
+        tzinfos=tzinfos
+    )
+
+    users_remind_ats: list = format_local_datetimes(
+        values=[due_todo.remind_at or due_todo.due_date for due_todo in due_todos],
+        tzinfos=tzinfos
+    )
+
+    return [
+        (
+            f"{Emoji.ALARM_CLOCK} To-do reminder (due {user_due_date})\n"
+            f"{f"(reminder set at {user_remind_at})\n" if due_todo.kind == ScheduleKind.REMINDER else ""}\n"
+            f"To-do details:\n"
+            f"<code>{due_todo.details}</code>\n\n"
+            f"<i>React with a {Emoji.THUMBS_UP_SIGN} to the message to mark the to-do as completed.</i>"
+        )
+        for due_todo, user_due_date, user_remind_at in zip(due_todos, users_due_dates, users_remind_ats)
+    ]
+
+
+def schedule_reminder(bot_data: dict, todo_id: UUID, kind: ScheduleKind, due_at: datetime) -> None:
+
+    # Add the entry to the timing wheel (if enabled):
+    # the entries are always stored in the db, when the todos and reminders are created
+    if (reminders_wheel := bot_data.get("reminders_wheel")) is not None:
+        reminders_wheel.schedule(key=(todo_id, kind), due_at=get_timestamp(value=due_at), item=todo_id)
+
+
+def cancel_reminders(bot_data: dict, todo_id: UUID) -> None:
+
+    # Drop the entries of the todo from the timing wheel (if enabled)
+    if (reminders_wheel := bot_data.get("reminders_wheel")) is not None:
+        for kind in ScheduleKind:
+            reminders_wheel.cancel(key=(todo_id, kind))
+
+
+def get_schedule_timestamp(schedule_entry: Row) -> float:
+
+    # The claimed entries are due again when their claim expires
+    # (if the dispatcher that claimed them stopped before completing them)
+    if schedule_entry.state == ScheduleState.CLAIMED and schedule_entry.claimed_at:
+        return max(
+            get_timestamp(value=schedule_entry.due_at),
+            get_timestamp(value=schedule_entry.claimed_at) + SCHEDULER_CLAIM_TIMEOUT
+        )
+
+    return get_timestamp(value=schedule_entry.due_at)
+
+
+def get_timestamp(value: datetime) -> float:
+
+    # The naive datetimes (e.g. returned by SQLite) are stored in UTC
+    return (value if value.tzinfo else value.replace(tzinfo=UTC)).timestamp()
@@ -0,0 +1,46 @@
+from clients.rate_limiter import PriorityRateLimiter
+from dotenv import load_dotenv
+from geocoding.reverse import geocoding_cache
+from handlers.command.news import news_cache
+from handlers.command.weather import weather_cache
+from logging import Logger, getLogger
+from models.pending_message.cache import pending_message_cache
+from models.user.cache import user_cache
+from os import getenv
+from sharding.shard import get_current_shard
+from telegram.ext import ContextTypes
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Interval (in seconds) between the logs of the stats of the caches
+# and of the rate limiter (0 to disable them)
+STATS_LOG_INTERVAL: int = int(getenv("STATS_LOG_INTERVAL", "300"))
+
+logger: Logger = getLogger(__name__)
+
+
+async def log_stats_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+
+    # The stats are kept by every process, so the logs tell the worker they refer to
+    prefix: str = f"[worker {shard.index}] " if (shard := get_current_shard()) else ""
+
+    logger.info("%sUser cache: %s", prefix, format_stats(stats=user_cache.stats))
+    logger.info("%sWeather cache: %s", prefix, format_stats(stats=weather_cache.stats))
+    logger.info("%sGeocoding cache: %s", prefix, format_stats(stats=geocoding_cache.stats))
+    logger.info("%sNews cache: %s", prefix, format_stats(stats=news_cache.stats))
+    logger.info("%sPending message cache: %s", prefix, format_stats(stats=pending_message_cache.stats))
+
+    # Log the queue of the outbound Bot API requests
+    if isinstance(rate_limiter := context.bot.rate_limiter, PriorityRateLimiter):
+        logger.info("%sRate limiter: %s", prefix, format_stats(stats=rate_limiter.stats))
+
+
+def format_stats(stats: dict) -> str:
+
+    # Format the stats as "name=value" pairs, with the ratios and times rounded
+    return " ".join(
+        f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}"
+        for name, value in stats.items()
+    )
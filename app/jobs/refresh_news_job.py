@@ -0,0 +1,32 @@
+from asyncio import wait
+from dotenv import load_dotenv
+from handlers.command.news import get_local_news, news_cache
+from os import getenv
+from telegram.ext import ContextTypes
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Every interval (in seconds), the news of the most requested cities (up to top K)
+# that would expire before the next run are refreshed in the background
+NEWS_REFRESH_INTERVAL: int = int(getenv("NEWS_REFRESH_INTERVAL", "300"))
+NEWS_REFRESH_TOP_K: int = int(getenv("NEWS_REFRESH_TOP_K", "50"))
+
+
+async def refresh_news_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+
+    # Get the URLs of the most requested local news about to expire
+    urls: list = news_cache.most_requested_expiring(
+        count=NEWS_REFRESH_TOP_K,
+        within=NEWS_REFRESH_INTERVAL
+    )
+
+    # Refresh them one at a time, so that Google News is not hammered
+    # (the users keep being served the cached news in the meantime).
+    # A failed refresh doesn't stop the others, and the cached news are kept
+    for url in urls:
+        await wait([news_cache.refresh(key=url, loader=lambda url=url: get_local_news(url=url))])
+
+    # Decay the request counters, so that the ranking follows the recent requests
+    news_cache.decay_requests()
@@ -0,0 +1,18 @@
+from dotenv import load_dotenv
+from logging import WARNING, basicConfig, getLogger
+from os import getenv
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Level of the logs (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL: str = getenv("LOG_LEVEL", "INFO")
+
+
+def configure_logging() -> None:
+
+    # Configure the logs of the bot (and of the libraries), in every process
+    # The requests sent by httpx are logged only if they fail
+    basicConfig(format="%(asctime)s %(levelname)s %(processName)s %(name)s: %(message)s", level=LOG_LEVEL)
+    getLogger("httpx").setLevel(WARNING)
@@ -1,4 +1,6 @@
 from models.user.user import User
 from models.location.location import Location
 from models.reminder.reminder import Reminder
-from models.todo.todo import Todo
\ No newline at end of file
+from models.todo.todo import Todo
+from models.schedule.schedule import ScheduleEntry
+from models.pending_message.pending_message import PendingMessage
\ No newline at end of file
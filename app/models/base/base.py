@@ -1,5 +1,13 @@
+from datetime import datetime
+from sqlalchemy import DateTime
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
-    pass
+
+    # All the datetimes handled by the bot are aware (UTC) ones,
+    # so they're stored in timezone aware columns
+    # (required by asyncpg, which refuses aware datetimes for naive columns)
+    type_annotation_map = {
+        datetime: DateTime(timezone=True)
+    }
@@ -1,15 +1,18 @@
 from database.db import SessionLocal
 from models.location.location import Location
+from models.user.cache import invalidate_user_record
+from models.user.user import User
+from sqlalchemy import Select, select
 from uuid import UUID
 
 
-def create_location(location_data: dict) -> UUID:
+async def create_location(location_data: dict) -> UUID:
 
     # Context manager for the SessionLocal
     # It opens a session with the db,
     # which is immediately closed after completing
     # all the operations in the context manager
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         # Create the record
         location = Location(**location_data)
@@ -18,7 +21,16 @@ def create_location(location_data: dict) -> UUID:
         session.add(location)
 
         # Commit the session changes
-        session.commit()
+        await session.commit()
+
+        # Get the user Telegram id
+        sql_statement: Select = select(User.telegram_id) \
+                                .where(User.id == location.user_id)
+
+        user_telegram_id: int = await session.scalar(sql_statement)
+
+        # Drop the (stale) cached record of the user
+        invalidate_user_record(user_telegram_id=user_telegram_id)
 
         # Return the record id
         return location.id
\ No newline at end of file
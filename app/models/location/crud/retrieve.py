@@ -0,0 +1,24 @@
+from database.db import SessionLocal
+from datetime import datetime
+from models.location.location import Location
+from sqlalchemy import Select, or_, select
+
+
+async def retrieve_locations_without_address(retry_before: datetime, limit: int) -> Location | None:
+
+    async with SessionLocal() as session:
+
+        # Get the locations not resolved yet, skipping the ones
+        # whose last attempt failed too recently
+        sql_statement: Select = select(Location) \
+                                .where(
+                                    Location.city.is_(None),
+                                    or_(
+                                        Location.geocoding_retry_at.is_(None),
+                                        Location.geocoding_retry_at <= retry_before
+                                    )
+                                ) \
+                                .order_by(Location.created_at) \
+                                .limit(limit)
+        
+        return (await session.scalars(sql_statement)).all()
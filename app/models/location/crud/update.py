@@ -1,24 +1,36 @@
-from sqlalchemy import Update, update
+from sqlalchemy import Select, Update, select, update
 from database.db import SessionLocal
 from models.location.location import Location
+from models.user.cache import invalidate_user_record
+from models.user.user import User
 from uuid import UUID
 
 
-def update_location(location_id: UUID, location_data: dict) -> UUID:
+async def update_location(location_id: UUID, location_data: dict) -> UUID:
 
     # Context manager for the SessionLocal
     # It opens a session with the db,
     # which is immediately closed after completing
     # all the operations in the context manager
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         # Update location data
         sql_statement: Update = update(Location) \
                                 .where(Location.id == location_id) \
                                 .values(**location_data)
         
-        session.execute(sql_statement)
+        await session.execute(sql_statement)
 
-        session.commit()
+        await session.commit()
+
+        # Get the Telegram id of the user owning the location
+        sql_statement: Select = select(User.telegram_id) \
+                                .join(Location, Location.user_id == User.id) \
+                                .where(Location.id == location_id)
+
+        user_telegram_id: int = await session.scalar(sql_statement)
+
+        # Drop the (stale) cached record of the user
+        invalidate_user_record(user_telegram_id=user_telegram_id)
 
         return location_id
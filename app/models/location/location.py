@@ -13,13 +13,22 @@ class Location(Base):
     # https://docs.sqlalchemy.org/en/20/faq/
     # ormconfiguration.html#part-two-using-dataclasses-support-with-mappedasdataclass
     id: Mapped[UUID] = mapped_column(primary_key=True, nullable=False, default=uuid4)
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     latitude: Mapped[float] = mapped_column(nullable=False)
     longitude: Mapped[float] = mapped_column(nullable=False)
+    city: Mapped[str] = mapped_column(nullable=True)
+    country: Mapped[str] = mapped_column(nullable=True)
+    timezone: Mapped[str] = mapped_column(nullable=True)
+    # Failed attempts to resolve the address (city and country) of the location,
+    # and time after which it can be attempted again (with an exponential backoff)
+    geocoding_attempts: Mapped[int] = mapped_column(nullable=True)
+    geocoding_retry_at: Mapped[datetime] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.now(UTC))
     updated_at: Mapped[datetime] = mapped_column(nullable=True, onupdate=datetime.now(UTC))
 
     # These are the relationships between other models
     # Thanks to these variables, we can access the specified models
-    # through this (Location) model
-    user = relationship("User", back_populates="location", uselist=False)
+    # through this (Location) model.
+    # It is never loaded by default: every query has to explicitly ask
+    # for the relationships it needs
+    user = relationship("User", back_populates="location", lazy="raise", uselist=False)
@@ -0,0 +1,21 @@
+from cache.ttl_cache import TTLCache
+from dotenv import load_dotenv
+from os import getenv
+from uuid import UUID
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+PENDING_MESSAGES_CACHE_MAXSIZE: int = int(getenv("PENDING_MESSAGES_CACHE_MAXSIZE", "10000"))
+PENDING_MESSAGES_CACHE_TTL: int = int(getenv("PENDING_MESSAGES_CACHE_TTL", "3600"))
+
+
+# Cache of the to-do ids of the pending messages, keyed by (chat id, message id)
+# The messages without a to-do aren't cached, since they may be just sent
+# (and not saved in the db yet)
+pending_message_cache = TTLCache(maxsize=PENDING_MESSAGES_CACHE_MAXSIZE, ttl=PENDING_MESSAGES_CACHE_TTL)
+
+
+def cache_pending_message(chat_id: int, message_id: int, todo_id: UUID | None) -> None:
+    pending_message_cache.set((chat_id, message_id), todo_id)
@@ -0,0 +1,24 @@
+from database.db import SessionLocal
+from models.pending_message.cache import cache_pending_message
+from models.pending_message.pending_message import PendingMessage
+from sqlalchemy import insert
+
+
+async def create_pending_messages(pending_messages_data: list) -> int:
+
+    if not pending_messages_data:
+        return 0
+
+    async with SessionLocal() as session:
+
+        # Insert all the records (executemany)
+        await session.execute(insert(PendingMessage), pending_messages_data)
+
+        await session.commit()
+
+    # Save the records in the cache
+    for pending_message_data in pending_messages_data:
+        cache_pending_message(**pending_message_data)
+
+    # Return the number of created records
+    return len(pending_messages_data)
@@ -0,0 +1,27 @@
+from database.db import SessionLocal
+from datetime import datetime
+from models.pending_message.pending_message import PendingMessage
+from sqlalchemy import Delete, delete, select
+
+
+async def delete_expired_pending_messages(expires_before: datetime, limit: int) -> int:
+
+    async with SessionLocal() as session:
+
+        # Delete the next batch of expired records
+        # (the cached to-do ids expire on their own, and a closed to-do can't be completed anyway)
+        sql_statement: Delete = delete(PendingMessage) \
+                                .where(
+                                    PendingMessage.id.in_(
+                                        select(PendingMessage.id) \
+                                        .where(PendingMessage.expires_at <= expires_before) \
+                                        .limit(limit)
+                                    )
+                                )
+        
+        deleted: int = (await session.execute(sql_statement)).rowcount
+
+        await session.commit()
+
+        # Return the number of deleted records
+        return deleted
@@ -0,0 +1,33 @@
+from cache.coalescing_cache import MISSING
+from database.db import SessionLocal
+from models.pending_message.cache import cache_pending_message, pending_message_cache
+from models.pending_message.pending_message import PendingMessage
+from sqlalchemy import Select, and_, select
+from uuid import UUID
+
+
+async def retrieve_pending_message_todo_id(chat_id: int, message_id: int) -> UUID | None:
+
+    # Serve the to-do id from the cache, if present
+    if (todo_id := pending_message_cache.get((chat_id, message_id), MISSING)) is not MISSING:
+        return todo_id
+
+    # Otherwise, retrieve it from the db
+    async with SessionLocal() as session:
+
+        sql_statement: Select = select(PendingMessage.todo_id) \
+                                .where(
+                                    and_(
+                                        PendingMessage.chat_id == chat_id,
+                                        PendingMessage.message_id == message_id
+                                    )
+                                )
+        
+        todo_id = await session.scalar(sql_statement)
+
+    # Save it in the cache (if any: a message without one may be just sent,
+    # and not saved yet, so it's looked up again in the db next time)
+    if todo_id is not None:
+        cache_pending_message(chat_id=chat_id, message_id=message_id, todo_id=todo_id)
+
+    return todo_id
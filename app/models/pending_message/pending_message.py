@@ -0,0 +1,28 @@
+from datetime import datetime, UTC
+from models.base.base import Base
+from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid import UUID, uuid4
+
+
+class PendingMessage(Base):
+
+    __tablename__ = "pending_messages"
+
+    # A message is identified by its chat and its id (unique in the chat),
+    # and the reactions look it up by both
+    __table_args__ = (
+        UniqueConstraint("chat_id", "message_id", name="uq_pending_messages_chat_id_message_id"),
+    )
+
+    # About "default" parameter:
+    # https://docs.sqlalchemy.org/en/20/faq/
+    # ormconfiguration.html#part-two-using-dataclasses-support-with-mappedasdataclass
+    id: Mapped[UUID] = mapped_column(primary_key=True, nullable=False, default=uuid4)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    todo_id: Mapped[UUID] = mapped_column(ForeignKey("todos.id"), nullable=False, index=True)
+    # Set when the to-do is closed: the message is kept until then,
+    # and deleted by the cleanup job afterwards
+    expires_at: Mapped[datetime] = mapped_column(nullable=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, default=lambda: datetime.now(UTC))
@@ -1,15 +1,19 @@
 from database.db import SessionLocal
 from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
+from models.todo.todo import Todo
+from models.user.user import User
+from sqlalchemy import select
 from uuid import UUID
 
 
-def create_reminder(reminder_data: dict) -> UUID:
+async def create_reminder(reminder_data: dict) -> UUID:
 
     # Context manager for the SessionLocal
     # It opens a session with the db,
     # which is immediately closed after completing
     # all the operations in the context manager
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         # Create the record
         reminder = Reminder(**reminder_data)
@@ -17,8 +21,22 @@ def create_reminder(reminder_data: dict) -> UUID:
         # Add the record to the session
         session.add(reminder)
 
+        # Schedule the reminder (in the same transaction)
+        session.add(
+            ScheduleEntry(
+                due_at=reminder.remind_at,
+                kind=ScheduleKind.REMINDER,
+                todo_id=reminder.todo_id,
+                chat_id=await session.scalar(
+                    select(User.telegram_id) \
+                    .join(Todo, Todo.user_id == User.id) \
+                    .where(Todo.id == reminder.todo_id)
+                )
+            )
+        )
+
         # Commit the session changes
-        session.commit()
+        await session.commit()
 
         # Return the record id
-        return reminder.id
\ No newline at end of file
+        return reminder.id
@@ -1,24 +1,38 @@
 from database.db import SessionLocal
 from models.reminder.reminder import Reminder
-from uuid import UUID
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
+from sqlalchemy import Delete, and_, delete, select
 
 
-def delete_reminder(reminder_id: dict) -> UUID:
+async def delete_reminders(reminder_ids: list, chunk_size: int = 1000) -> int:
 
-    # Context manager for the SessionLocal
-    # It opens a session with the db,
-    # which is immediately closed after completing
-    # all the operations in the context manager
-    with SessionLocal() as session:
+    # Number of deleted records
+    deleted: int = 0
 
-        # Get the record
-        reminder = session.get(entity=Reminder, ident=reminder_id)
+    async with SessionLocal() as session:
 
-        # Delete the record
-        session.delete(reminder)
-        
-        # Commit the session changes
-        session.commit()
+        # Delete the records (with their schedule entries) with a statement per chunk of ids
+        # (the number of parameters of a statement is limited), in a single transaction
+        for start in range(0, len(reminder_ids), chunk_size):
 
-        # Return the record id
-        return reminder_id
\ No newline at end of file
+            chunk: list = reminder_ids[start:start + chunk_size]
+
+            await session.execute(
+                delete(ScheduleEntry) \
+                .where(
+                    and_(
+                        ScheduleEntry.todo_id.in_(select(Reminder.todo_id).where(Reminder.id.in_(chunk))),
+                        ScheduleEntry.kind == ScheduleKind.REMINDER
+                    )
+                )
+            )
+
+            sql_statement: Delete = delete(Reminder) \
+                                    .where(Reminder.id.in_(chunk))
+            
+            deleted += (await session.execute(sql_statement)).rowcount
+
+        await session.commit()
+
+        # Return the number of deleted records
+        return deleted
@@ -1,23 +1,44 @@
 from database.db import SessionLocal
+from datetime import datetime
 from models.reminder.reminder import Reminder
+from models.todo.todo import Todo
 from sqlalchemy import Select, select
+from sqlalchemy.orm import joinedload
 from uuid import UUID
 
 
-def retrieve_reminders() -> Reminder | None:
+async def retrieve_reminders(with_todo_user: bool = False) -> Reminder | None:
 
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         sql_statement: Select = select(Reminder)
+
+        # Load the todo (and its user) only if requested by the caller
+        if with_todo_user:
+            sql_statement = sql_statement.options(
+                joinedload(Reminder.todo).joinedload(Todo.user)
+            )
         
-        return session.scalars(sql_statement).unique().all()
+        return (await session.scalars(sql_statement)).unique().all()
 
 
-def retrieve_reminder(reminder_id: UUID) -> Reminder | None:
+async def retrieve_reminder(reminder_id: UUID) -> Reminder | None:
 
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         sql_statement: Select = select(Reminder) \
                                 .where(Reminder.id == reminder_id)
         
-        return session.scalar(sql_statement)
+        return await session.scalar(sql_statement)
+
+
+async def retrieve_expired_reminder_ids(remind_before: datetime, limit: int) -> list[UUID]:
+
+    async with SessionLocal() as session:
+
+        # Get the ids of the next batch of reminders that can't fire anymore
+        sql_statement: Select = select(Reminder.id) \
+                                .where(Reminder.remind_at <= remind_before) \
+                                .limit(limit)
+        
+        return (await session.scalars(sql_statement)).all()
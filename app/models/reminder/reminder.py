@@ -14,11 +14,13 @@ class Reminder(Base):
     # ormconfiguration.html#part-two-using-dataclasses-support-with-mappedasdataclass
     id: Mapped[UUID] = mapped_column(primary_key=True, nullable=False, default=uuid4)
     name: Mapped[str] = mapped_column(nullable=False)
-    todo_id: Mapped[UUID] = mapped_column(ForeignKey("todos.id"), nullable=False)
-    remind_at: Mapped[datetime] = mapped_column(nullable=False)
+    todo_id: Mapped[UUID] = mapped_column(ForeignKey("todos.id"), nullable=False, index=True)
+    remind_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.now(UTC))
 
     # These are the relationships between other models
     # Thanks to these variables, we can access the specified models
-    # through this (Todo) model
-    todo = relationship("Todo", back_populates="reminder", lazy="joined", uselist=False)
+    # through this (Reminder) model.
+    # It is never loaded by default: every query has to explicitly ask
+    # for the relationships it needs (see the "with_*" parameters in the CRUD functions)
+    todo = relationship("Todo", back_populates="reminder", lazy="raise", uselist=False)
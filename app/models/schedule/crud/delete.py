@@ -0,0 +1,63 @@
+from database.db import SessionLocal
+from datetime import datetime
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry, ScheduleKind, ScheduleState
+from sqlalchemy import Delete, and_, delete, select
+
+
+async def delete_schedule_entries(entry_ids: list, chunk_size: int = 1000) -> int:
+
+    # Number of deleted records
+    deleted: int = 0
+
+    async with SessionLocal() as session:
+
+        # Delete the records (and the reminders of the reminder entries, which have fired)
+        # with two statements per chunk of ids, in a single transaction
+        for start in range(0, len(entry_ids), chunk_size):
+
+            chunk: list = entry_ids[start:start + chunk_size]
+
+            sql_statement: Delete = delete(Reminder) \
+                                    .where(
+                                        Reminder.todo_id.in_(
+                                            select(ScheduleEntry.todo_id) \
+                                            .where(
+                                                and_(
+                                                    ScheduleEntry.id.in_(chunk),
+                                                    ScheduleEntry.kind == ScheduleKind.REMINDER
+                                                )
+                                            )
+                                        )
+                                    )
+            
+            await session.execute(sql_statement)
+
+            deleted += (await session.execute(delete(ScheduleEntry).where(ScheduleEntry.id.in_(chunk)))).rowcount
+
+        await session.commit()
+
+        # Return the number of deleted records
+        return deleted
+
+
+async def delete_missed_schedule_entries(due_before: datetime) -> int:
+
+    async with SessionLocal() as session:
+
+        # Delete the entries that are not dispatched anymore
+        # (due before the grace period, e.g. while the bot was offline), in any state
+        sql_statement: Delete = delete(ScheduleEntry) \
+                                .where(
+                                    and_(
+                                        ScheduleEntry.state.in_(list(ScheduleState)),
+                                        ScheduleEntry.due_at <= due_before
+                                    )
+                                )
+        
+        deleted: int = (await session.execute(sql_statement)).rowcount
+
+        await session.commit()
+
+        # Return the number of deleted records
+        return deleted
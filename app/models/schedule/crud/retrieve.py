@@ -0,0 +1,41 @@
+from database.db import SessionLocal
+from datetime import datetime
+from models.schedule.schedule import ScheduleEntry, ScheduleState
+from sharding.shard import Shard
+from sqlalchemy import Row, Select, and_, select
+
+
+async def retrieve_schedule_entries(
+    due_after: datetime,
+    shard: Shard | None = None,
+    todo_ids: list | None = None
+) -> list[Row]:
+
+    async with SessionLocal() as session:
+
+        # Project only the data needed to schedule the entries in memory:
+        # the pending ones, and the claimed ones (which are due again
+        # if their dispatcher stops before completing them)
+        sql_statement: Select = select(
+                                    ScheduleEntry.todo_id, 
+                                    ScheduleEntry.kind, 
+                                    ScheduleEntry.state,
+                                    ScheduleEntry.due_at,
+                                    ScheduleEntry.claimed_at
+                                ) \
+                                .where(
+                                    and_(
+                                        ScheduleEntry.state.in_(list(ScheduleState)),
+                                        ScheduleEntry.due_at > due_after
+                                    )
+                                )
+        
+        # Keep only the users of the shard (if the bot runs in multiple workers)
+        if shard:
+            sql_statement = sql_statement.where(ScheduleEntry.chat_id % shard.count == shard.index)
+
+        # Keep only the entries of the specified todos (if any)
+        if todo_ids is not None:
+            sql_statement = sql_statement.where(ScheduleEntry.todo_id.in_(todo_ids))
+
+        return (await session.execute(sql_statement)).all()
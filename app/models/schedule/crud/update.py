@@ -0,0 +1,85 @@
+from database.db import SessionLocal
+from datetime import datetime
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry, ScheduleState
+from models.todo.todo import Todo
+from sharding.shard import Shard
+from sqlalchemy import Row, Select, and_, or_, select, update
+
+
+async def claim_due_schedule_entries(
+    due_after: datetime,
+    due_until: datetime,
+    claimed_before: datetime,
+    limit: int,
+    shard: Shard | None = None,
+    todo_ids: list | None = None
+) -> list[Row]:
+
+    async with SessionLocal() as session:
+
+        # Select (and lock) the entries due in the specified window, ordered by due time:
+        # the pending ones, and the ones claimed before the specified datetime
+        # (claimed by a dispatcher that stopped before completing them).
+        # The entries locked by the other dispatchers are skipped (on PostgreSQL),
+        # so that multiple bot instances never claim the same entry
+        sql_statement: Select = select(ScheduleEntry.id) \
+                                .where(
+                                    and_(
+                                        ScheduleEntry.due_at > due_after,
+                                        ScheduleEntry.due_at <= due_until,
+                                        or_(
+                                            ScheduleEntry.state == ScheduleState.PENDING,
+                                            and_(
+                                                ScheduleEntry.state == ScheduleState.CLAIMED,
+                                                ScheduleEntry.claimed_at <= claimed_before
+                                            )
+                                        )
+                                    )
+                                ) \
+                                .order_by(ScheduleEntry.due_at) \
+                                .limit(limit) \
+                                .with_for_update(skip_locked=True)
+        
+        # Keep only the users of the shard (if the bot runs in multiple workers)
+        if shard:
+            sql_statement = sql_statement.where(ScheduleEntry.chat_id % shard.count == shard.index)
+
+        # Keep only the entries of the specified todos (if any)
+        if todo_ids is not None:
+            sql_statement = sql_statement.where(ScheduleEntry.todo_id.in_(todo_ids))
+
+        if not (entry_ids := (await session.scalars(sql_statement)).all()):
+            return []
+
+        # Claim the entries
+        await session.execute(
+            update(ScheduleEntry) \
+            .where(ScheduleEntry.id.in_(entry_ids)) \
+            .values(state=ScheduleState.CLAIMED, claimed_at=due_until)
+        )
+
+        # Project only the data needed to remind the users
+        sql_statement = select(
+                            ScheduleEntry.id.label("entry_id"), 
+                            ScheduleEntry.kind, 
+                            ScheduleEntry.chat_id, 
+                            Todo.id.label("todo_id"), 
+                            Todo.details,
+                            Todo.due_date,
+                            Todo.timezone,
+                            Todo.utc_offset,
+                            Todo.done,
+                            Reminder.remind_at
+                        ) \
+                        .join(Todo, Todo.id == ScheduleEntry.todo_id) \
+                        .outerjoin(Reminder, Reminder.todo_id == Todo.id) \
+                        .where(ScheduleEntry.id.in_(entry_ids)) \
+                        .order_by(ScheduleEntry.due_at)
+        
+        due_entries: list = (await session.execute(sql_statement)).all()
+
+        # Commit the session changes (releasing the locks)
+        await session.commit()
+
+        return due_entries
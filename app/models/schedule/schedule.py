@@ -0,0 +1,45 @@
+from datetime import datetime, UTC
+from enum import StrEnum
+from models.base.base import Base
+from sqlalchemy import BigInteger, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid import UUID, uuid4
+
+
+class ScheduleKind(StrEnum):
+
+    # A todo due, or a reminder of a todo
+    TODO = "todo"
+    REMINDER = "reminder"
+
+
+class ScheduleState(StrEnum):
+
+    # Waiting to be due, or claimed by a dispatcher (and being sent)
+    PENDING = "pending"
+    CLAIMED = "claimed"
+
+
+class ScheduleEntry(Base):
+
+    __tablename__ = "schedule_entries"
+
+    # Index for the dispatcher query: the pending entries, ordered by due time
+    # (the queries on the due time alone filter on all the states, to use it too).
+    # A todo has at most an entry per kind
+    __table_args__ = (
+        Index("ix_schedule_entries_state_due_at", "state", "due_at"),
+        UniqueConstraint("todo_id", "kind", name="uq_schedule_entries_todo_id_kind"),
+    )
+
+    # About "default" parameter:
+    # https://docs.sqlalchemy.org/en/20/faq/
+    # ormconfiguration.html#part-two-using-dataclasses-support-with-mappedasdataclass
+    id: Mapped[UUID] = mapped_column(primary_key=True, nullable=False, default=uuid4)
+    due_at: Mapped[datetime] = mapped_column(nullable=False)
+    kind: Mapped[str] = mapped_column(nullable=False)
+    todo_id: Mapped[UUID] = mapped_column(ForeignKey("todos.id"), nullable=False)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    state: Mapped[str] = mapped_column(nullable=False, default=ScheduleState.PENDING)
+    claimed_at: Mapped[datetime] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, default=lambda: datetime.now(UTC))
@@ -1,15 +1,18 @@
 from database.db import SessionLocal
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
 from models.todo.todo import Todo
+from models.user.user import User
+from sqlalchemy import select
 from uuid import UUID
 
 
-def create_todo(todo_data: dict) -> UUID:
+async def create_todo(todo_data: dict) -> UUID:
 
     # Context manager for the SessionLocal
     # It opens a session with the db,
     # which is immediately closed after completing
     # all the operations in the context manager
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         # Create the record
         todo = Todo(**todo_data)
@@ -17,8 +20,21 @@ def create_todo(todo_data: dict) -> UUID:
         # Add the record to the session
         session.add(todo)
 
+        # Flush the record, to get its id
+        await session.flush()
+
+        # Schedule the todo (in the same transaction)
+        session.add(
+            ScheduleEntry(
+                due_at=todo.due_date,
+                kind=ScheduleKind.TODO,
+                todo_id=todo.id,
+                chat_id=await session.scalar(select(User.telegram_id).where(User.id == todo.user_id))
+            )
+        )
+
         # Commit the session changes
-        session.commit()
+        await session.commit()
 
         # Return the record id
-        return todo.id
\ No newline at end of file
+        return todo.id
@@ -1,24 +1,64 @@
 from database.db import SessionLocal
+from models.pending_message.pending_message import PendingMessage
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry
 from models.todo.todo import Todo
+from sqlalchemy import Delete, delete
+from sqlalchemy.orm import joinedload
 from uuid import UUID
 
 
-def delete_todo(todo_id: dict) -> UUID:
+async def delete_todo(todo_id: dict) -> UUID:
 
     # Context manager for the SessionLocal
     # It opens a session with the db,
     # which is immediately closed after completing
     # all the operations in the context manager
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
-        # Get the record
-        todo = session.get(entity=Todo, ident=todo_id)
+        # Get the record (with its reminder, which is deleted in cascade)
+        todo = await session.get(
+            entity=Todo, 
+            ident=todo_id, 
+            options=[joinedload(Todo.reminder)]
+        )
+
+        # Delete the schedule entries and the pending messages of the record
+        await session.execute(delete(ScheduleEntry).where(ScheduleEntry.todo_id == todo_id))
+        await session.execute(delete(PendingMessage).where(PendingMessage.todo_id == todo_id))
 
         # Delete the record
-        session.delete(todo)
+        await session.delete(todo)
         
         # Commit the session changes
-        session.commit()
+        await session.commit()
 
         # Return the record id
-        return todo_id
\ No newline at end of file
+        return todo_id
+
+
+async def delete_todos(todo_ids: list, chunk_size: int = 1000) -> int:
+
+    # Number of deleted records
+    deleted: int = 0
+
+    async with SessionLocal() as session:
+
+        # Delete the records (with their reminders, schedule entries and pending messages)
+        # with a statement per table and chunk of ids, in a single transaction
+        for start in range(0, len(todo_ids), chunk_size):
+
+            chunk: list = todo_ids[start:start + chunk_size]
+
+            for model in (Reminder, ScheduleEntry, PendingMessage):
+                await session.execute(delete(model).where(model.todo_id.in_(chunk)))
+
+            sql_statement: Delete = delete(Todo) \
+                                    .where(Todo.id.in_(chunk))
+            
+            deleted += (await session.execute(sql_statement)).rowcount
+
+        await session.commit()
+
+        # Return the number of deleted records
+        return deleted
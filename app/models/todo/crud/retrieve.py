@@ -1,31 +1,82 @@
+from datetime import datetime
 from database.db import SessionLocal
 from models.todo.todo import Todo
-from models.user.user import User
 from sqlalchemy import Select, and_, select
+from sqlalchemy.orm import joinedload
 from uuid import UUID
 
 
-def retrieve_todos(user_id: UUID | None = None, is_done: bool = False) -> Todo | None:
+async def retrieve_todos(
+    user_id: UUID | None = None, 
+    is_done: bool = False,
+    with_user: bool = False,
+    with_reminder: bool = False
+) -> Todo | None:
 
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         sql_statement: Select = select(Todo) \
                                 .where(
                                     and_(
-                                        Todo.user.has(User.id == user_id) if user_id else True,
+                                        Todo.user_id == user_id if user_id else True,
                                         Todo.done.is_(is_done)
                                     )
                                 ) \
                                 .order_by(Todo.due_date)
         
-        return session.scalars(sql_statement).unique().all()
+        # Load only the relationships requested by the caller
+        sql_statement = sql_statement.options(
+            *get_todo_load_options(with_user=with_user, with_reminder=with_reminder)
+        )
+        
+        return (await session.scalars(sql_statement)).unique().all()
 
 
-def retrieve_todo(todo_id: UUID) -> Todo | None:
+async def retrieve_todo(
+    todo_id: UUID, 
+    with_user: bool = False, 
+    with_reminder: bool = False
+) -> Todo | None:
 
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         sql_statement: Select = select(Todo) \
                                 .where(Todo.id == todo_id)
         
-        return session.scalar(sql_statement)
+        # Load only the relationships requested by the caller
+        sql_statement = sql_statement.options(
+            *get_todo_load_options(with_user=with_user, with_reminder=with_reminder)
+        )
+        
+        return await session.scalar(sql_statement)
+
+
+def get_todo_load_options(with_user: bool, with_reminder: bool) -> list:
+
+    # Initialize an empty list of loader options
+    load_options: list = []
+
+    if with_user:
+        load_options.append(joinedload(Todo.user))
+
+    if with_reminder:
+        load_options.append(joinedload(Todo.reminder))
+
+    return load_options
+
+
+async def retrieve_closed_todo_ids(due_before: datetime, limit: int) -> list[UUID]:
+
+    async with SessionLocal() as session:
+
+        # Get the ids of the next batch of completed todos, due before the specified datetime
+        sql_statement: Select = select(Todo.id) \
+                                .where(
+                                    and_(
+                                        Todo.done.is_(True),
+                                        Todo.due_date <= due_before
+                                    )
+                                ) \
+                                .limit(limit)
+        
+        return (await session.scalars(sql_statement)).all()
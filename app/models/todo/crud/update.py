@@ -1,26 +1,38 @@
-from sqlalchemy import Update, update
+from sqlalchemy import Row, Update, and_, delete, update
 from database.db import SessionLocal
+from datetime import datetime
+from models.pending_message.pending_message import PendingMessage
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry
 from models.todo.todo import Todo
 from uuid import UUID
 
 
-def update_todo(todo_id: UUID, todo_data: dict) -> UUID:
+async def complete_todo(todo_id: UUID, messages_expire_at: datetime) -> Row | None:
 
-    # Context manager for the SessionLocal
-    # It opens a session with the db,
-    # which is immediately closed after completing
-    # all the operations in the context manager
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
-        # Update todo data
+        # Mark the todo as completed (if it's not already),
+        # returning the data needed for the reply
         sql_statement: Update = update(Todo) \
-                                .where(Todo.id == todo_id) \
-                                .values(**todo_data)
+                                .where(and_(Todo.id == todo_id, Todo.done.is_(False))) \
+                                .values(done=True) \
+                                .returning(Todo.details, Todo.timezone, Todo.utc_offset)
         
-        # Execute the statement
-        session.execute(sql_statement)
+        if not (todo := (await session.execute(sql_statement)).one_or_none()):
+            return None
+
+        # Delete its reminder and schedule entries (if not fired yet),
+        # and expire its pending messages, in the same transaction
+        await session.execute(delete(Reminder).where(Reminder.todo_id == todo_id))
+        await session.execute(delete(ScheduleEntry).where(ScheduleEntry.todo_id == todo_id))
+        await session.execute(
+            update(PendingMessage) \
+            .where(PendingMessage.todo_id == todo_id) \
+            .values(expires_at=messages_expire_at)
+        )
 
         # Commit the changes to the db
-        session.commit()
-        
-        return todo_id
+        await session.commit()
+
+        return todo
@@ -1,6 +1,6 @@
 from datetime import datetime, UTC
 from models.base.base import Base
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid import UUID, uuid4
 
@@ -8,6 +8,14 @@ from uuid import UUID, uuid4
 class Todo(Base):
 
     __tablename__ = "todos"
+
+    # Indexes for the most frequent queries:
+    # - the list of (un)completed todos of a user, ordered by due date
+    # - the pending todos to schedule, ordered by due date
+    __table_args__ = (
+        Index("ix_todos_user_id_done_due_date", "user_id", "done", "due_date"),
+        Index("ix_todos_done_due_date", "done", "due_date"),
+    )
     
     # About "default" parameter:
     # https://docs.sqlalchemy.org/en/20/faq/
@@ -16,6 +24,11 @@ class Todo(Base):
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     details: Mapped[str] = mapped_column(nullable=False)
     due_date: Mapped[datetime] = mapped_column(nullable=False)
+    # IANA timezone of the user when the to-do has been created (e.g. "Europe/Rome"),
+    # used to show the dates in local time (DST included).
+    # The UTC offset (in seconds) at the due date is kept for the to-dos created
+    # before the timezone was stored
+    timezone: Mapped[str] = mapped_column(nullable=True)
     utc_offset: Mapped[int] = mapped_column(nullable=False)
     done: Mapped[bool] = mapped_column(nullable=False, default=False)
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.now(UTC))
@@ -23,9 +36,11 @@ class Todo(Base):
 
     # These are the relationships between other models
     # Thanks to these variables, we can access the specified models
-    # through this (Todo) model
-    user = relationship("User", back_populates="todos", lazy="joined", uselist=False)
+    # through this (Todo) model.
+    # They are never loaded by default: every query has to explicitly ask
+    # for the relationships it needs (see the "with_*" parameters in the CRUD functions)
+    user = relationship("User", back_populates="todos", lazy="raise", uselist=False)
     reminder = relationship(
-        "Reminder", back_populates="todo", uselist=False, lazy="joined", 
+        "Reminder", back_populates="todo", uselist=False, lazy="raise", 
         cascade="all, delete-orphan", single_parent=True
     )
@@ -0,0 +1,54 @@
+from cache.ttl_cache import TTLCache
+from dataclasses import dataclass
+from datetime import datetime
+from dotenv import load_dotenv
+from os import getenv
+from uuid import UUID
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+USER_CACHE_MAXSIZE: int = int(getenv("USER_CACHE_MAXSIZE", "10000"))
+USER_CACHE_TTL: int = int(getenv("USER_CACHE_TTL", "300"))
+
+
+@dataclass(frozen=True, slots=True)
+class LocationRecord:
+
+    # Compact (and detached from any session) copy of a Location
+    id: UUID
+    latitude: float
+    longitude: float
+    city: str | None
+    country: str | None
+    timezone: str | None
+    geocoding_attempts: int | None
+    geocoding_retry_at: datetime | None
+
+
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+
+    # Compact (and detached from any session) copy of a User,
+    # with its location, as needed by the handlers
+    id: UUID
+    telegram_id: int
+    location: LocationRecord | None
+
+    @property
+    def has_location(self) -> bool:
+        return self.location is not None
+
+
+# Cache of the user records, keyed by Telegram id
+user_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+
+
+
+def cache_user_record(user_record: UserRecord) -> None:
+    user_cache.set(user_record.telegram_id, user_record)
+
+
+def invalidate_user_record(user_telegram_id: int) -> None:
+    user_cache.pop(user_telegram_id)
@@ -1,15 +1,16 @@
 from database.db import SessionLocal
+from models.user.cache import invalidate_user_record
 from models.user.user import User
 from uuid import UUID
 
 
-def create_user(user_data: dict) -> UUID:
+async def create_user(user_data: dict) -> UUID:
 
     # Context manager for the SessionLocal
     # It opens a session with the db,
     # which is immediately closed after completing
     # all the operations in the context manager
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         # Create the record
         user = User(**user_data)
@@ -18,7 +19,10 @@ def create_user(user_data: dict) -> UUID:
         session.add(user)
 
         # Commit the session changes
-        session.commit()
+        await session.commit()
+
+        # Drop the (stale) cached record of the user, if any
+        invalidate_user_record(user_telegram_id=user.telegram_id)
 
         # Return the record id
         return user.id
\ No newline at end of file
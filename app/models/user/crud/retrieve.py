@@ -1,13 +1,73 @@
 from database.db import SessionLocal
+from datetime import UTC
+from models.user.cache import (
+    LocationRecord,
+    UserRecord,
+    cache_user_record,
+    user_cache
+)
 from models.user.user import User
 from sqlalchemy import Select, select
+from sqlalchemy.orm import joinedload, selectinload
 
 
-def retrieve_user(user_telegram_id: int) -> User | None:
+async def retrieve_user(
+    user_telegram_id: int, 
+    with_location: bool = False, 
+    with_todos: bool = False
+) -> User | None:
 
-    with SessionLocal() as session:
+    async with SessionLocal() as session:
 
         sql_statement: Select = select(User) \
                                 .where(User.telegram_id == user_telegram_id)
         
-        return session.scalar(sql_statement)
+        # Load only the relationships requested by the caller
+        if with_location:
+            sql_statement = sql_statement.options(joinedload(User.location))
+
+        if with_todos:
+            sql_statement = sql_statement.options(selectinload(User.todos))
+        
+        return await session.scalar(sql_statement)
+
+
+async def retrieve_user_record(user_telegram_id: int) -> UserRecord | None:
+
+    # Serve the user record from the cache, if present
+    if user_record := user_cache.get(user_telegram_id):
+        return user_record
+
+    # Otherwise, retrieve the user (with its location) from the db
+    if user := await retrieve_user(user_telegram_id=user_telegram_id, with_location=True):
+
+        # Build the compact record for the user location (if set)
+        location_record = LocationRecord(
+            id=location.id,
+            latitude=location.latitude,
+            longitude=location.longitude,
+            city=location.city,
+            country=location.country,
+            timezone=location.timezone,
+            geocoding_attempts=location.geocoding_attempts,
+            # SQLite returns naive datetimes (in UTC)
+            geocoding_retry_at=(
+                location.geocoding_retry_at.replace(tzinfo=UTC)
+                if location.geocoding_retry_at and not location.geocoding_retry_at.tzinfo
+                else location.geocoding_retry_at
+            )
+        ) if (location := user.location) else None
+
+        # Build the compact record for the user
+        user_record = UserRecord(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            location=location_record
+        )
+
+        # Save the record in the cache
+        cache_user_record(user_record=user_record)
+
+        return user_record
+    
+    return None
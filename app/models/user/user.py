@@ -22,9 +22,11 @@ class User(Base):
 
     # These are the relationships between other models
     # Thanks to these variables, we can access the specified models
-    # through this (User) model
-    location = relationship("Location", back_populates="user", lazy="joined", uselist=False)
-    todos = relationship("Todo", back_populates="user", lazy="joined")
+    # through this (User) model.
+    # They are never loaded by default: every query has to explicitly ask
+    # for the relationships it needs (see the "with_*" parameters in the CRUD functions)
+    location = relationship("Location", back_populates="user", lazy="raise", uselist=False)
+    todos = relationship("Todo", back_populates="user", lazy="raise")
 
 
     @hybrid_property
@@ -0,0 +1,167 @@
+from math import prod
+from typing import Any, Hashable
+
+
+class TimingWheel:
+
+    # Hierarchical timing wheel: the items are kept in buckets of "resolution" seconds
+    # (the ticks), on multiple levels with increasingly coarse buckets
+    # (by default: 60 minutes, 24 hours and 30 days), and beyond the last level
+    # in an overflow set. When a coarse bucket comes up, its items are moved
+    # to the finer levels, and the items of the current tick are fired.
+    # Scheduling and cancelling an item are O(1): the buckets are plain lists of keys,
+    # and a cancelled (or rescheduled) key is skipped when its old bucket comes up.
+    # It's not thread-safe, but it doesn't need to be, since all the handlers
+    # and jobs run in the same event loop
+
+    def __init__(self, now: float, resolution: float = 60, slots: tuple = (60, 24, 30)) -> None:
+
+        self.resolution: float = resolution
+        self.slots: tuple = slots
+
+        # Number of ticks covered by a bucket of every level (and by the whole wheel)
+        self.spans: tuple = tuple(prod(slots[:level]) for level in range(len(slots) + 1))
+
+        # Buckets of every level, and the keys beyond the last level
+        self.buckets: list = [[[] for _ in range(count)] for count in slots]
+        self.overflow: set = set()
+
+        # Items, as key: (tick, item)
+        self.items: dict = {}
+
+        # Keys due before the current tick, when they've been scheduled
+        self.ready: list = []
+
+        # Last tick advanced to
+        self.current_tick: int = self.get_tick(timestamp=now)
+
+        # Counters for monitoring
+        self.scheduled: int = 0
+        self.cancelled: int = 0
+        self.fired: int = 0
+
+    def get_tick(self, timestamp: float) -> int:
+        return int(timestamp // self.resolution)
+
+    def schedule(self, key: Hashable, due_at: float, item: Any) -> None:
+
+        # Add (or reschedule) the item
+        tick: int = self.get_tick(timestamp=due_at)
+
+        self.items[key] = (tick, item)
+        self.scheduled += 1
+
+        self.place(key=key, tick=tick)
+
+    def cancel(self, key: Hashable) -> bool:
+
+        # Drop the item (its key is skipped when its bucket comes up)
+        if self.items.pop(key, None) is None:
+            return False
+
+        self.cancelled += 1
+
+        return True
+
+    def place(self, key: Hashable, tick: int) -> None:
+
+        distance: int = tick - self.current_tick
+
+        if distance <= 0:
+            self.ready.append(key)
+
+            return None
+
+        # Put the key in the finest level covering its distance
+        for level, count in enumerate(self.slots):
+            if distance < self.spans[level + 1]:
+                self.buckets[level][(tick // self.spans[level]) % count].append(key)
+
+                return None
+
+        self.overflow.add(key)
+
+    def advance(self, now: float) -> list:
+
+        # Advance the wheel, a tick at a time, up to the current one,
+        # and return the fired items, as (key, item)
+        fired: list = self.pop_ready()
+
+        # Jump straight to the current tick, if there's nothing to fire
+        if not self.items:
+            self.current_tick = max(self.current_tick, self.get_tick(timestamp=now))
+
+            return fired
+
+        for tick in range(self.current_tick + 1, self.get_tick(timestamp=now) + 1):
+
+            self.current_tick = tick
+
+            # Move the items of the coarse buckets starting now to the finer levels
+            # (from the coarsest one, re-checking the overflow every time the last level moves on)
+            for level in range(len(self.slots) - 1, 0, -1):
+
+                if tick % self.spans[level]:
+                    continue
+
+                if level == len(self.slots) - 1:
+                    overflow, self.overflow = self.overflow, set()
+
+                    self.cascade(keys=overflow)
+
+                bucket_index: int = (tick // self.spans[level]) % self.slots[level]
+
+                keys, self.buckets[level][bucket_index] = self.buckets[level][bucket_index], []
+
+                self.cascade(keys=keys, span=self.spans[level])
+
+            # Fire the items of the current tick
+            keys, self.buckets[0][tick % self.slots[0]] = self.buckets[0][tick % self.slots[0]], []
+
+            self.ready.extend(keys)
+
+            fired.extend(self.pop_ready())
+
+        return fired
+
+    def cascade(self, keys, span: int | None = None) -> None:
+
+        for key in keys:
+
+            # Skip the cancelled keys, and the ones rescheduled in another bucket
+            if (entry := self.items.get(key)) is None:
+                continue
+
+            if span is None or entry[0] // span == self.current_tick // span:
+                self.place(key=key, tick=entry[0])
+
+    def pop_ready(self) -> list:
+
+        fired: list = []
+
+        for key in self.ready:
+
+            # Skip the cancelled keys, the ones rescheduled later, and the duplicates
+            if (entry := self.items.get(key)) is None or entry[0] > self.current_tick:
+                continue
+
+            del self.items[key]
+
+            fired.append((key, entry[1]))
+
+        self.ready = []
+        self.fired += len(fired)
+
+        return fired
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "size": len(self.items),
+            "scheduled": self.scheduled,
+            "cancelled": self.cancelled,
+            "fired": self.fired
+        }
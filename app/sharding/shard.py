@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from dotenv import load_dotenv
+from os import getenv
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# Number of worker processes: with more than one worker, an ingress process
+# receives the updates, and routes them to the workers by Telegram user id
+WORKERS: int = int(getenv("WORKERS", "1"))
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+
+    # Shard of the users owned by a worker process:
+    # the users whose Telegram id modulo count is index
+    index: int
+    count: int
+
+    def owns(self, key: int) -> bool:
+        return get_shard_index(key=key, count=self.count) == self.index
+
+
+# Shard owned by the current process (None when the bot runs in a single process)
+current_shard: Shard | None = None
+
+
+def get_current_shard() -> Shard | None:
+    return current_shard
+
+
+def set_current_shard(shard: Shard) -> None:
+
+    global current_shard
+
+    current_shard = shard
+
+
+def get_shard_index(key: int, count: int) -> int:
+    return key % count
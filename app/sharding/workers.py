@@ -0,0 +1,244 @@
+from application import BOT_API_BASE_URL, build_application
+from asyncio import CancelledError, create_task, run, sleep, to_thread
+from contextlib import suppress
+from database.db import dispose_db
+from dotenv import load_dotenv
+from functools import partial
+from handlers.post_init.post_init import setup_bot
+from json import loads
+from logging import Logger, getLogger
+from logging_config import configure_logging
+from multiprocessing import get_context
+from os import getenv
+from signal import SIGINT, SIG_IGN, signal
+from sharding.shard import Shard, get_shard_index, set_current_shard
+from telegram import Update
+from telegram.ext import Application, ApplicationBuilder, ContextTypes, TypeHandler
+from updates.update_processor import get_update_key
+
+# Load environment variables from local .env
+load_dotenv()
+
+# Get the specified .env variables
+# The ingress process checks the workers every interval (in seconds),
+# and restarts the ones that stopped, up to a max number of restarts per worker
+# (then the bot is stopped, since the users of that worker can't be served)
+WORKER_CHECK_INTERVAL: float = float(getenv("WORKER_CHECK_INTERVAL", "5"))
+WORKER_MAX_RESTARTS: int = int(getenv("WORKER_MAX_RESTARTS", "5"))
+
+# Seconds to wait for every worker to stop, before terminating it
+WORKER_STOP_TIMEOUT: int = 30
+
+# The workers are spawned (not forked), so that they don't inherit
+# the state of the ingress process (e.g. the event loop)
+multiprocessing_context = get_context(method="spawn")
+
+logger: Logger = getLogger(__name__)
+
+
+def build_ingress_application(bot_token: str, workers: int) -> Application:
+
+    # Create the ingress app: it only receives the updates (polling or webhook),
+    # and routes every update to the worker that owns its user.
+    # The workers are started and stopped together with it
+    app_builder = ApplicationBuilder() \
+        .token(bot_token) \
+        .post_init(post_init=partial(start_workers, workers=workers)) \
+        .post_shutdown(post_shutdown=stop_workers) \
+        .job_queue(None)
+
+    if BOT_API_BASE_URL:
+        app_builder = app_builder.base_url(base_url=BOT_API_BASE_URL)
+
+    app = app_builder.build()
+    
+    # Route all the updates
+    app.add_handler(handler=TypeHandler(type=Update, callback=route_update))
+
+    return app
+
+
+async def start_workers(application: Application, workers: int) -> None:
+
+    # Set up the bot (db tables, offline geocoder index and bot commands) once, here,
+    # so that the workers don't race on it
+    await setup_bot(application=application)
+
+    # The ingress process doesn't use the db: its connections are closed
+    await dispose_db()
+
+    # Initialize an empty list of workers, and of their restarts
+    application.bot_data["workers"] = []
+    application.bot_data["workers_restarts"] = [0] * workers
+
+    for index in range(workers):
+
+        # Queue of the updates (serialized as JSON) routed to the worker
+        queue = multiprocessing_context.Queue()
+
+        process = start_worker(
+            bot_token=application.bot.token,
+            shard=Shard(index=index, count=workers),
+            queue=queue
+        )
+
+        application.bot_data["workers"].append((process, queue))
+
+    # Check the workers in background
+    application.bot_data["workers_monitor"] = create_task(monitor_workers(application=application))
+
+
+def start_worker(bot_token: str, shard: Shard, queue):
+
+    # Start the worker (daemon, so that it doesn't outlive the ingress process)
+    process = multiprocessing_context.Process(
+        target=run_worker,
+        kwargs={
+            "bot_token": bot_token,
+            "shard": shard,
+            "queue": queue
+        },
+        name=f"worker_{shard.index}",
+        daemon=True
+    )
+    process.start()
+
+    return process
+
+
+async def monitor_workers(application: Application) -> None:
+
+    workers: list = application.bot_data["workers"]
+    workers_restarts: list = application.bot_data["workers_restarts"]
+
+    while True:
+
+        await sleep(WORKER_CHECK_INTERVAL)
+
+        for index, (process, queue) in enumerate(workers):
+
+            if process.is_alive():
+                continue
+
+            # Too many restarts: stop the bot, instead of losing the updates of the worker users
+            if workers_restarts[index] >= WORKER_MAX_RESTARTS:
+                logger.critical(
+                    "Worker %s stopped (exit code %s) after %s restarts, stopping the bot",
+                    index, process.exitcode, workers_restarts[index]
+                )
+
+                application.stop_running()
+
+                return None
+
+            # A process killed while reading from a queue can leave it corrupted (or locked),
+            # so the restarted worker gets a new queue: the updates routed to the stopped worker,
+            # and not processed yet, are lost
+            logger.error(
+                "Worker %s stopped (exit code %s), restarting it (its pending updates are lost)",
+                index, process.exitcode
+            )
+
+            # The old queue is closed without waiting for its buffered updates to be flushed,
+            # since nobody reads them anymore
+            queue.cancel_join_thread()
+            queue.close()
+
+            new_queue = multiprocessing_context.Queue()
+
+            workers_restarts[index] += 1
+            workers[index] = (
+                start_worker(
+                    bot_token=application.bot.token,
+                    shard=Shard(index=index, count=len(workers)),
+                    queue=new_queue
+                ),
+                new_queue
+            )
+
+
+async def stop_workers(application: Application) -> None:
+
+    # Stop checking the workers, so that they're not restarted while stopping
+    if monitor := application.bot_data.get("workers_monitor"):
+        monitor.cancel()
+
+        with suppress(CancelledError):
+            await monitor
+
+    workers: list = application.bot_data.get("workers", [])
+
+    # Tell the workers to stop (after processing the updates already routed)
+    for _, queue in workers:
+        queue.put(None)
+
+    # Wait for the workers to stop, and terminate the ones that don't
+    for process, _ in workers:
+        await to_thread(process.join, WORKER_STOP_TIMEOUT)
+
+        if process.is_alive():
+            process.terminate()
+
+
+async def route_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+
+    workers: list = context.bot_data["workers"]
+
+    # Get the worker owning the user (or chat) of the update,
+    # so that all the updates (and jobs) of a user are handled by the same worker.
+    # If the worker is being restarted, the update waits in its queue
+    index: int = get_shard_index(key=get_update_key(update=update) or 0, count=len(workers))
+
+    _, queue = workers[index]
+    
+    queue.put(update.to_json())
+
+
+def run_worker(bot_token: str, shard: Shard, queue) -> None:
+
+    # The workers are stopped by the ingress process,
+    # so they ignore the interrupts sent to the whole process group (e.g. Ctrl+C)
+    signal(SIGINT, SIG_IGN)
+
+    # The spawned processes don't inherit the logging configuration
+    configure_logging()
+
+    # Set the shard owned by this process (used to load only its jobs)
+    set_current_shard(shard=shard)
+
+    # Create the app, without updater, and run it
+    app = build_application(bot_token=bot_token, with_updater=False)
+
+    run(serve_worker(application=app, queue=queue))
+
+
+async def serve_worker(application: Application, queue) -> None:
+
+    # Same lifecycle of Application.run_polling/run_webhook, without the updater
+    # If the worker fails to start, it's shut down (and then restarted by the ingress process)
+    try:
+
+        await application.initialize()
+
+        if application.post_init:
+            await application.post_init(application)
+
+        await application.start()
+
+        # Put the routed updates in the application update queue, until the stop signal (None)
+        while (data := await to_thread(queue.get)) is not None:
+            await application.update_queue.put(Update.de_json(data=loads(data), bot=application.bot))
+
+    finally:
+
+        if application.running:
+
+            await application.stop()
+
+            if application.post_stop:
+                await application.post_stop(application)
+
+        await application.shutdown()
+
+        if application.post_shutdown:
+            await application.post_shutdown(application)
@@ -0,0 +1,74 @@
+from collections import deque
+from contextlib import suppress
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from typing import Any, Awaitable
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+
+    # Update processor that processes the updates of different users concurrently
+    # (up to max_concurrent_updates at a time), but the ones of the same user
+    # (or chat, for the updates without a user) one at a time, in order,
+    # so that the conversations state stays consistent.
+    # The updates arriving while another update of the same user is in progress
+    # are queued, and processed by the task of the update in progress:
+    # in this way, a user sending many updates occupies a single slot
+
+    def __init__(self, max_concurrent_updates: int) -> None:
+
+        super().__init__(max_concurrent_updates=max_concurrent_updates)
+
+        # Queues of the updates in progress (and waiting), by user/chat id
+        self._queues: dict[int, deque] = {}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+
+        # The updates without a user or chat can be processed right away
+        if (key := get_update_key(update=update)) is None:
+            await coroutine
+
+            return None
+        
+        # If an update of the same user is in progress, queue this one after it
+        if (queue := self._queues.get(key)) is not None:
+            queue.append(coroutine)
+
+            return None
+        
+        self._queues[key] = queue = deque([coroutine])
+
+        try:
+            while queue:
+
+                # A failing update doesn't stop the next ones of the same user
+                # (the errors are already handled by the application error handlers)
+                with suppress(Exception):
+                    await queue.popleft()
+
+        finally:
+            
+            # If the processing is cancelled (e.g. on shutdown),
+            # close the updates still waiting
+            for waiting_coroutine in self._queues.pop(key):
+                waiting_coroutine.close()
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+def get_update_key(update: object) -> int | None:
+
+    # Get the id of the user (or of the chat) of the update
+    if isinstance(update, Update):
+
+        if user := update.effective_user:
+            return user.id
+
+        if chat := update.effective_chat:
+            return chat.id
+
+    return None
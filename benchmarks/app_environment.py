@@ -0,0 +1,37 @@
+"""Environment of the benchmarks that run the bot modules in process.
+
+The bot modules are imported as top level packages (as when running "python app"),
+so the app folder is put on the path. Unless DB_DIALECT is already set
+(e.g. to benchmark a local PostgreSQL, with the same variables as the bot),
+the db is a temporary SQLite file, deleted at exit.
+Call setup_app_environment() before importing any bot module.
+"""
+from atexit import register
+from os import environ
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+import sys
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app"
+
+
+def setup_app_environment() -> None:
+
+    sys.path.insert(0, str(APP_PATH))
+
+    if "DB_DIALECT" not in environ:
+
+        temporary_path: str = mkdtemp(prefix="benchmark-")
+        register(rmtree, temporary_path, ignore_errors=True)
+
+        environ.update(
+            {
+                "DB_DIALECT": "sqlite",
+                "DB_DRIVER": "aiosqlite",
+                "DB_DATABASE": f"{temporary_path}/benchmark.sqlite"
+            }
+        )
+
+    environ.setdefault("CREATE_MODELS", "True")
+    environ.setdefault("DEBUG", "False")
@@ -0,0 +1,111 @@
+"""Cancellation of the reminders of a to-do, with 1k/10k/100k scheduled jobs.
+
+For every size, schedules the jobs (a to-do job and a reminder job per to-do, named as before),
+then cancels the jobs of some to-dos, and reports the mean time per cancellation:
+- previously, in PTB's JobQueue, searching all the jobs by a regex on their name
+  (get_jobs_by_name_custom) and removing the matching ones;
+- now, in the timing wheel (SCHEDULER_ENGINE=wheel), with cancel_reminders
+  (with the db engine, the entries are deleted from the db by the to-do id).
+
+Usage: python benchmarks/cancel_reminders.py [--jobs 1000 10000 100000] [--cancellations 100]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from asyncio import run  # noqa: E402
+from datetime import UTC, datetime, timedelta  # noqa: E402
+from random import Random  # noqa: E402
+from re import Pattern, compile  # noqa: E402
+from time import perf_counter  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+from uuid import UUID  # noqa: E402
+
+from jobs.dispatch_reminders_job import cancel_reminders  # noqa: E402
+from models.schedule.schedule import ScheduleKind  # noqa: E402
+from scheduling.timing_wheel import TimingWheel  # noqa: E402
+from telegram.ext import ApplicationBuilder, ContextTypes  # noqa: E402
+
+
+async def remind_user_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    pass
+
+
+async def get_jobs_by_name_custom(context: ContextTypes.DEFAULT_TYPE, name: str | Pattern) -> tuple:
+
+    # The previous lookup of the jobs of a to-do
+    jobs = context.job_queue.jobs()
+
+    pattern = compile(pattern=name)
+
+    return tuple(job for job in jobs if pattern.search(string=job.name))
+
+
+async def cancel_jobs(job_queue, todo_ids: list, cancelled_todo_ids: list) -> float:
+
+    for todo_id in todo_ids:
+        for job_name in (f"todo_user_job_{todo_id.hex}", f"remind_user_job_{todo_id.hex}"):
+            job_queue.run_once(callback=remind_user_job, when=timedelta(days=1), name=job_name)
+
+    context = SimpleNamespace(job_queue=job_queue)
+
+    started_at: float = perf_counter()
+
+    for todo_id in cancelled_todo_ids:
+        for job in await get_jobs_by_name_custom(context=context, name=f".*{todo_id.hex}"):
+            job.enabled = False
+            job.schedule_removal()
+
+    return (perf_counter() - started_at) / len(cancelled_todo_ids)
+
+
+def cancel_wheel_entries(todo_ids: list, cancelled_todo_ids: list) -> float:
+
+    now: datetime = datetime.now(UTC)
+    bot_data: dict = {"reminders_wheel": TimingWheel(now=now.timestamp())}
+
+    for todo_id in todo_ids:
+        for kind in ScheduleKind:
+            bot_data["reminders_wheel"].schedule(
+                key=(todo_id, kind), due_at=(now + timedelta(days=1)).timestamp(), item=todo_id
+            )
+
+    started_at: float = perf_counter()
+
+    for todo_id in cancelled_todo_ids:
+        cancel_reminders(bot_data=bot_data, todo_id=todo_id)
+
+    return (perf_counter() - started_at) / len(cancelled_todo_ids)
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--cancellations", type=int, default=100)
+    arguments = parser.parse_args()
+
+    random = Random(0)
+
+    for jobs in arguments.jobs:
+
+        todo_ids: list = [UUID(int=random.getrandbits(128), version=4) for _ in range(jobs // 2)]
+        cancelled_todo_ids: list = random.sample(todo_ids, k=min(arguments.cancellations, len(todo_ids)))
+
+        # A job queue of its own for every size (not started, so the jobs are only stored)
+        job_queue = ApplicationBuilder().token("123456:BENCHMARK").build().job_queue
+
+        job_queue_elapsed: float = run(
+            cancel_jobs(job_queue=job_queue, todo_ids=todo_ids, cancelled_todo_ids=cancelled_todo_ids)
+        )
+        wheel_elapsed: float = cancel_wheel_entries(todo_ids=todo_ids, cancelled_todo_ids=cancelled_todo_ids)
+
+        print(
+            f"{jobs:,} jobs: job queue scan {job_queue_elapsed * 1000:.3f} ms, "
+            f"timing wheel {wheel_elapsed * 1000:.4f} ms per cancellation"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Db round trips and latency of the completion of a to-do (inline "done" button or thumbs-up reaction).
+
+Seeds the to-dos (each with a reminder, its schedule entries and a pending message),
+then completes half of them with complete_todo (a single transaction),
+and the other half with the previous flow (an update, a retrieve with the reminder,
+a get and a delete of the reminder and an update of the pending messages, in 4 sessions),
+and reports the round trips (statements plus commits) and the mean latency per completion.
+
+Usage: python benchmarks/complete_todos.py [--completions 500]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from asyncio import run  # noqa: E402
+from datetime import UTC, datetime, timedelta  # noqa: E402
+from time import perf_counter  # noqa: E402
+from uuid import UUID  # noqa: E402
+
+import models  # noqa: E402, F401
+from database.db import SessionLocal, db_engine, dispose_db, init_db  # noqa: E402
+from models.pending_message.crud.create import create_pending_messages  # noqa: E402
+from models.pending_message.pending_message import PendingMessage  # noqa: E402
+from models.reminder.crud.create import create_reminder  # noqa: E402
+from models.reminder.reminder import Reminder  # noqa: E402
+from models.schedule.schedule import ScheduleEntry  # noqa: E402
+from models.todo.crud.create import create_todo  # noqa: E402
+from models.todo.crud.retrieve import retrieve_todo  # noqa: E402
+from models.todo.crud.update import complete_todo  # noqa: E402
+from models.todo.todo import Todo  # noqa: E402
+from models.user.crud.create import create_user  # noqa: E402
+from sqlalchemy import delete, event, update  # noqa: E402
+
+# The pending messages of a completed to-do expire after a day
+MESSAGES_TTL: timedelta = timedelta(days=1)
+
+
+class RoundTrips:
+
+    # Counts the statements and the commits sent to the db
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+
+async def seed(todos: int) -> list:
+
+    due_date: datetime = datetime.now(UTC) + timedelta(days=1)
+
+    user_id: UUID = await create_user(user_data={"first_name": "User", "telegram_id": 10 ** 9})
+
+    todo_ids: list = []
+
+    for index in range(todos):
+
+        todo_id: UUID = await create_todo(
+            todo_data={"user_id": user_id, "details": f"Todo {index}", "due_date": due_date, "utc_offset": 0}
+        )
+
+        await create_reminder(
+            reminder_data={"name": "Reminder", "todo_id": todo_id, "remind_at": due_date - timedelta(hours=1)}
+        )
+
+        todo_ids.append(todo_id)
+
+    await create_pending_messages(
+        pending_messages_data=[
+            {"chat_id": 10 ** 9, "message_id": index, "todo_id": todo_id} for index, todo_id in enumerate(todo_ids)
+        ]
+    )
+
+    return todo_ids
+
+
+async def complete_todo_in_sessions(todo_id: UUID, messages_expire_at: datetime) -> Todo | None:
+
+    # The previous flow: mark the to-do as done
+    async with SessionLocal() as session:
+        await session.execute(update(Todo).where(Todo.id == todo_id).values(done=True))
+        await session.commit()
+
+    # Retrieve it (for the reply) with its reminder
+    if not (todo := await retrieve_todo(todo_id=todo_id, with_reminder=True)):
+        return None
+
+    # Delete its reminder (and its schedule entries)
+    if todo.reminder:
+        async with SessionLocal() as session:
+            await session.delete(await session.get(entity=Reminder, ident=todo.reminder.id))
+            await session.execute(delete(ScheduleEntry).where(ScheduleEntry.todo_id == todo_id))
+            await session.commit()
+
+    # Expire its pending messages
+    async with SessionLocal() as session:
+        await session.execute(
+            update(PendingMessage).where(PendingMessage.todo_id == todo_id).values(expires_at=messages_expire_at)
+        )
+        await session.commit()
+
+    return todo
+
+
+async def measure(complete, todo_ids: list) -> tuple:
+
+    round_trips = RoundTrips()
+
+    sync_engine = db_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", round_trips)
+    event.listen(sync_engine, "commit", round_trips)
+
+    started_at: float = perf_counter()
+
+    for todo_id in todo_ids:
+        assert await complete(todo_id=todo_id, messages_expire_at=datetime.now(UTC) + MESSAGES_TTL)
+
+    elapsed: float = perf_counter() - started_at
+
+    event.remove(sync_engine, "before_cursor_execute", round_trips)
+    event.remove(sync_engine, "commit", round_trips)
+
+    return round_trips.count / len(todo_ids), elapsed * 1000 / len(todo_ids)
+
+
+async def run_benchmark(completions: int) -> None:
+
+    await init_db()
+
+    try:
+        todo_ids: list = await seed(todos=2 * completions)
+
+        for name, complete, completed_todo_ids in (
+            ("complete_todo (1 transaction)", complete_todo, todo_ids[:completions]),
+            ("previous flow (4 sessions)", complete_todo_in_sessions, todo_ids[completions:])
+        ):
+            round_trips, latency = await measure(complete=complete, todo_ids=completed_todo_ids)
+
+            print(f"{name}: {round_trips:.1f} round trips, {latency:.2f} ms per completion")
+
+    finally:
+        await dispose_db()
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--completions", type=int, default=500)
+    arguments = parser.parse_args()
+
+    run(run_benchmark(completions=arguments.completions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Dispatch of 50k reminders due in the same minute, against a stubbed bot.
+
+Seeds the to-dos (of many users, half of them with a reminder) so that all their
+schedule entries are due in the last minute, then runs the dispatcher until all of them
+are sent, and reports the time, the messages per second and the number of db statements.
+The sends are answered by a stub (after the specified latency), without rate limits,
+so that the dispatcher itself is measured, not the Telegram limits.
+
+Usage: python benchmarks/dispatch_reminders.py [--reminders 50000] [--users 10000] [--engine db|wheel]
+                                               [--send-latency-ms 0]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from asyncio import run, sleep  # noqa: E402
+from datetime import UTC, datetime, timedelta  # noqa: E402
+from itertools import count  # noqa: E402
+from random import Random  # noqa: E402
+from time import perf_counter  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+from uuid import uuid4  # noqa: E402
+
+import jobs.dispatch_reminders_job  # noqa: E402
+import models  # noqa: E402, F401
+from database.db import db_engine, dispose_db, init_db  # noqa: E402
+from jobs.dispatch_reminders_job import dispatch_reminders_job, start_reminders_dispatcher  # noqa: E402
+from models.reminder.reminder import Reminder  # noqa: E402
+from models.schedule.schedule import ScheduleEntry, ScheduleKind  # noqa: E402
+from models.todo.todo import Todo  # noqa: E402
+from models.user.user import User  # noqa: E402
+from sqlalchemy import event, func, insert, select  # noqa: E402
+
+# Rows per executemany when seeding
+SEED_CHUNK_SIZE: int = 10000
+
+
+class BotStub:
+
+    # Answers every send (after the specified latency), counting them
+    def __init__(self, send_latency: float) -> None:
+        self.send_latency: float = send_latency
+        self.message_ids = count(start=1)
+        self.sent: int = 0
+
+    async def send_message(self, chat_id: int, text: str, rate_limit_args=None) -> SimpleNamespace:
+
+        if self.send_latency:
+            await sleep(self.send_latency)
+
+        self.sent += 1
+
+        return SimpleNamespace(id=next(self.message_ids))
+
+
+class JobQueueStub:
+
+    # The dispatcher job is run by the benchmark
+    def run_repeating(self, **kwargs) -> None:
+        pass
+
+
+async def seed(reminders: int, users: int, random: Random) -> None:
+
+    now: datetime = datetime.now(UTC)
+    user_ids: list = [uuid4() for _ in range(users)]
+
+    # The entries are all due in the last minute (the to-dos half an hour later)
+    due_at: datetime = now - timedelta(seconds=30)
+
+    async with db_engine.begin() as connection:
+
+        for start in range(0, users, SEED_CHUNK_SIZE):
+            await connection.execute(
+                insert(User),
+                [
+                    {"id": user_ids[index], "first_name": "User", "telegram_id": 10 ** 9 + index}
+                    for index in range(start, min(start + SEED_CHUNK_SIZE, users))
+                ]
+            )
+
+        for start in range(0, reminders, SEED_CHUNK_SIZE):
+
+            todos_data, reminders_data, entries_data = [], [], []
+
+            for index in range(start, min(start + SEED_CHUNK_SIZE, reminders)):
+
+                user_index: int = random.randrange(users)
+                todo_id = uuid4()
+                is_reminder: bool = index % 2 == 0
+
+                todos_data.append(
+                    {
+                        "id": todo_id, "user_id": user_ids[user_index], "details": f"Todo {index}",
+                        "due_date": due_at + timedelta(minutes=30) if is_reminder else due_at,
+                        "timezone": "Europe/Rome", "utc_offset": 3600, "done": False
+                    }
+                )
+
+                if is_reminder:
+                    reminders_data.append({"name": "Reminder", "todo_id": todo_id, "remind_at": due_at})
+
+                entries_data.append(
+                    {
+                        "due_at": due_at, "kind": ScheduleKind.REMINDER if is_reminder else ScheduleKind.TODO,
+                        "todo_id": todo_id, "chat_id": 10 ** 9 + user_index
+                    }
+                )
+
+            await connection.execute(insert(Todo), todos_data)
+            await connection.execute(insert(Reminder), reminders_data)
+            await connection.execute(insert(ScheduleEntry), entries_data)
+
+
+async def count_schedule_entries() -> int:
+
+    async with db_engine.connect() as connection:
+        return await connection.scalar(select(func.count()).select_from(ScheduleEntry))
+
+
+async def run_benchmark(reminders: int, users: int, engine: str, send_latency: float) -> None:
+
+    await init_db()
+
+    try:
+        await seed(reminders=reminders, users=users, random=Random(0))
+
+        jobs.dispatch_reminders_job.SCHEDULER_ENGINE = engine
+
+        context = SimpleNamespace(bot=BotStub(send_latency=send_latency), bot_data={}, job_queue=JobQueueStub())
+
+        # Count the statements sent to the db
+        statements: list = []
+        event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+        started_at: float = perf_counter()
+
+        # Load the timing wheel (if enabled), and run the dispatcher (a single run dispatches them all)
+        await start_reminders_dispatcher(application=context)
+        loaded_at: float = perf_counter()
+
+        await dispatch_reminders_job(context=context)
+        elapsed: float = perf_counter() - loaded_at
+
+        assert context.bot.sent == reminders and await count_schedule_entries() == 0
+
+        print(
+            f"engine={engine}: {reminders:,} reminders dispatched in {elapsed:.2f} s "
+            f"({reminders / elapsed:,.0f} messages/s, {len(statements):,} db statements"
+            + (f", wheel loaded in {loaded_at - started_at:.2f} s)" if engine == "wheel" else ")")
+        )
+
+    finally:
+        await dispose_db()
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--engine", choices=["db", "wheel"], default="db")
+    parser.add_argument("--send-latency-ms", type=float, default=0)
+    arguments = parser.parse_args()
+
+    run(
+        run_benchmark(
+            reminders=arguments.reminders,
+            users=arguments.users,
+            engine=arguments.engine,
+            send_latency=arguments.send_latency_ms / 1000
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
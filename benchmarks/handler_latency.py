@@ -0,0 +1,206 @@
+"""p99 latency of the db work of the /todos handler, with 200 concurrent users.
+
+Seeds the users (with their to-dos), then every user sends its /todos commands
+(with a random think time in between, of the specified mean) while another task runs a slow query
+every second (a sleep in the db, as a slow round trip of another user), and reports the latency
+percentiles of the handler, from the arrival of the command (so that the time spent waiting
+for a blocked event loop is counted).
+It's run twice on the same db: with the async engine of the bot (the sessions are awaited),
+and with a blocking engine on the same db (the previous synchronous sessions,
+run inside the event loop), where a single slow round trip stalls every other user.
+
+Usage: python benchmarks/handler_latency.py [--users 200] [--requests 10] [--think-ms 1000]
+                                            [--slow-query-ms 500]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from asyncio import create_task, gather, run, sleep  # noqa: E402
+from datetime import UTC, datetime, timedelta  # noqa: E402
+from random import Random  # noqa: E402
+from statistics import quantiles  # noqa: E402
+from time import perf_counter, sleep as blocking_sleep  # noqa: E402
+from uuid import uuid4  # noqa: E402
+
+import models  # noqa: E402, F401
+from database.db import SessionLocal, db_engine, dispose_db, init_db  # noqa: E402
+from models.todo.crud.retrieve import retrieve_todos  # noqa: E402
+from models.todo.todo import Todo  # noqa: E402
+from models.user.crud.retrieve import retrieve_user  # noqa: E402
+from models.user.user import User  # noqa: E402
+from sqlalchemy import create_engine, event, insert, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+# To-dos per user
+TODOS_PER_USER: int = 10
+
+# Seconds between the slow queries
+SLOW_QUERY_INTERVAL: float = 1
+
+# A query that keeps the db busy for the specified seconds
+# (on SQLite, the sleep function is registered on every connection)
+SLOW_QUERIES: dict = {
+    "sqlite": "SELECT sleep(:seconds)",
+    "postgresql": "SELECT pg_sleep(:seconds)"
+}
+
+
+def register_sleep(dbapi_connection, connection_record) -> None:
+    dbapi_connection.create_function("sleep", 1, blocking_sleep)
+
+
+async def seed(users: int) -> list:
+
+    due_date: datetime = datetime.now(UTC) + timedelta(days=1)
+
+    users_data: list = [{"id": uuid4(), "first_name": "User", "telegram_id": 10 ** 9 + index} for index in range(users)]
+
+    todos_data: list = [
+        {"id": uuid4(), "user_id": user["id"], "details": f"Todo {index}", "due_date": due_date, "utc_offset": 0}
+        for user in users_data
+        for index in range(TODOS_PER_USER)
+    ]
+
+    async with db_engine.begin() as connection:
+        await connection.execute(insert(User), users_data)
+        await connection.execute(insert(Todo), todos_data)
+
+    return [user["telegram_id"] for user in users_data]
+
+
+async def handle_todos(user_telegram_id: int) -> None:
+
+    # The db work of /todos, with the async sessions of the bot
+    user = await retrieve_user(user_telegram_id=user_telegram_id)
+
+    await retrieve_todos(user_id=user.id, is_done=False)
+
+
+async def run_slow_query(seconds: float) -> None:
+
+    async with SessionLocal() as session:
+        await session.execute(text(SLOW_QUERIES[db_engine.dialect.name]), {"seconds": seconds})
+
+
+def build_blocking_handlers(sync_engine) -> tuple:
+
+    # The same db work, with synchronous sessions (blocking the event loop)
+    async def handle_todos_blocking(user_telegram_id: int) -> None:
+
+        with Session(sync_engine) as session:
+
+            user = session.scalar(select(User).where(User.telegram_id == user_telegram_id))
+
+            session.scalars(
+                select(Todo).where(Todo.user_id == user.id, Todo.done.is_(False)).order_by(Todo.due_date)
+            ).all()
+
+    async def run_slow_query_blocking(seconds: float) -> None:
+
+        with Session(sync_engine) as session:
+            session.execute(text(SLOW_QUERIES[sync_engine.dialect.name]), {"seconds": seconds})
+
+    return handle_todos_blocking, run_slow_query_blocking
+
+
+async def measure(
+    handle,
+    slow_query,
+    user_telegram_ids: list,
+    requests: int,
+    think: float,
+    slow_query_duration: float
+) -> list:
+
+    random = Random(0)
+    latencies: list = []
+    running: bool = True
+
+    async def user(user_telegram_id: int) -> None:
+
+        for _ in range(requests):
+
+            # The command arrives after the think time
+            arrived_at: float = perf_counter() + random.uniform(0, 2 * think)
+            await sleep(arrived_at - perf_counter())
+
+            await handle(user_telegram_id=user_telegram_id)
+            latencies.append(perf_counter() - arrived_at)
+
+    async def slow_user() -> None:
+
+        while running:
+            await slow_query(seconds=slow_query_duration)
+            await sleep(SLOW_QUERY_INTERVAL)
+
+    slow_task = create_task(slow_user())
+
+    await gather(*(user(user_telegram_id) for user_telegram_id in user_telegram_ids))
+
+    running = False
+    await slow_task
+
+    return latencies
+
+
+async def run_benchmark(users: int, requests: int, think: float, slow_query_duration: float) -> None:
+
+    sync_engine = create_engine(db_engine.url.set(drivername=db_engine.url.get_backend_name()))
+
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", register_sleep)
+        event.listen(sync_engine, "connect", register_sleep)
+
+    await init_db()
+
+    try:
+        user_telegram_ids: list = await seed(users=users)
+
+        for name, (handle, slow_query) in (
+            ("async engine", (handle_todos, run_slow_query)),
+            ("blocking engine", build_blocking_handlers(sync_engine))
+        ):
+            latencies: list = await measure(
+                handle=handle,
+                slow_query=slow_query,
+                user_telegram_ids=user_telegram_ids,
+                requests=requests,
+                think=think,
+                slow_query_duration=slow_query_duration
+            )
+
+            percentiles: list = quantiles(latencies, n=100)
+
+            print(
+                f"{name}: {len(latencies):,} requests, p50 {percentiles[49] * 1000:.1f} ms, "
+                f"p99 {percentiles[98] * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms"
+            )
+
+    finally:
+        sync_engine.dispose()
+        await dispose_db()
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--think-ms", type=float, default=1000)
+    parser.add_argument("--slow-query-ms", type=float, default=500)
+    arguments = parser.parse_args()
+
+    run(
+        run_benchmark(
+            users=arguments.users,
+            requests=arguments.requests,
+            think=arguments.think_ms / 1000,
+            slow_query_duration=arguments.slow_query_ms / 1000
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Time and quality of the near-duplicate removal of the news, against the previous SequenceMatcher filter.
+
+Generates several thousand headlines in groups of rewordings of the same story (reordered clauses,
+different case and punctuation, an added or dropped word, a source suffix), each with its own link
+and datetime, shuffled. Then removes the near-duplicates with find_unique (MinHash/LSH on the titles)
+and with the previous filter (SequenceMatcher on the whole [title, link, datetime] rows, threshold 0.2),
+and reports the time, the share of the rewordings removed, and the distinct stories lost.
+
+Usage: python benchmarks/news_dedup.py [--stories 3000] [--max-rewordings 3] [--threshold 0.5]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from datetime import UTC, datetime, timedelta  # noqa: E402
+from difflib import SequenceMatcher  # noqa: E402
+from random import Random  # noqa: E402
+from string import ascii_lowercase  # noqa: E402
+from time import perf_counter  # noqa: E402
+
+from handlers.utils.near_duplicates import find_unique  # noqa: E402
+
+SOURCES: list = ["Corriere", "la Repubblica", "Il Giorno", "MilanoToday", "Il Sole 24 Ore", "ANSA"]
+
+
+def build_headlines(stories: int, max_rewordings: int, random: Random) -> list:
+
+    # Vocabulary of the headlines
+    words: list = [
+        "".join(random.choices(ascii_lowercase, k=random.randint(3, 10))) for _ in range(5000)
+    ]
+
+    now: datetime = datetime.now(UTC)
+    headlines: list = []
+
+    for story in range(stories):
+
+        story_words: list = random.sample(words, k=random.randint(6, 11))
+        split: int = random.randint(2, len(story_words) - 2)
+
+        for rewording in range(random.randint(1, 1 + max_rewordings)):
+
+            title_words: list = list(story_words)
+
+            if rewording:
+
+                # Swap the clauses, add or drop a word, change the case, add the source
+                if random.random() < 0.5:
+                    title_words = title_words[split:] + title_words[:split]
+
+                if random.random() < 0.5:
+                    title_words.insert(random.randrange(len(title_words)), random.choice(words))
+                else:
+                    title_words.pop(random.randrange(len(title_words)))
+
+                if random.random() < 0.3:
+                    title_words = [word.upper() for word in title_words]
+
+            title: str = " ".join(title_words[:2]) + random.choice([", ", ": ", " - "]) + " ".join(title_words[2:])
+
+            if rewording and random.random() < 0.3:
+                title += f" - {random.choice(SOURCES)}"
+
+            headlines.append(
+                (
+                    story,
+                    [
+                        title.capitalize() if title.islower() else title,
+                        f"https://news.google.com/read/{story}-{rewording}",
+                        (now - timedelta(minutes=random.randint(0, 1440))).isoformat()
+                    ]
+                )
+            )
+
+    random.shuffle(headlines)
+
+    return headlines
+
+
+def filter_with_sequence_matcher(news_list: list, threshold: float = 0.2) -> list:
+
+    # The previous filter, returning the indexes of the kept news
+    unique_indexes: list = []
+
+    for index, news in enumerate(news_list):
+        if not any(
+            SequenceMatcher(isjunk=None, a=news, b=news_list[unique_index], autojunk=True).ratio() > threshold
+            for unique_index in unique_indexes
+        ):
+            unique_indexes.append(index)
+
+    return unique_indexes
+
+
+def report(name: str, headlines: list, unique_indexes: list, elapsed: float) -> None:
+
+    # The first headline of every story is the one to keep
+    first_indexes: dict = {}
+
+    for index, (story, _) in enumerate(headlines):
+        first_indexes.setdefault(story, index)
+
+    kept: set = set(unique_indexes)
+    rewordings: int = len(headlines) - len(first_indexes)
+    removed_rewordings: int = sum(
+        index not in kept for index, (story, _) in enumerate(headlines) if first_indexes[story] != index
+    )
+    lost_stories: int = len(first_indexes) - len({headlines[index][0] for index in kept})
+
+    print(
+        f"{name}: {elapsed * 1000:,.0f} ms, {len(unique_indexes):,} kept, "
+        f"{removed_rewordings / rewordings:.1%} of the {rewordings:,} rewordings removed, "
+        f"{lost_stories:,} of the {len(first_indexes):,} stories lost"
+    )
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=3000)
+    parser.add_argument("--max-rewordings", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    arguments = parser.parse_args()
+
+    headlines: list = build_headlines(
+        stories=arguments.stories,
+        max_rewordings=arguments.max_rewordings,
+        random=Random(0)
+    )
+
+    print(f"{len(headlines):,} headlines of {arguments.stories:,} stories")
+
+    news_list: list = [news for _, news in headlines]
+
+    for name, deduplicate in (
+        (
+            f"MinHash/LSH on the titles (threshold {arguments.threshold})",
+            lambda: find_unique(texts=[title for title, _, _ in news_list], threshold=arguments.threshold)
+        ),
+        ("SequenceMatcher on the rows (threshold 0.2)", lambda: filter_with_sequence_matcher(news_list=news_list))
+    ):
+        started_at: float = perf_counter()
+        unique_indexes: list = deduplicate()
+        elapsed: float = perf_counter() - started_at
+
+        report(name=name, headlines=headlines, unique_indexes=unique_indexes, elapsed=elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Parse time and peak memory per page of the news extractors (lxml and soup).
+
+Builds a Google News page with the specified number of articles, from the saved page
+in tests/fixtures/news (its articles repeated), then extracts the first NEWS_EXTRACTION_LIMIT
+articles with every extractor, and reports the mean parse time and the peak memory
+(the increase of the peak RSS of a fresh process, since lxml allocates outside of the Python heap).
+
+Usage: python benchmarks/news_extraction.py [--articles 300] [--limit 100] [--repeat 20]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from multiprocessing import get_context  # noqa: E402
+from pathlib import Path  # noqa: E402
+from resource import RUSAGE_SELF, getrusage  # noqa: E402
+from time import perf_counter  # noqa: E402
+
+from handlers.utils.news_extraction import extract_news_with_lxml, extract_news_with_soup  # noqa: E402
+
+# Saved Google News page, and the markers of its list of articles
+NEWS_PAGE_PATH = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "news" / "local_news.html"
+ARTICLES_START: str = '<c-wiz jsrenderer="ARwRbe"'
+ARTICLES_END: str = '<c-wiz class="D9SJMe"'
+
+EXTRACTORS: dict = {
+    "lxml": extract_news_with_lxml,
+    "soup": extract_news_with_soup
+}
+
+
+def build_page(articles: int) -> bytes:
+
+    page: str = NEWS_PAGE_PATH.read_text(encoding="utf-8")
+
+    head, rest = page.split(ARTICLES_START, 1)
+    articles_html, tail = rest.split(ARTICLES_END, 1)
+
+    # The articles of the saved page (one per line), repeated
+    page_articles: list = [ARTICLES_START + article for article in articles_html.split(ARTICLES_START)]
+
+    return (
+        head + "".join(page_articles[index % len(page_articles)] for index in range(articles)) + ARTICLES_END + tail
+    ).encode()
+
+
+def measure(extractor: str, content: bytes, limit: int, repeat: int) -> tuple:
+
+    # Run in a fresh process: the peak RSS only grows, so its increase is the peak memory of the extraction
+    baseline: int = getrusage(RUSAGE_SELF).ru_maxrss
+
+    started_at: float = perf_counter()
+
+    for _ in range(repeat):
+        news_list: list = EXTRACTORS[extractor](content=content, limit=limit)
+
+    elapsed: float = perf_counter() - started_at
+
+    # The peak RSS is in KiB (on Linux)
+    return len(news_list), elapsed / repeat, getrusage(RUSAGE_SELF).ru_maxrss - baseline
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    arguments = parser.parse_args()
+
+    content: bytes = build_page(articles=arguments.articles)
+
+    print(f"Page of {arguments.articles:,} articles ({len(content) / 2 ** 10:,.0f} KiB), limit {arguments.limit}")
+
+    for extractor in EXTRACTORS:
+
+        with get_context("spawn").Pool(processes=1) as pool:
+            articles, elapsed, peak_memory = pool.apply(
+                measure,
+                kwds={"extractor": extractor, "content": content, "limit": arguments.limit, "repeat": arguments.repeat}
+            )
+
+        print(
+            f"{extractor}: {articles} articles, {elapsed * 1000:.1f} ms per page, "
+            f"peak memory +{peak_memory / 1024:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Lookups per second of the offline reverse geocoder.
+
+Builds the index of a cities dataset (by default, a synthetic one with as many cities
+as GeoNames' cities500, in a temporary folder), loads it (memory-mapped), and reports
+the build and load times, and the lookups per second of random coordinates,
+against a vectorized linear scan of the same cities (and Nominatim's 1 request per second).
+
+Usage: python benchmarks/offline_geocoder.py [--dataset cities.csv] [--cities 200000] [--lookups 100000]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from pathlib import Path  # noqa: E402
+from random import Random  # noqa: E402
+from shutil import copyfile  # noqa: E402
+from tempfile import TemporaryDirectory  # noqa: E402
+from time import perf_counter  # noqa: E402
+import numpy as np  # noqa: E402
+
+from geocoding.offline import OfflineGeocoder, to_unit_vector  # noqa: E402
+
+
+def write_dataset(path: Path, cities: int, random: Random) -> None:
+
+    # Random cities, more dense at the mid latitudes (as the real ones)
+    with path.open("w", encoding="utf-8") as dataset:
+
+        dataset.write("city,country,latitude,longitude\n")
+
+        for index in range(cities):
+            dataset.write(
+                f"City {index},Country {index % 250},{random.gauss(25, 25) % 180 - 90:.5f},"
+                f"{random.uniform(-180, 180):.5f}\n"
+            )
+
+
+def measure_lookups(lookup, queries: list) -> float:
+
+    # Lookups per second
+    started_at: float = perf_counter()
+
+    for latitude, longitude in queries:
+        lookup(latitude, longitude)
+
+    return len(queries) / (perf_counter() - started_at)
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", type=Path)
+    parser.add_argument("--cities", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    parser.add_argument("--max-distance-km", type=float, default=30)
+    arguments = parser.parse_args()
+
+    random = Random(0)
+
+    with TemporaryDirectory() as temporary_path:
+
+        # The index is built next to the dataset, so the dataset is copied
+        dataset = Path(temporary_path) / "cities.csv"
+
+        if arguments.dataset:
+            copyfile(arguments.dataset, dataset)
+        else:
+            write_dataset(path=dataset, cities=arguments.cities, random=random)
+
+        started_at: float = perf_counter()
+        OfflineGeocoder.load(dataset_path=str(dataset), max_distance_km=arguments.max_distance_km)
+        print(f"index build: {perf_counter() - started_at:.2f} s")
+
+        started_at = perf_counter()
+        geocoder = OfflineGeocoder.load(dataset_path=str(dataset), max_distance_km=arguments.max_distance_km)
+        print(f"index load (memory-mapped): {(perf_counter() - started_at) * 1000:.1f} ms, {geocoder.size:,} cities")
+
+        queries: list = [
+            (random.gauss(25, 25) % 180 - 90, random.uniform(-180, 180))
+            for _ in range(arguments.lookups)
+        ]
+
+        lookups_per_second: float = measure_lookups(
+            lookup=lambda latitude, longitude: geocoder.lookup(latitude=latitude, longitude=longitude),
+            queries=queries
+        )
+        hits: int = sum(
+            geocoder.lookup(latitude=latitude, longitude=longitude) is not None
+            for latitude, longitude in queries
+        )
+
+        print(
+            f"KD-tree: {lookups_per_second:,.0f} lookups/s "
+            f"({1e6 / lookups_per_second:.1f} µs per lookup, {hits / len(queries):.0%} hits)"
+        )
+
+        # A vectorized linear scan of all the cities, on a sample of the queries
+        points = np.asarray(geocoder.points).reshape(-1, 3)
+
+        linear_lookups_per_second: float = measure_lookups(
+            lookup=lambda latitude, longitude: np.argmin(
+                ((points - to_unit_vector(latitude=latitude, longitude=longitude)) ** 2).sum(axis=1)
+            ),
+            queries=queries[:1000]
+        )
+
+        print(f"linear scan: {linear_lookups_per_second:,.0f} lookups/s")
+        print("Nominatim: 1 lookup/s (usage policy)")
+
+
+if __name__ == "__main__":
+    main()
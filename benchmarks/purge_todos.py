@@ -0,0 +1,120 @@
+"""Purge of 100k closed to-dos (and of the expired reminders) by the cleanup job.
+
+Seeds the closed to-dos (due before the retention period) and the open to-dos
+with a missed reminder, runs cleanup_todos_job once, and reports its time.
+For comparison, the same to-dos are then deleted one at a time with delete_todo
+(on a sample, extrapolated to the whole purge).
+
+Usage: python benchmarks/purge_todos.py [--todos 100000] [--reminders 50000] [--sample 2000]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from asyncio import run  # noqa: E402
+from datetime import UTC, datetime, timedelta  # noqa: E402
+from time import perf_counter  # noqa: E402
+from uuid import uuid4  # noqa: E402
+
+import models  # noqa: E402, F401
+from database.db import db_engine, dispose_db, init_db  # noqa: E402
+from jobs.cleanup_todos_job import CLOSED_TODOS_RETENTION, TODOS_CLEANUP_BATCH_SIZE, cleanup_todos_job  # noqa: E402
+from jobs.dispatch_reminders_job import SCHEDULER_GRACE_PERIOD  # noqa: E402
+from models.reminder.reminder import Reminder  # noqa: E402
+from models.todo.crud.delete import delete_todo  # noqa: E402
+from models.todo.todo import Todo  # noqa: E402
+from models.user.user import User  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+# To-dos per user, and rows per executemany when seeding
+TODOS_PER_USER: int = 20
+SEED_CHUNK_SIZE: int = 5000
+
+
+async def seed(closed_todos: int, expired_reminders: int, first_telegram_id: int) -> list:
+
+    now: datetime = datetime.now(UTC)
+    closed_due_date: datetime = now - timedelta(seconds=CLOSED_TODOS_RETENTION + 86400)
+    missed_remind_at: datetime = now - timedelta(seconds=SCHEDULER_GRACE_PERIOD + 86400)
+
+    users: list = [
+        {"id": uuid4(), "first_name": "User", "telegram_id": first_telegram_id + index}
+        for index in range(-(-(closed_todos + expired_reminders) // TODOS_PER_USER))
+    ]
+
+    todos: list = [
+        {
+            "id": uuid4(),
+            "user_id": users[index // TODOS_PER_USER]["id"],
+            "details": f"Todo {index}",
+            "due_date": closed_due_date if index < closed_todos else now + timedelta(days=1),
+            "utc_offset": 0,
+            "done": index < closed_todos
+        }
+        for index in range(closed_todos + expired_reminders)
+    ]
+
+    reminders: list = [
+        {"id": uuid4(), "name": "Reminder", "todo_id": todo["id"], "remind_at": missed_remind_at}
+        for todo in todos[closed_todos:]
+    ]
+
+    async with db_engine.begin() as connection:
+        for model, rows in ((User, users), (Todo, todos), (Reminder, reminders)):
+            for start in range(0, len(rows), SEED_CHUNK_SIZE):
+                await connection.execute(insert(model), rows[start:start + SEED_CHUNK_SIZE])
+
+    return [todo["id"] for todo in todos[:closed_todos]]
+
+
+async def run_benchmark(todos: int, reminders: int, sample: int) -> None:
+
+    await init_db()
+
+    try:
+        await seed(closed_todos=todos, expired_reminders=reminders, first_telegram_id=10 ** 9)
+
+        started_at: float = perf_counter()
+        await cleanup_todos_job(context=None)
+        elapsed: float = perf_counter() - started_at
+
+        print(
+            f"cleanup_todos_job (batches of {TODOS_CLEANUP_BATCH_SIZE}): "
+            f"{todos:,} closed to-dos and {reminders:,} expired reminders in {elapsed:.2f} s"
+        )
+
+        # The same purge, row by row
+        if sample:
+
+            todo_ids: list = await seed(closed_todos=sample, expired_reminders=0, first_telegram_id=2 * 10 ** 9)
+
+            started_at = perf_counter()
+
+            for todo_id in todo_ids:
+                await delete_todo(todo_id=todo_id)
+
+            elapsed = perf_counter() - started_at
+
+            print(
+                f"delete_todo (row by row): {sample:,} closed to-dos in {elapsed:.2f} s, "
+                f"{elapsed * todos / sample:.0f} s for {todos:,} (extrapolated)"
+            )
+
+    finally:
+        await dispose_db()
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=100000)
+    parser.add_argument("--reminders", type=int, default=50000)
+    parser.add_argument("--sample", type=int, default=2000)
+    arguments = parser.parse_args()
+
+    run(run_benchmark(todos=arguments.todos, reminders=arguments.reminders, sample=arguments.sample))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Latency of the to-do queries on a large db (by default, 1M to-dos of 50k users).
+
+Seeds the users, their to-dos (some completed, some with a reminder) and the schedule
+entries of the pending ones, then reports the latency (p50/p99) of:
+- the /todos listing (the uncompleted to-dos of a user, by due date), on random users;
+- the dispatcher tick (the claim of the entries due, with none due);
+- the startup reload of the schedule (with the timing wheel engine), once.
+It also prints the query plan of the listing, to check it uses the (user_id, done, due_date) index.
+
+Usage: python benchmarks/todos_queries.py [--todos 1000000] [--users 50000] [--samples 1000]
+"""
+from app_environment import setup_app_environment
+
+setup_app_environment()
+
+from argparse import ArgumentParser  # noqa: E402
+from asyncio import run  # noqa: E402
+from datetime import UTC, datetime, timedelta  # noqa: E402
+from random import Random  # noqa: E402
+from statistics import quantiles  # noqa: E402
+from time import perf_counter  # noqa: E402
+from uuid import uuid4  # noqa: E402
+
+import models  # noqa: E402, F401
+from database.db import db_engine, dispose_db, init_db  # noqa: E402
+from jobs.dispatch_reminders_job import SCHEDULER_CLAIM_TIMEOUT, SCHEDULER_GRACE_PERIOD  # noqa: E402
+from models.reminder.reminder import Reminder  # noqa: E402
+from models.schedule.crud.retrieve import retrieve_schedule_entries  # noqa: E402
+from models.schedule.crud.update import claim_due_schedule_entries  # noqa: E402
+from models.schedule.schedule import ScheduleEntry, ScheduleKind  # noqa: E402
+from models.todo.crud.retrieve import retrieve_todos  # noqa: E402
+from models.todo.todo import Todo  # noqa: E402
+from models.user.user import User  # noqa: E402
+from sqlalchemy import Select, and_, insert, select, text  # noqa: E402
+
+# Rows per executemany when seeding
+SEED_CHUNK_SIZE: int = 10000
+
+
+async def seed(todos: int, users: int, random: Random) -> list:
+
+    now: datetime = datetime.now(UTC)
+    user_ids: list = [uuid4() for _ in range(users)]
+
+    async with db_engine.begin() as connection:
+
+        for start in range(0, users, SEED_CHUNK_SIZE):
+            await connection.execute(
+                insert(User),
+                [
+                    {"id": user_ids[index], "first_name": "User", "telegram_id": 10 ** 9 + index}
+                    for index in range(start, min(start + SEED_CHUNK_SIZE, users))
+                ]
+            )
+
+        # The to-dos are generated (and inserted) a chunk at a time
+        for start in range(0, todos, SEED_CHUNK_SIZE):
+
+            todos_data, reminders_data, entries_data = [], [], []
+
+            for _ in range(start, min(start + SEED_CHUNK_SIZE, todos)):
+
+                user_index: int = random.randrange(users)
+                done: bool = random.random() < 0.3
+                due_date: datetime = now + timedelta(minutes=5 * random.randrange(1, 105120))
+
+                todos_data.append(
+                    {
+                        "id": (todo_id := uuid4()), "user_id": user_ids[user_index], "details": "Todo",
+                        "due_date": due_date, "utc_offset": 0, "done": done
+                    }
+                )
+
+                if done:
+                    continue
+
+                entries_data.append(
+                    {"due_at": due_date, "kind": ScheduleKind.TODO, "todo_id": todo_id, "chat_id": 10 ** 9 + user_index}
+                )
+
+                if random.random() < 0.3:
+
+                    remind_at: datetime = due_date - timedelta(hours=1)
+
+                    reminders_data.append({"name": "Reminder", "todo_id": todo_id, "remind_at": remind_at})
+                    entries_data.append(
+                        {
+                            "due_at": remind_at, "kind": ScheduleKind.REMINDER, "todo_id": todo_id,
+                            "chat_id": 10 ** 9 + user_index
+                        }
+                    )
+
+            await connection.execute(insert(Todo), todos_data)
+
+            if reminders_data:
+                await connection.execute(insert(Reminder), reminders_data)
+
+            await connection.execute(insert(ScheduleEntry), entries_data)
+
+        # Refresh the statistics of the query planner
+        await connection.execute(text("ANALYZE"))
+
+    return user_ids
+
+
+async def measure(coroutine_function, samples: int) -> list:
+
+    # Latencies (in milliseconds) of the specified number of calls
+    latencies: list = []
+
+    for sample in range(samples):
+
+        started_at: float = perf_counter()
+        await coroutine_function(sample)
+        latencies.append((perf_counter() - started_at) * 1000)
+
+    return latencies
+
+
+def format_latencies(name: str, latencies: list) -> str:
+
+    percentiles: list = quantiles(latencies, n=100)
+
+    return f"{name}: p50={percentiles[49]:.2f} ms, p99={percentiles[98]:.2f} ms ({len(latencies):,} samples)"
+
+
+async def print_listing_plan(user_id) -> None:
+
+    # The same statement as retrieve_todos
+    sql_statement: Select = select(Todo) \
+                            .where(and_(Todo.user_id == user_id, Todo.done.is_(False))) \
+                            .order_by(Todo.due_date)
+
+    compiled = sql_statement.compile(dialect=db_engine.dialect, compile_kwargs={"literal_binds": True})
+    explain: str = "EXPLAIN QUERY PLAN" if db_engine.dialect.name == "sqlite" else "EXPLAIN"
+
+    async with db_engine.connect() as connection:
+
+        rows = (await connection.exec_driver_sql(f"{explain} {compiled}")).all()
+
+    print("Query plan of the /todos listing:")
+
+    for row in rows:
+        print(f"  {row[-1]}")
+
+
+async def run_benchmark(todos: int, users: int, samples: int) -> None:
+
+    random = Random(0)
+
+    await init_db()
+
+    try:
+        started_at: float = perf_counter()
+        user_ids: list = await seed(todos=todos, users=users, random=random)
+
+        print(f"Seeded {todos:,} to-dos of {users:,} users in {perf_counter() - started_at:.1f} s")
+
+        await print_listing_plan(user_id=user_ids[0])
+
+        sampled_user_ids: list = [random.choice(user_ids) for _ in range(samples)]
+
+        print(
+            format_latencies(
+                name="/todos listing",
+                latencies=await measure(
+                    lambda sample: retrieve_todos(user_id=sampled_user_ids[sample], is_done=False),
+                    samples=samples
+                )
+            )
+        )
+
+        now: datetime = datetime.now(UTC)
+
+        print(
+            format_latencies(
+                name="dispatcher tick",
+                latencies=await measure(
+                    lambda sample: claim_due_schedule_entries(
+                        due_after=now - timedelta(seconds=SCHEDULER_GRACE_PERIOD),
+                        due_until=now,
+                        claimed_before=now - timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT),
+                        limit=500
+                    ),
+                    samples=samples
+                )
+            )
+        )
+
+        started_at = perf_counter()
+        schedule_entries: list = await retrieve_schedule_entries(
+            due_after=now - timedelta(seconds=SCHEDULER_GRACE_PERIOD)
+        )
+
+        print(f"startup reload: {len(schedule_entries):,} schedule entries in {perf_counter() - started_at:.2f} s")
+
+    finally:
+        await dispose_db()
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--samples", type=int, default=1000)
+    arguments = parser.parse_args()
+
+    run(run_benchmark(todos=arguments.todos, users=arguments.users, samples=arguments.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Throughput of the bot with 1..N worker processes, against a stubbed Bot API.
+
+The stub answers the Bot API requests locally: getUpdates serves a fixed number
+of /help commands (from many users), and every reply (sendMessage) is counted.
+A first /help per user is served as warm-up (so that all the workers are started),
+and the time is measured from the end of the warm-up to the last reply.
+The bot runs unchanged, as "python app", pointed to the stub with BOT_API_BASE_URL,
+and the rate limits are raised, so that the processing is measured, not Telegram limits.
+
+Usage: python benchmarks/workers_throughput.py [--updates 5000] [--users 500] [--workers 1 2 4]
+"""
+from argparse import ArgumentParser
+from contextlib import suppress
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from os import environ
+from pathlib import Path
+from signal import SIGINT
+from subprocess import Popen
+from tempfile import TemporaryDirectory
+from threading import Event, Lock, Thread
+from time import monotonic, sleep, time
+from urllib.parse import parse_qsl
+import sys
+
+# Root of the repository (the bot is run from here, as "python app")
+ROOT_PATH = Path(__file__).resolve().parent.parent
+
+BOT_TOKEN: str = "123456:BENCHMARK"
+
+
+class BotApiStub(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    # The bot opens up to 256 connections at the same time
+    request_queue_size = 1024
+
+    def __init__(self, updates: list, warmup: int) -> None:
+
+        super().__init__(("127.0.0.1", 0), BotApiHandler)
+
+        self.updates: list = updates
+        self.warmup: int = warmup
+        self.released: int = warmup
+        self.lock = Lock()
+        self.replies: int = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.finished = Event()
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+
+        server: BotApiStub = self.server
+        method: str = self.path.rsplit("/", 1)[-1]
+        body: bytes = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        # The parameters are sent as a form (or as JSON)
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            data: dict = loads(body)
+        else:
+            data: dict = dict(parse_qsl(body.decode()))
+
+        match method:
+
+            case "getMe":
+                result = {
+                    "id": 123456, "is_bot": True, "first_name": "Benchmark", "username": "benchmark_bot",
+                    "can_join_groups": False, "can_read_all_group_messages": False,
+                    "supports_inline_queries": False
+                }
+
+            case "getUpdates":
+
+                # Serve the released updates after the offset, or wait a bit (as a short long polling)
+                # The update ids start from 1, so the offset is also the index of the first update to serve
+                start: int = max(int(data.get("offset") or 1) - 1, 0)
+                limit: int = int(data.get("limit") or 100)
+                result = server.updates[start:min(start + limit, server.released)]
+
+                if not result:
+                    sleep(0.1)
+
+            case "sendMessage":
+
+                with server.lock:
+                    server.replies += 1
+                    message_id: int = server.replies
+
+                    # Release the measured updates at the end of the warm-up
+                    if server.replies == server.warmup:
+                        server.started_at = monotonic()
+                        server.released = len(server.updates)
+
+                    if server.replies == len(server.updates):
+                        server.finished_at = monotonic()
+                        server.finished.set()
+
+                result = {
+                    "message_id": message_id,
+                    "date": int(time()),
+                    "chat": {"id": int(data.get("chat_id") or 0), "type": "private"},
+                    "text": data.get("text", "")
+                }
+
+            case _:
+                result = True
+
+        response: bytes = dumps({"ok": True, "result": result}).encode()
+
+        # The bot may close the connection while stopping
+        with suppress(ConnectionError):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def build_updates(count: int, users: int) -> list:
+
+    now: int = int(time())
+
+    return [
+        {
+            "update_id": index + 1,
+            "message": {
+                "message_id": index + 1,
+                "date": now,
+                "chat": {"id": 1000 + index % users, "type": "private"},
+                "from": {"id": 1000 + index % users, "is_bot": False, "first_name": "User"},
+                "text": "/help",
+                "entities": [{"type": "bot_command", "offset": 0, "length": 5}]
+            }
+        }
+        for index in range(count)
+    ]
+
+
+def run_benchmark(updates: int, users: int, workers: int, timeout: float) -> float | None:
+
+    stub = BotApiStub(updates=build_updates(count=users + updates, users=users), warmup=users)
+    Thread(target=stub.serve_forever, daemon=True).start()
+
+    with TemporaryDirectory() as temporary_path:
+
+        host, port = stub.server_address
+
+        bot = Popen(
+            [sys.executable, "app"],
+            cwd=ROOT_PATH,
+            env={
+                **environ,
+                "BOT_TOKEN": BOT_TOKEN,
+                "BOT_MODE": "polling",
+                "BOT_API_BASE_URL": f"http://{host}:{port}/bot",
+                "WORKERS": str(workers),
+                "DB_DIALECT": "sqlite",
+                "DB_DRIVER": "aiosqlite",
+                "DB_DATABASE": f"{temporary_path}/benchmark.sqlite",
+                "CREATE_MODELS": "True",
+                "DEBUG": "False",
+                "LOG_LEVEL": "WARNING",
+                "STATS_LOG_INTERVAL": "0",
+                "GEOCODER": "nominatim",
+                "RATE_LIMIT_GLOBAL": "1000000",
+                "RATE_LIMIT_PER_CHAT": "1000000",
+                "RATE_LIMIT_PER_GROUP_MINUTE": "1000000"
+            }
+        )
+
+        try:
+            if not stub.finished.wait(timeout=timeout):
+                return None
+
+            return updates / (stub.finished_at - stub.started_at)
+
+        finally:
+            bot.send_signal(SIGINT)
+            bot.wait(timeout=60)
+
+            stub.shutdown()
+            stub.server_close()
+
+
+def main() -> None:
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--timeout", type=float, default=300)
+    arguments = parser.parse_args()
+
+    for workers in arguments.workers:
+
+        throughput = run_benchmark(
+            updates=arguments.updates,
+            users=arguments.users,
+            workers=workers,
+            timeout=arguments.timeout
+        )
+
+        print(
+            f"workers={workers}: "
+            + (f"{throughput:,.0f} updates/s" if throughput else f"not completed in {arguments.timeout:.0f} s")
+        )
+
+
+if __name__ == "__main__":
+    main()
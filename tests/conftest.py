@@ -0,0 +1,107 @@
+import asyncio
+import sys
+from itertools import count
+from os import environ
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event as sqlalchemy_event
+
+# The bot modules are imported as top level packages (as when running "python app"),
+# so the app folder is put on the path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+# The tests run against a shared in-memory SQLite db,
+# created (with all the tables) at the beginning of the session.
+# These variables must be set before importing database.db
+environ["DB_DIALECT"] = "sqlite"
+environ["DB_DRIVER"] = "aiosqlite"
+environ["DB_DATABASE"] = "file:tests?mode=memory&cache=shared&uri=true"
+environ["CREATE_MODELS"] = "True"
+environ["DEBUG"] = "False"
+
+import models  # noqa: E402, F401
+from database.db import db_engine, dispose_db, init_db  # noqa: E402
+from models.reminder.crud.create import create_reminder  # noqa: E402
+from models.todo.crud.create import create_todo  # noqa: E402
+from models.user.crud.create import create_user  # noqa: E402
+
+# The tests share the db, so every test user gets its own Telegram id
+TELEGRAM_IDS = count(start=100000)
+
+
+@pytest.fixture(scope="session")
+def session_loop():
+
+    # A single event loop for the whole session,
+    # since the pooled db connections are bound to the loop that opened them
+    loop = asyncio.new_event_loop()
+
+    loop.run_until_complete(init_db())
+
+    yield loop
+
+    loop.run_until_complete(dispose_db())
+    loop.close()
+
+
+@pytest.fixture
+def run(session_loop):
+
+    # Run a coroutine in the session event loop
+    return session_loop.run_until_complete
+
+
+@pytest.fixture
+def statements():
+
+    # Collect the SQL statements sent to the db while the test runs
+    executed_statements: list = []
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        executed_statements.append(statement)
+
+    sync_engine = db_engine.sync_engine
+    sqlalchemy_event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    yield executed_statements
+
+    sqlalchemy_event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def seed_todos(run):
+
+    # Create a user with the specified todos (as dicts of Todo fields,
+    # plus an optional "remind_at" for their reminder), with the CRUD functions of the bot.
+    # Return the user Telegram id and the ids of the todos
+    def seed(todos_data: list, telegram_id: int | None = None) -> tuple:
+
+        async def create_user_todos() -> tuple:
+
+            user_telegram_id: int = telegram_id or next(TELEGRAM_IDS)
+            user_id = await create_user(user_data={"first_name": "Test", "telegram_id": user_telegram_id})
+
+            todo_ids: list = []
+
+            for todo_data in todos_data:
+
+                todo_data = dict(todo_data)
+                remind_at = todo_data.pop("remind_at", None)
+
+                todo_id = await create_todo(todo_data={"user_id": user_id, "utc_offset": 0, **todo_data})
+
+                if remind_at:
+                    await create_reminder(
+                        reminder_data={
+                            "name": f"remind_user_job_{todo_id.hex}", "todo_id": todo_id, "remind_at": remind_at
+                        }
+                    )
+
+                todo_ids.append(todo_id)
+
+            return user_telegram_id, todo_ids
+
+        return run(create_user_todos())
+
+    return seed
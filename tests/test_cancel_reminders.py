@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, UTC
+from uuid import uuid4
+
+from database.db import db_engine
+from jobs.dispatch_reminders_job import cancel_reminders, schedule_reminder
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
+from scheduling.timing_wheel import TimingWheel
+from sqlalchemy import delete
+
+
+def test_cancel_reminders_drops_all_the_entries_of_the_todo() -> None:
+
+    now = datetime.now(UTC)
+    bot_data: dict = {"reminders_wheel": TimingWheel(now=now.timestamp())}
+
+    completed_todo_id, other_todo_id = uuid4(), uuid4()
+
+    for todo_id in (completed_todo_id, other_todo_id):
+        schedule_reminder(bot_data=bot_data, todo_id=todo_id, kind=ScheduleKind.TODO, due_at=now + timedelta(hours=2))
+        schedule_reminder(
+            bot_data=bot_data, todo_id=todo_id, kind=ScheduleKind.REMINDER, due_at=now + timedelta(hours=1)
+        )
+
+    cancel_reminders(bot_data=bot_data, todo_id=completed_todo_id)
+
+    reminders_wheel: TimingWheel = bot_data["reminders_wheel"]
+
+    assert set(reminders_wheel.items) == {(other_todo_id, ScheduleKind.TODO), (other_todo_id, ScheduleKind.REMINDER)}
+    assert reminders_wheel.stats["cancelled"] == 2
+
+    # Only the entries of the other todo fire
+    fired: list = reminders_wheel.advance(now=(now + timedelta(hours=3)).timestamp())
+
+    assert sorted(key for key, _ in fired) == sorted(
+        [(other_todo_id, ScheduleKind.TODO), (other_todo_id, ScheduleKind.REMINDER)]
+    )
+
+
+def test_cancel_reminders_without_the_wheel_is_a_no_op() -> None:
+
+    # With the db engine, the entries are deleted with the todo
+    cancel_reminders(bot_data={}, todo_id=uuid4())
+
+
+def test_schedule_entries_of_a_todo_are_deleted_by_index(run) -> None:
+
+    sql_statement = delete(ScheduleEntry).where(ScheduleEntry.todo_id == uuid4())
+    compiled = sql_statement.compile(dialect=db_engine.dialect, compile_kwargs={"literal_binds": True})
+
+    async def explain() -> list:
+        async with db_engine.connect() as connection:
+            return (await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    # The lookup by todo uses the (todo_id, kind) unique index, instead of scanning the table
+    plan: str = " ".join(row[-1] for row in run(explain()))
+
+    assert "USING" in plan and "INDEX" in plan
+    assert "SCAN" not in plan
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, UTC
+
+import jobs.cleanup_todos_job
+from database.db import SessionLocal
+from jobs.cleanup_todos_job import cleanup_todos_job
+from models.reminder.crud.delete import delete_reminders
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
+from models.todo.crud.delete import delete_todos
+from models.todo.todo import Todo
+from sqlalchemy import func, select
+
+
+def count_rows(run, model, todo_ids: list, *where) -> int:
+
+    async def count_todo_rows() -> int:
+
+        column = model.id if model is Todo else model.todo_id
+
+        async with SessionLocal() as session:
+            return await session.scalar(select(func.count()).select_from(model).where(column.in_(todo_ids), *where))
+
+    return run(count_todo_rows())
+
+
+def test_delete_todos_deletes_their_rows_in_chunks(run, statements, seed_todos):
+
+    due_date = datetime.now(UTC) + timedelta(days=1)
+
+    _, todo_ids = seed_todos(
+        todos_data=[
+            {"details": f"Todo {index}", "due_date": due_date, "remind_at": due_date - timedelta(hours=1)}
+            for index in range(5)
+        ]
+    )
+
+    statements.clear()
+
+    assert run(delete_todos(todo_ids=todo_ids[:4], chunk_size=2)) == 4
+
+    # A DELETE per table (reminders, schedule entries, pending messages and todos) and chunk
+    assert sum(statement.startswith("DELETE") for statement in statements) == 2 * 4
+
+    # The rows of the other todo are kept
+    assert count_rows(run, Todo, todo_ids) == 1
+    assert count_rows(run, Reminder, todo_ids) == 1
+    assert count_rows(run, ScheduleEntry, todo_ids) == 2
+    assert count_rows(run, ScheduleEntry, todo_ids[4:]) == 2
+
+
+def test_delete_reminders_deletes_their_schedule_entries(run, seed_todos):
+
+    due_date = datetime.now(UTC) + timedelta(days=1)
+
+    _, todo_ids = seed_todos(
+        todos_data=[
+            {"details": f"Todo {index}", "due_date": due_date, "remind_at": due_date - timedelta(hours=1)}
+            for index in range(3)
+        ]
+    )
+
+    async def retrieve_reminder_ids() -> list:
+        async with SessionLocal() as session:
+            return (await session.scalars(select(Reminder.id).where(Reminder.todo_id.in_(todo_ids[:2])))).all()
+
+    assert run(delete_reminders(reminder_ids=run(retrieve_reminder_ids()), chunk_size=1)) == 2
+
+    # Only the reminder entries of the deleted reminders are dropped
+    assert count_rows(run, Reminder, todo_ids) == 1
+    assert count_rows(run, ScheduleEntry, todo_ids, ScheduleEntry.kind == ScheduleKind.REMINDER) == 1
+    assert count_rows(run, ScheduleEntry, todo_ids, ScheduleEntry.kind == ScheduleKind.TODO) == 3
+
+
+def test_cleanup_todos_job_purges_in_batches(run, statements, seed_todos, monkeypatch):
+
+    monkeypatch.setattr(jobs.cleanup_todos_job, "TODOS_CLEANUP_BATCH_SIZE", 2)
+
+    now = datetime.now(UTC)
+    old_due_date = now - timedelta(seconds=jobs.cleanup_todos_job.CLOSED_TODOS_RETENTION + 3600)
+    missed_remind_at = now - timedelta(seconds=jobs.cleanup_todos_job.SCHEDULER_GRACE_PERIOD + 3600)
+
+    _, closed_todo_ids = seed_todos(
+        todos_data=[{"details": f"Closed {index}", "due_date": old_due_date, "done": True} for index in range(5)]
+    )
+    _, kept_todo_ids = seed_todos(
+        todos_data=[
+            # Not completed: kept, but its missed reminder is purged
+            {"details": "Open", "due_date": now + timedelta(days=1), "remind_at": missed_remind_at},
+            # Completed recently: kept
+            {"details": "Recent", "due_date": now - timedelta(days=1), "done": True},
+            # Reminder not due yet: kept
+            {"details": "Reminder", "due_date": now + timedelta(days=2), "remind_at": now + timedelta(days=1)}
+        ]
+    )
+
+    statements.clear()
+
+    run(cleanup_todos_job(context=None))
+
+    assert count_rows(run, Todo, closed_todo_ids) == 0
+    assert count_rows(run, ScheduleEntry, closed_todo_ids) == 0
+    assert count_rows(run, Todo, kept_todo_ids) == 3
+    assert count_rows(run, Reminder, kept_todo_ids) == 1
+
+    # The closed todos are deleted in batches (of 2), never row by row
+    assert sum(statement.startswith("DELETE FROM todos") for statement in statements) == 3
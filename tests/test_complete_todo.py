@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, UTC
+
+from database.db import SessionLocal
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry
+from models.todo.crud.update import complete_todo
+from sqlalchemy import func, select
+
+
+def count_rows(run, model, todo_id) -> int:
+
+    async def count_todo_rows() -> int:
+        async with SessionLocal() as session:
+            return await session.scalar(select(func.count()).select_from(model).where(model.todo_id == todo_id))
+
+    return run(count_todo_rows())
+
+
+def test_complete_todo_in_a_single_transaction(run, statements, seed_todos):
+
+    due_date = datetime.now(UTC) + timedelta(days=1)
+
+    _, [todo_id] = seed_todos(
+        todos_data=[{"details": "Todo", "due_date": due_date, "remind_at": due_date - timedelta(hours=1)}]
+    )
+
+    statements.clear()
+
+    todo = run(complete_todo(todo_id=todo_id, messages_expire_at=due_date))
+
+    # The fields of the reply are returned by the UPDATE
+    assert (todo.details, todo.utc_offset) == ("Todo", 0)
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "DELETE", "DELETE", "UPDATE"]
+
+    assert count_rows(run, Reminder, todo_id) == 0
+    assert count_rows(run, ScheduleEntry, todo_id) == 0
+
+
+def test_completing_a_todo_twice_is_a_no_op(run, statements, seed_todos):
+
+    _, [todo_id] = seed_todos(todos_data=[{"details": "Todo", "due_date": datetime.now(UTC)}])
+
+    assert run(complete_todo(todo_id=todo_id, messages_expire_at=datetime.now(UTC))) is not None
+
+    statements.clear()
+
+    # E.g. a reaction and the inline button at the same time: a single reply is sent
+    assert run(complete_todo(todo_id=todo_id, messages_expire_at=datetime.now(UTC))) is None
+
+    # Only the UPDATE (matching no to-do) is sent
+    assert [statement.split()[0] for statement in statements] == ["UPDATE"]
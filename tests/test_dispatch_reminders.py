@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, UTC
+from itertools import count
+from types import SimpleNamespace
+
+from database.db import SessionLocal
+from jobs.dispatch_reminders_job import (
+    SCHEDULER_CLAIM_TIMEOUT,
+    dispatch_fired_reminders,
+    dispatch_reminders_job,
+    schedule_reminder,
+    send_reminders
+)
+from models.reminder.reminder import Reminder
+from models.schedule.crud.update import claim_due_schedule_entries
+from models.schedule.schedule import ScheduleEntry, ScheduleKind, ScheduleState
+from scheduling.timing_wheel import TimingWheel
+from sqlalchemy import select
+
+MESSAGE_IDS = count(start=1)
+
+
+class Bot:
+
+    # Stand-in of the bot, failing the sends of the to-dos with the specified details
+    def __init__(self, failing_details: str) -> None:
+        self.failing_details: str = failing_details
+        self.texts: list = []
+
+    async def send_message(self, chat_id: int, text: str, rate_limit_args=None) -> SimpleNamespace:
+
+        if self.failing_details in text:
+            raise TimeoutError()
+
+        self.texts.append(text)
+
+        return SimpleNamespace(id=next(MESSAGE_IDS))
+
+
+def claim(run, todo_ids: list, now: datetime) -> list:
+    return run(
+        claim_due_schedule_entries(
+            due_after=now - timedelta(hours=1),
+            due_until=now,
+            claimed_before=now - timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT),
+            limit=100,
+            todo_ids=todo_ids
+        )
+    )
+
+
+def retrieve_entries(run, todo_ids: list) -> list:
+
+    async def retrieve_todo_entries() -> list:
+        async with SessionLocal() as session:
+            return (
+                await session.execute(
+                    select(ScheduleEntry.todo_id, ScheduleEntry.kind, ScheduleEntry.state)
+                    .where(ScheduleEntry.todo_id.in_(todo_ids))
+                )
+            ).all()
+
+    return run(retrieve_todo_entries())
+
+
+def test_failed_sends_are_left_claimed_and_retried(run, seed_todos):
+
+    now = datetime.now(UTC)
+    due_date = now - timedelta(minutes=1)
+
+    _, todo_ids = seed_todos(
+        todos_data=[
+            {"details": "Sent", "due_date": due_date, "remind_at": due_date - timedelta(minutes=1)},
+            {"details": "Failing", "due_date": due_date, "remind_at": due_date - timedelta(minutes=1)}
+        ]
+    )
+
+    due_entries: list = claim(run, todo_ids=todo_ids, now=now)
+    context = SimpleNamespace(bot=Bot(failing_details="Failing"))
+
+    failed_entries: list = run(send_reminders(context=context, due_entries=due_entries))
+
+    assert len(context.bot.texts) == 2
+    assert {(entry.todo_id, entry.kind) for entry in failed_entries} == {
+        (todo_ids[1], ScheduleKind.TODO), (todo_ids[1], ScheduleKind.REMINDER)
+    }
+
+    # Only the sent entries (and their fired reminder) are deleted
+    assert sorted(retrieve_entries(run, todo_ids=todo_ids)) == sorted(
+        [
+            (todo_ids[1], ScheduleKind.TODO, ScheduleState.CLAIMED),
+            (todo_ids[1], ScheduleKind.REMINDER, ScheduleState.CLAIMED)
+        ]
+    )
+
+    async def retrieve_reminder_todo_ids() -> list:
+        async with SessionLocal() as session:
+            return (await session.scalars(select(Reminder.todo_id).where(Reminder.todo_id.in_(todo_ids)))).all()
+
+    assert run(retrieve_reminder_todo_ids()) == [todo_ids[1]]
+
+    # The failed entries are claimed again only when their claim expires
+    assert claim(run, todo_ids=todo_ids, now=now + timedelta(seconds=1)) == []
+    assert len(claim(run, todo_ids=todo_ids, now=now + timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT + 1))) == 2
+
+
+def test_failed_sends_are_put_back_in_the_wheel(run, seed_todos):
+
+    now = datetime.now(UTC)
+
+    _, todo_ids = seed_todos(
+        todos_data=[
+            {"details": "Sent", "due_date": now - timedelta(minutes=1)},
+            {"details": "Failing", "due_date": now - timedelta(minutes=1)}
+        ]
+    )
+
+    reminders_wheel = TimingWheel(now=now.timestamp() - 120)
+
+    for todo_id in todo_ids:
+        reminders_wheel.schedule(key=(todo_id, ScheduleKind.TODO), due_at=now.timestamp() - 60, item=todo_id)
+
+    context = SimpleNamespace(bot=Bot(failing_details="Failing"), bot_data={"reminders_wheel": reminders_wheel})
+
+    run(dispatch_fired_reminders(context=context, reminders_wheel=reminders_wheel, now=now))
+
+    # The failed entry fires again when its claim expires
+    assert list(reminders_wheel.items) == [(todo_ids[1], ScheduleKind.TODO)]
+    assert reminders_wheel.advance(now=now.timestamp() + SCHEDULER_CLAIM_TIMEOUT - 60) == []
+    assert reminders_wheel.advance(now=now.timestamp() + SCHEDULER_CLAIM_TIMEOUT + 60) == [
+        ((todo_ids[1], ScheduleKind.TODO), todo_ids[1])
+    ]
+
+
+def test_empty_wheel_is_used(run, seed_todos):
+
+    now = datetime.now(UTC)
+
+    _, todo_ids = seed_todos(todos_data=[{"details": "Due", "due_date": now - timedelta(minutes=1)}])
+
+    reminders_wheel = TimingWheel(now=now.timestamp())
+
+    context = SimpleNamespace(bot=Bot(failing_details="Failing"), bot_data={"reminders_wheel": reminders_wheel})
+
+    # The entries not in the (empty) wheel aren't claimed from the db
+    run(dispatch_reminders_job(context=context))
+
+    assert retrieve_entries(run, todo_ids=todo_ids) == [(todo_ids[0], ScheduleKind.TODO, ScheduleState.PENDING)]
+
+    # And the new entries are scheduled in it
+    schedule_reminder(
+        bot_data=context.bot_data, todo_id=todo_ids[0], kind=ScheduleKind.REMINDER, due_at=now + timedelta(hours=1)
+    )
+
+    assert list(reminders_wheel.items) == [(todo_ids[0], ScheduleKind.REMINDER)]
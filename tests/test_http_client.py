@@ -0,0 +1,97 @@
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import sleep
+
+import pytest
+from clients.http import HTTP_MAX_CONNECTIONS_PER_HOST, close_http_client, http_get
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    # Keep-alive HTTP/1.1 server, recording the client connections
+    # and the number of requests in progress at the same time
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+
+        server = self.server
+
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.in_progress += 1
+            server.max_in_progress = max(server.max_in_progress, server.in_progress)
+
+        # Slow down the responses, so that the concurrent requests overlap
+        sleep(server.delay)
+
+        with server.lock:
+            server.in_progress -= 1
+
+        body: bytes = b"ok"
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(run):
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.lock = Lock()
+    server.connections = set()
+    server.in_progress = 0
+    server.max_in_progress = 0
+    server.delay = 0
+
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    # Close the shared client first, so the server threads aren't kept busy
+    run(close_http_client())
+
+    server.shutdown()
+    server.server_close()
+
+
+def get_url(server) -> str:
+
+    host, port = server.server_address
+
+    return f"http://{host}:{port}/"
+
+
+def test_sequential_requests_reuse_one_connection(run, server):
+
+    async def send_requests():
+        return [await http_get(url=get_url(server)) for _ in range(20)]
+
+    responses = run(send_requests())
+
+    assert all(response.status_code == 200 for response in responses)
+    assert len(server.connections) == 1
+
+
+def test_concurrent_requests_are_bounded_per_host(run, server):
+
+    server.delay = 0.05
+
+    async def send_requests():
+        return await asyncio.gather(
+            *(http_get(url=get_url(server)) for _ in range(HTTP_MAX_CONNECTIONS_PER_HOST * 3))
+        )
+
+    responses = run(send_requests())
+
+    assert all(response.status_code == 200 for response in responses)
+    assert server.max_in_progress <= HTTP_MAX_CONNECTIONS_PER_HOST
+
+    # The connections are pooled, not opened once per request
+    assert len(server.connections) <= HTTP_MAX_CONNECTIONS_PER_HOST
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, UTC
+
+import jobs.backfill_locations_job as backfill_locations_job
+import pytest
+from jobs.backfill_locations_job import GEOCODING_RETRY_DELAY, resolve_location_address
+from models.location.crud.create import create_location
+from models.location.crud.retrieve import retrieve_locations_without_address
+from models.user.crud.create import create_user
+from models.user.crud.retrieve import retrieve_user_record
+
+USER_TELEGRAM_ID: int = 1009
+
+
+@pytest.fixture(scope="module")
+def location_id(session_loop):
+
+    async def create_location_data():
+
+        user_id = await create_user(
+            user_data={"first_name": "Test", "telegram_id": USER_TELEGRAM_ID}
+        )
+
+        return await create_location(
+            location_data={"user_id": user_id, "latitude": 41.9, "longitude": 12.5}
+        )
+
+    return session_loop.run_until_complete(create_location_data())
+
+
+def get_unresolved_ids(run, retry_before: datetime) -> set:
+
+    locations = run(retrieve_locations_without_address(retry_before=retry_before, limit=100))
+
+    return {location.id for location in locations}
+
+
+def test_failed_lookups_are_retried_with_backoff(run, monkeypatch, location_id):
+
+    async def failing_reverse_geocode(latitude, longitude):
+        raise TimeoutError()
+
+    monkeypatch.setattr(backfill_locations_job, "reverse_geocode", failing_reverse_geocode)
+
+    now = datetime.now(UTC)
+
+    # The failures are recorded, and the address is left empty
+    for attempt in range(1, 3):
+        address = run(
+            resolve_location_address(
+                location_id=location_id,
+                latitude=41.9,
+                longitude=12.5,
+                geocoding_attempts=attempt - 1
+            )
+        )
+
+        assert address is None
+
+    location = run(retrieve_user_record(user_telegram_id=USER_TELEGRAM_ID)).location
+
+    assert location.city is None
+    assert location.geocoding_attempts == 2
+
+    # The location is skipped until its (doubled) retry delay has passed
+    assert location_id not in get_unresolved_ids(run, retry_before=now)
+    assert location_id in get_unresolved_ids(
+        run, retry_before=now + timedelta(seconds=GEOCODING_RETRY_DELAY * 2 + 60)
+    )
+
+
+def test_resolved_address_clears_the_failures(run, monkeypatch, location_id):
+
+    async def reverse_geocode(latitude, longitude):
+        return {"city": "Rome", "country": "Italy"}
+
+    monkeypatch.setattr(backfill_locations_job, "reverse_geocode", reverse_geocode)
+
+    address = run(
+        resolve_location_address(
+            location_id=location_id,
+            latitude=41.9,
+            longitude=12.5,
+            geocoding_attempts=2
+        )
+    )
+
+    location = run(retrieve_user_record(user_telegram_id=USER_TELEGRAM_ID)).location
+
+    assert address["city"] == location.city == "Rome"
+    assert location.geocoding_attempts is None
+    assert location_id not in get_unresolved_ids(
+        run, retry_before=datetime.now(UTC) + timedelta(days=30)
+    )
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, UTC
+from uuid import uuid4
+
+from database.migrations import run_migrations
+from models.base.base import Base
+from models.reminder.reminder import Reminder
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
+from models.todo.todo import Todo
+from models.user.user import User
+from sqlalchemy import create_engine, insert, inspect, select, text
+
+
+def test_schedule_entries_are_created_once_with_their_table(tmp_path):
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.sqlite'}")
+    due_date = datetime.now(UTC) + timedelta(days=1)
+    user_id, todo_id, done_todo_id = uuid4(), uuid4(), uuid4()
+
+    # A db created before the schedule was stored in it
+    with engine.begin() as connection:
+
+        Base.metadata.create_all(
+            connection,
+            tables=[table for table in Base.metadata.sorted_tables if table.name != "schedule_entries"]
+        )
+
+        connection.execute(insert(User).values(id=user_id, first_name="Test", telegram_id=1021))
+        connection.execute(
+            insert(Todo),
+            [
+                {
+                    "id": todo_id, "user_id": user_id, "details": "Todo",
+                    "due_date": due_date, "utc_offset": 0, "done": False
+                },
+                {
+                    "id": done_todo_id, "user_id": user_id, "details": "Done",
+                    "due_date": due_date, "utc_offset": 0, "done": True
+                }
+            ]
+        )
+        connection.execute(
+            insert(Reminder).values(todo_id=todo_id, name="Reminder", remind_at=due_date - timedelta(hours=1))
+        )
+
+    # The migrations run at every start, but the entries are created only the first time
+    for _ in range(2):
+        with engine.begin() as connection:
+            run_migrations(connection)
+
+    with engine.connect() as connection:
+
+        assert inspect(connection).has_table("schedule_entries")
+
+        entries: list = connection.execute(
+            select(ScheduleEntry.todo_id, ScheduleEntry.kind, ScheduleEntry.chat_id)
+        ).all()
+
+    assert sorted(entries) == sorted(
+        [(todo_id, ScheduleKind.TODO, 1021), (todo_id, ScheduleKind.REMINDER, 1021)]
+    )
+
+
+def test_missing_indexes_are_created_in_existing_tables(tmp_path):
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.sqlite'}")
+
+    # A db created before the indexes were added to the models
+    with engine.begin() as connection:
+
+        Base.metadata.create_all(connection)
+
+        connection.execute(text("DROP INDEX ix_todos_user_id_done_due_date"))
+        connection.execute(text("DROP INDEX ix_reminders_remind_at"))
+        connection.execute(text("CREATE INDEX ix_schedule_entries_due_at ON schedule_entries (due_at)"))
+
+    for _ in range(2):
+        with engine.begin() as connection:
+            run_migrations(connection)
+
+    with engine.connect() as connection:
+
+        inspector = inspect(connection)
+
+        todos_indexes: set = {index["name"] for index in inspector.get_indexes("todos")}
+        reminders_indexes: set = {index["name"] for index in inspector.get_indexes("reminders")}
+        schedule_indexes: set = {index["name"] for index in inspector.get_indexes("schedule_entries")}
+
+    assert {"ix_todos_user_id_done_due_date", "ix_todos_done_due_date"} <= todos_indexes
+    assert {"ix_reminders_remind_at", "ix_reminders_todo_id"} <= reminders_indexes
+
+    # The single column index on the due time is covered by the (state, due time) one
+    assert "ix_schedule_entries_state_due_at" in schedule_indexes
+    assert "ix_schedule_entries_due_at" not in schedule_indexes
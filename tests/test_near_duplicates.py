@@ -0,0 +1,76 @@
+from pathlib import Path
+
+from handlers.command.news import filter_news
+from handlers.utils.near_duplicates import find_unique, get_lsh_parameters
+from handlers.utils.news_extraction import extract_news_with_lxml
+
+# Saved Google News page, with some headlines reworded by different sources
+NEWS_PAGE_PATH = Path(__file__).resolve().parent / "fixtures" / "news" / "local_news.html"
+
+REWORDED_HEADLINES: list = [
+    "Sciopero dei trasporti a Milano, metro chiusa dalle 18",
+    "Derby Inter-Milan: finisce 2-2 a San Siro",
+    "Allerta gialla per maltempo in Lombardia domani",
+    "Aperte le ultime stazioni della M4, ecco gli orari",
+    "Case a Milano, prezzi in crescita del 4% in un anno",
+    "Studenti in tenda davanti al Politecnico contro il caro affitti",
+    "Treni soppressi tra Bergamo e Milano per un guasto"
+]
+
+
+def test_reworded_headlines_are_removed() -> None:
+
+    news_list: list = extract_news_with_lxml(content=NEWS_PAGE_PATH.read_bytes(), limit=100)
+    titles: list = [title for title, _, _ in news_list]
+
+    unique_indexes: list = find_unique(texts=titles, threshold=0.5)
+
+    # The first of every group of near-duplicates is kept (in order), and only the rewordings are removed
+    assert unique_indexes == sorted(unique_indexes)
+    assert [title for index, title in enumerate(titles) if index not in unique_indexes] == REWORDED_HEADLINES
+
+
+def test_case_and_punctuation_are_ignored() -> None:
+
+    titles: list = [
+        "Linate, voli in ritardo per la nebbia",
+        "LINATE: voli in ritardo per la nebbia!",
+        "Malpensa, voli in orario nonostante la nebbia"
+    ]
+
+    assert find_unique(texts=titles, threshold=0.9) == [0, 2]
+
+
+def test_threshold_is_configurable() -> None:
+
+    titles: list = [
+        "Prezzi delle case a Milano: +4% in un anno",
+        "Case a Milano, prezzi in crescita del 4% in un anno"
+    ]
+
+    # The Jaccard similarity of their shingles is about 0.58
+    assert find_unique(texts=titles, threshold=0.4) == [0]
+    assert find_unique(texts=titles, threshold=0.8) == [0, 1]
+
+
+def test_lsh_parameters_split_the_whole_signature() -> None:
+
+    for threshold in (0.2, 0.4, 0.5, 0.8):
+
+        bands, rows = get_lsh_parameters(threshold=threshold)
+
+        assert bands * rows == 64
+
+
+def test_filter_news_compares_the_titles_only() -> None:
+
+    news_list: list = [
+        ["Smog, blocco dei diesel Euro 5 da lunedì", "https://news.google.com/read/a", "2026-10-18T08:00:00Z"],
+        ["Smog: blocco dei diesel Euro 5 da lunedì", "https://news.google.com/read/b", "2026-10-18T09:00:00Z"],
+        ["Idroscalo, riapre la spiaggia", "https://news.google.com/read/c", "2026-10-18T08:00:00Z"],
+        ["Bosco Verticale, 10 anni dopo", "https://news.google.com/read/d", "2026-10-18T10:00:00Z"]
+    ]
+
+    # The news with the same datetime (but different titles) are kept, and sorted by datetime
+    assert filter_news(news_list=news_list) == [news_list[3], news_list[0], news_list[2]]
+    assert filter_news(news_list=news_list, count=1) == [news_list[3]]
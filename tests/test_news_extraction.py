@@ -0,0 +1,91 @@
+import logging
+from pathlib import Path
+
+import handlers.utils.news_extraction as news_extraction
+import pytest
+from handlers.utils.news_extraction import extract_news, extract_news_with_lxml, extract_news_with_soup
+from lxml.etree import HTMLPullParser
+
+# Saved Google News pages
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures" / "news"
+
+
+@pytest.fixture(scope="module")
+def news_page() -> bytes:
+    return (FIXTURES_PATH / "local_news.html").read_bytes()
+
+
+@pytest.mark.parametrize("extractor", [extract_news_with_lxml, extract_news_with_soup])
+def test_extractors_read_the_articles(news_page: bytes, extractor) -> None:
+
+    news_list: list = extractor(content=news_page, limit=100)
+
+    # The articles without a datetime, and the c-wiz tags of other kinds, are skipped
+    assert len(news_list) == 39
+    assert news_list[0] == [
+        "Milano, sciopero dei trasporti: metro chiusa dalle 18",
+        "https://news.google.com/read/CBMi0000Abc?hl=it&gl=IT",
+        "2026-10-18T12:08:00Z"
+    ]
+    assert "Palazzo Reale, mostra su Picasso & Matisse" in [title for title, _, _ in news_list]
+    assert "Linate, voli in ritardo per la nebbia" not in [title for title, _, _ in news_list]
+
+
+def test_extractors_agree(news_page: bytes) -> None:
+    assert extract_news_with_lxml(content=news_page, limit=100) == extract_news_with_soup(content=news_page, limit=100)
+
+
+@pytest.mark.parametrize("extractor", [extract_news_with_lxml, extract_news_with_soup])
+def test_page_without_news(extractor) -> None:
+    assert extractor(content=(FIXTURES_PATH / "no_news.html").read_bytes(), limit=100) == []
+
+
+def test_lxml_extractor_stops_after_the_limit(monkeypatch, news_page: bytes) -> None:
+
+    fed: list = []
+
+    class CountingHTMLPullParser(HTMLPullParser):
+
+        def feed(self, data) -> None:
+            fed.append(len(data))
+            super().feed(data)
+
+    monkeypatch.setattr(news_extraction, "HTMLPullParser", CountingHTMLPullParser)
+    monkeypatch.setattr(news_extraction, "CHUNK_SIZE", 1024)
+
+    news_list: list = extract_news_with_lxml(content=news_page, limit=5)
+
+    assert news_list == extract_news_with_soup(content=news_page, limit=5)
+
+    # The rest of the page is not parsed
+    assert sum(fed) < len(news_page) / 4
+
+
+def test_failed_lxml_extraction_falls_back_to_soup(monkeypatch, caplog, news_page: bytes) -> None:
+
+    def failing_extract_news_with_lxml(content: bytes, limit: int) -> list:
+        raise ValueError()
+
+    monkeypatch.setattr(news_extraction, "extract_news_with_lxml", failing_extract_news_with_lxml)
+
+    with caplog.at_level(logging.WARNING):
+        news_list: list = extract_news(content=news_page, limit=10, url="https://news.google.com/search?q=Milano")
+
+    assert news_list == extract_news_with_soup(content=news_page, limit=10)
+    assert "lxml extraction failed for https://news.google.com/search?q=Milano" in caplog.text
+
+
+@pytest.mark.parametrize("setting", ["extractor", "lxml"])
+def test_soup_extractor_is_used_when_lxml_is_disabled_or_missing(monkeypatch, news_page: bytes, setting: str) -> None:
+
+    if setting == "extractor":
+        monkeypatch.setattr(news_extraction, "NEWS_EXTRACTOR", "soup")
+    else:
+        monkeypatch.setattr(news_extraction, "HTMLPullParser", None)
+
+    def unexpected_extract_news_with_lxml(content: bytes, limit: int) -> list:
+        raise AssertionError()
+
+    monkeypatch.setattr(news_extraction, "extract_news_with_lxml", unexpected_extract_news_with_lxml)
+
+    assert extract_news(content=news_page, limit=10) == extract_news_with_soup(content=news_page, limit=10)
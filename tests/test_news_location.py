@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import handlers.command.news as news
+import jobs.backfill_locations_job as backfill_locations_job
+import pytest
+from models.location.crud.create import create_location
+from models.location.crud.update import update_location
+from models.user.cache import user_cache
+from models.user.crud.create import create_user
+from models.user.crud.retrieve import retrieve_user_record
+
+
+class JobQueue:
+
+    # Stand-in of the job queue of a process running the backfill job
+    def __init__(self, runs_backfill: bool) -> None:
+        self.jobs: dict = {"backfill_locations_job": [object()]} if runs_backfill else {}
+        self.queued: list = []
+
+    def get_jobs_by_name(self, name: str) -> list:
+        return self.jobs.get(name, [])
+
+    def run_once(self, callback, when, name: str) -> None:
+        self.jobs[name] = [callback]
+        self.queued.append(name)
+
+
+class Bot:
+
+    def __init__(self) -> None:
+        self.texts: list = []
+
+    async def send_chat_action(self, chat_id: int, action: str) -> None:
+        pass
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        self.texts.append(text)
+
+
+@pytest.fixture
+def create_user_location(run):
+
+    async def create_user_location_data(telegram_id: int) -> object:
+
+        user_id = await create_user(user_data={"first_name": "Test", "telegram_id": telegram_id})
+
+        return await create_location(location_data={"user_id": user_id, "latitude": 45.46, "longitude": 9.19})
+
+    return lambda telegram_id: run(create_user_location_data(telegram_id=telegram_id))
+
+
+@pytest.fixture(autouse=True)
+def no_geocoding(monkeypatch):
+
+    # The /news command never resolves an address itself
+    async def reverse_geocode(latitude, longitude):
+        raise AssertionError("geocoding on the /news path")
+
+    monkeypatch.setattr(backfill_locations_job, "reverse_geocode", reverse_geocode)
+
+
+def get_context(telegram_id: int, runs_backfill: bool) -> SimpleNamespace:
+    return SimpleNamespace(
+        bot=Bot(),
+        job=SimpleNamespace(user_id=telegram_id, chat_id=telegram_id),
+        job_queue=JobQueue(runs_backfill=runs_backfill)
+    )
+
+
+def test_news_reads_the_address_resolved_by_another_worker(run, monkeypatch, create_user_location):
+
+    location_id = create_user_location(telegram_id=1109)
+
+    # The record is cached without address, and the address is then saved by another worker
+    # (which invalidates its own cache only)
+    stale_user_record = run(retrieve_user_record(user_telegram_id=1109))
+    run(update_location(location_id=location_id, location_data={"city": "Milan", "country": "Italy"}))
+    user_cache.set(1109, stale_user_record)
+
+    urls: list = []
+
+    async def get_cached_local_news(url: str) -> list:
+        urls.append(url)
+
+        return [("Title", "https://example.com", None)]
+
+    monkeypatch.setattr(news, "get_cached_local_news", get_cached_local_news)
+
+    context = get_context(telegram_id=1109, runs_backfill=True)
+    run(news.get_local_news_job(context=context))
+
+    assert "Milan" in urls[0]
+    assert "Title" in context.bot.texts[-1]
+    assert context.job_queue.queued == []
+
+
+@pytest.mark.parametrize("runs_backfill", [True, False])
+def test_news_enqueues_the_backfill_of_an_unresolved_address(run, create_user_location, runs_backfill):
+
+    telegram_id: int = 1209 if runs_backfill else 1309
+    create_user_location(telegram_id=telegram_id)
+
+    context = get_context(telegram_id=telegram_id, runs_backfill=runs_backfill)
+
+    # Requested twice, the backfill is queued (in the process running it) only once
+    for _ in range(2):
+        run(news.get_local_news_job(context=context))
+
+    assert "still being resolved" in context.bot.texts[-1]
+    assert context.job_queue.queued == (["backfill_locations_now_job"] if runs_backfill else [])
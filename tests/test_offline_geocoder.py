@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+from math import dist
+from random import Random
+
+import geocoding.reverse
+from geocoding.offline import OfflineGeocoder, to_unit_vector
+from geocoding.reverse import load_offline_geocoder
+
+
+def write_dataset(path, seed: int, size: int = 2000) -> list:
+
+    random = Random(seed)
+
+    rows: list = [
+        (f"City {seed}-{index}", f"Country {index % 7}", random.uniform(-80, 80), random.uniform(-180, 180))
+        for index in range(size)
+    ]
+
+    path.write_text(
+        "city,country,latitude,longitude\n"
+        + "".join(f"{city},{country},{latitude},{longitude}\n" for city, country, latitude, longitude in rows),
+        encoding="utf-8"
+    )
+
+    return rows
+
+
+def find_nearest(rows: list, latitude: float, longitude: float) -> str:
+
+    query: tuple = to_unit_vector(latitude=latitude, longitude=longitude)
+
+    return min(rows, key=lambda row: dist(query, to_unit_vector(latitude=row[2], longitude=row[3])))[0]
+
+
+def test_lookup_matches_a_linear_scan(tmp_path):
+
+    dataset = tmp_path / "cities.csv"
+    rows: list = write_dataset(path=dataset, seed=1)
+
+    geocoder = OfflineGeocoder.load(dataset_path=str(dataset), max_distance_km=20000)
+    random = Random(2)
+
+    for _ in range(200):
+
+        latitude, longitude = random.uniform(-90, 90), random.uniform(-180, 180)
+
+        assert geocoder.lookup(latitude=latitude, longitude=longitude)["city"] == find_nearest(
+            rows=rows, latitude=latitude, longitude=longitude
+        )
+
+
+def test_concurrent_loads_build_the_index_once(tmp_path):
+
+    dataset = tmp_path / "cities.csv"
+    rows: list = write_dataset(path=dataset, seed=3)
+    city, _, latitude, longitude = rows[0]
+
+    # Every load opens its own lock file, so the loads in different threads
+    # are serialized as the ones in different processes
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        geocoders: list = list(
+            executor.map(
+                lambda _: OfflineGeocoder.load(dataset_path=str(dataset), max_distance_km=30),
+                range(8)
+            )
+        )
+
+    assert all(
+        geocoder.lookup(latitude=latitude, longitude=longitude)["city"] == city
+        for geocoder in geocoders
+    )
+
+    # A single index folder (and the lock file) next to the dataset
+    indexes_path = tmp_path / "cities.csv.index"
+
+    assert len([path for path in indexes_path.iterdir() if path.name != ".lock"]) == 1
+
+
+def test_changed_dataset_gets_a_new_index(tmp_path):
+
+    dataset = tmp_path / "cities.csv"
+    outdated_rows: list = write_dataset(path=dataset, seed=4)
+    outdated_city, _, outdated_latitude, outdated_longitude = outdated_rows[0]
+
+    outdated_geocoder = OfflineGeocoder.load(dataset_path=str(dataset), max_distance_km=30)
+
+    rows: list = write_dataset(path=dataset, seed=5)
+    city, _, latitude, longitude = rows[0]
+
+    geocoder = OfflineGeocoder.load(dataset_path=str(dataset), max_distance_km=30)
+
+    assert geocoder.lookup(latitude=latitude, longitude=longitude)["city"] == city
+
+    # The outdated index is removed, but it can still be read by who has it open
+    assert len([path for path in (tmp_path / "cities.csv.index").iterdir() if path.name != ".lock"]) == 1
+    assert outdated_geocoder.lookup(
+        latitude=outdated_latitude, longitude=outdated_longitude
+    )["city"] == outdated_city
+
+
+def test_missing_dataset_falls_back_to_nominatim(run, tmp_path, monkeypatch, caplog):
+
+    monkeypatch.setattr(geocoding.reverse, "GEOCODER", "offline")
+    monkeypatch.setattr(geocoding.reverse, "OFFLINE_GEOCODER_DATASET", str(tmp_path / "cities.csv"))
+    monkeypatch.setattr(geocoding.reverse, "offline_geocoder", None)
+
+    # The bot starts anyway, without the offline geocoder
+    run(load_offline_geocoder())
+
+    assert geocoding.reverse.offline_geocoder is None
+    assert "not found" in caplog.text
+
+
+def test_dataset_is_loaded_when_enabled(run, tmp_path, monkeypatch):
+
+    dataset = tmp_path / "cities.csv"
+    write_dataset(path=dataset, seed=6)
+
+    monkeypatch.setattr(geocoding.reverse, "GEOCODER", "offline")
+    monkeypatch.setattr(geocoding.reverse, "OFFLINE_GEOCODER_DATASET", str(dataset))
+    monkeypatch.setattr(geocoding.reverse, "offline_geocoder", None)
+
+    run(load_offline_geocoder())
+
+    assert isinstance(geocoding.reverse.offline_geocoder, OfflineGeocoder)
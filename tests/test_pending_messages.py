@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, UTC
+from itertools import count
+
+import cache.ttl_cache
+import jobs.cleanup_pending_messages_job
+from cache.ttl_cache import TTLCache
+from database.db import SessionLocal
+from jobs.cleanup_pending_messages_job import cleanup_pending_messages_job
+from models.pending_message.cache import pending_message_cache
+from models.pending_message.crud.create import create_pending_messages
+from models.pending_message.crud.retrieve import retrieve_pending_message_todo_id
+from models.pending_message.pending_message import PendingMessage
+from models.todo.crud.update import complete_todo
+from sqlalchemy import select
+
+# Every test message gets its own id
+MESSAGE_IDS = count(start=1)
+
+
+def seed_pending_messages(run, seed_todos, todos_count: int) -> tuple:
+
+    # Create the todos, with a pending message each
+    chat_id, todo_ids = seed_todos(
+        todos_data=[
+            {"details": f"Todo {index}", "due_date": datetime.now(UTC) + timedelta(days=1)}
+            for index in range(todos_count)
+        ]
+    )
+
+    pending_messages_data: list = [
+        {"chat_id": chat_id, "message_id": next(MESSAGE_IDS), "todo_id": todo_id} for todo_id in todo_ids
+    ]
+
+    assert run(create_pending_messages(pending_messages_data=pending_messages_data)) == todos_count
+
+    return todo_ids, pending_messages_data
+
+
+def retrieve_expires_at(run, todo_ids: list) -> list:
+
+    async def retrieve_todo_expires_at() -> list:
+        async with SessionLocal() as session:
+            return list(
+                await session.scalars(select(PendingMessage.expires_at).where(PendingMessage.todo_id.in_(todo_ids)))
+            )
+
+    return run(retrieve_todo_expires_at())
+
+
+def test_pending_messages_are_looked_up_in_the_cache_first(run, statements, seed_todos):
+
+    todo_ids, [pending_message_data] = seed_pending_messages(run, seed_todos, todos_count=1)
+
+    key: tuple = (pending_message_data["chat_id"], pending_message_data["message_id"])
+
+    # Cached when created
+    statements.clear()
+
+    assert run(retrieve_pending_message_todo_id(*key)) == todo_ids[0]
+    assert statements == []
+
+    # Read from the db (once) when evicted
+    pending_message_cache.pop(key)
+
+    assert run(retrieve_pending_message_todo_id(*key)) == todo_ids[0]
+    assert run(retrieve_pending_message_todo_id(*key)) == todo_ids[0]
+    assert len(statements) == 1
+
+
+def test_unknown_messages_are_not_cached(run, seed_todos):
+
+    chat_id, [todo_id] = seed_todos(todos_data=[{"details": "Todo", "due_date": datetime.now(UTC)}])
+    message_id: int = next(MESSAGE_IDS)
+
+    # A reaction to a message that's not saved yet
+    assert run(retrieve_pending_message_todo_id(chat_id, message_id)) is None
+    assert (chat_id, message_id) not in pending_message_cache
+
+    # Found once it's saved (by another worker, without touching this cache)
+    async def create_pending_message() -> None:
+        async with SessionLocal() as session:
+            session.add(PendingMessage(chat_id=chat_id, message_id=message_id, todo_id=todo_id))
+            await session.commit()
+
+    run(create_pending_message())
+
+    assert run(retrieve_pending_message_todo_id(chat_id, message_id)) == todo_id
+
+
+def test_cache_entries_expire_and_are_evicted_by_last_use(monkeypatch):
+
+    now: list = [0.0]
+    monkeypatch.setattr(cache.ttl_cache, "monotonic", lambda: now[0])
+
+    lookup_cache = TTLCache(maxsize=2, ttl=10)
+
+    lookup_cache.set("first", 1)
+    lookup_cache.set("second", 2)
+
+    # Using the first entry makes the second one the least recently used
+    assert lookup_cache.get("first") == 1
+
+    lookup_cache.set("third", 3)
+
+    assert "second" not in lookup_cache
+    assert lookup_cache.get("first") == 1
+    assert lookup_cache.get("third") == 3
+
+    # Every entry expires after its time-to-live
+    now[0] = 10.0
+
+    assert lookup_cache.get("first") is None
+    assert lookup_cache.stats == {"hits": 3, "misses": 1, "hit_ratio": 0.75, "size": 1, "maxsize": 2}
+
+
+def test_pending_messages_expire_when_the_todo_is_completed(run, seed_todos):
+
+    todo_ids, _ = seed_pending_messages(run, seed_todos, todos_count=2)
+
+    messages_expire_at: datetime = datetime.now(UTC) + timedelta(days=1)
+
+    assert run(complete_todo(todo_id=todo_ids[0], messages_expire_at=messages_expire_at)) is not None
+
+    # Only the messages of the completed todo expire
+    [expires_at] = retrieve_expires_at(run, todo_ids=todo_ids[:1])
+
+    assert expires_at.replace(tzinfo=None) == messages_expire_at.replace(tzinfo=None)
+    assert retrieve_expires_at(run, todo_ids=todo_ids[1:]) == [None]
+
+def test_cleanup_pending_messages_job_deletes_the_expired_messages_in_batches(run, statements, monkeypatch, seed_todos):
+
+    monkeypatch.setattr(jobs.cleanup_pending_messages_job, "PENDING_MESSAGES_CLEANUP_BATCH_SIZE", 2)
+
+    # Delete the messages expired in the previous tests first
+    run(cleanup_pending_messages_job(context=None))
+
+    todo_ids, _ = seed_pending_messages(run, seed_todos, todos_count=6)
+
+    for todo_id in todo_ids[:5]:
+        run(complete_todo(todo_id=todo_id, messages_expire_at=datetime.now(UTC) - timedelta(seconds=1)))
+
+    statements.clear()
+
+    run(cleanup_pending_messages_job(context=None))
+
+    # The expired messages are deleted 2 at a time (2 + 2 + 1)
+    assert sum(statement.startswith("DELETE FROM pending_messages") for statement in statements) == 3
+
+    # The message of the open todo is kept
+    assert retrieve_expires_at(run, todo_ids=todo_ids) == [None]
@@ -0,0 +1,82 @@
+from asyncio import gather, sleep
+
+from clients.rate_limiter import Priority, PriorityRateLimiter
+
+
+def send_all(run, limiter: PriorityRateLimiter, requests: list) -> list:
+
+    # Send the requests, as (label, chat id, priority, delay before sending),
+    # returning the labels in the order they're sent
+    sent: list = []
+
+    async def send(label: str, chat_id: int, priority: Priority, delay: float) -> None:
+
+        await sleep(delay)
+
+        async def callback() -> bool:
+            sent.append(label)
+
+            return True
+
+        await limiter.process_request(
+            callback=callback, args=(), kwargs={}, endpoint="sendMessage",
+            data={"chat_id": chat_id, "text": label}, rate_limit_args=priority
+        )
+
+    async def send_requests() -> None:
+        await gather(*[send(*request) for request in requests])
+        await limiter.shutdown()
+
+    run(send_requests())
+
+    return sent
+
+
+def test_interactive_reply_overtakes_the_queued_reminders_of_its_chat(run):
+
+    # The chat bucket is the bottleneck: 50 messages per second, 50 in a burst
+    limiter = PriorityRateLimiter(global_rate=1000, chat_rate=50)
+
+    sent: list = send_all(
+        run,
+        limiter=limiter,
+        requests=[
+            *[(f"reminder {index}", 1, Priority.BACKGROUND, 0) for index in range(100)],
+            ("reply", 1, Priority.INTERACTIVE, 0.01)
+        ]
+    )
+
+    # The reply waits only for the burst (and the next token), not for the 50 queued reminders
+    assert sent.index("reply") <= 52
+    assert [label for label in sent if label != "reply"] == [f"reminder {index}" for index in range(100)]
+
+
+def test_interactive_reply_overtakes_the_queued_reminders_of_other_chats(run):
+
+    # The global bucket is the bottleneck: 50 messages per second, 50 in a burst
+    limiter = PriorityRateLimiter(global_rate=50, chat_rate=1000)
+
+    sent: list = send_all(
+        run,
+        limiter=limiter,
+        requests=[
+            *[(f"reminder {index}", 1000 + index, Priority.BACKGROUND, 0) for index in range(100)],
+            ("reply", 1, Priority.INTERACTIVE, 0.01)
+        ]
+    )
+
+    assert sent.index("reply") <= 52
+
+
+def test_requests_of_the_same_priority_are_sent_in_order(run):
+
+    limiter = PriorityRateLimiter(global_rate=1000, chat_rate=50)
+
+    sent: list = send_all(
+        run,
+        limiter=limiter,
+        requests=[(f"reply {index}", 1, Priority.INTERACTIVE, 0) for index in range(100)]
+    )
+
+    assert sent == [f"reply {index}" for index in range(100)]
+    assert limiter.stats["sent"] == 100
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, UTC
+
+from database.db import SessionLocal
+from jobs.dispatch_reminders_job import SCHEDULER_CLAIM_TIMEOUT, SCHEDULER_GRACE_PERIOD
+from models.schedule.crud.delete import delete_missed_schedule_entries
+from models.schedule.crud.update import claim_due_schedule_entries
+from models.schedule.schedule import ScheduleEntry, ScheduleKind
+from sharding.shard import Shard
+from sqlalchemy import select
+
+
+def claim(run, now: datetime, todo_ids: list, shard: Shard | None = None) -> list:
+    return run(
+        claim_due_schedule_entries(
+            due_after=now - timedelta(seconds=SCHEDULER_GRACE_PERIOD),
+            due_until=now,
+            claimed_before=now - timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT),
+            limit=100,
+            shard=shard,
+            todo_ids=todo_ids
+        )
+    )
+
+
+def retrieve_entries(run, todo_ids: list) -> list:
+
+    async def retrieve_todo_entries() -> list:
+        async with SessionLocal() as session:
+            return (
+                await session.execute(
+                    select(ScheduleEntry.todo_id, ScheduleEntry.created_at)
+                    .where(ScheduleEntry.todo_id.in_(todo_ids))
+                )
+            ).all()
+
+    return run(retrieve_todo_entries())
+
+
+def test_claims_only_the_due_entries_by_due_time(run, seed_todos):
+
+    now = datetime.now(UTC)
+
+    # Created in reverse order of due time
+    _, todo_ids = seed_todos(
+        todos_data=[
+            {"details": "Future", "due_date": now + timedelta(minutes=10)},
+            {"details": "Last", "due_date": now - timedelta(minutes=10)},
+            {"details": "First", "due_date": now - timedelta(minutes=30), "remind_at": now - timedelta(minutes=20)}
+        ]
+    )
+
+    due_entries: list = claim(run, now=now, todo_ids=todo_ids)
+
+    assert [(due_entry.details, due_entry.kind) for due_entry in due_entries] == [
+        ("First", ScheduleKind.TODO),
+        ("First", ScheduleKind.REMINDER),
+        ("Last", ScheduleKind.TODO)
+    ]
+
+    # The claimed entries aren't claimed again (until their claim expires)
+    assert claim(run, now=now, todo_ids=todo_ids) == []
+
+
+def test_claims_only_the_entries_of_the_shard(run, seed_todos):
+
+    now = datetime.now(UTC)
+    due_date = now - timedelta(minutes=1)
+
+    even_chat_id, even_todo_ids = seed_todos(todos_data=[{"details": "Even", "due_date": due_date}], telegram_id=210000)
+    odd_chat_id, odd_todo_ids = seed_todos(todos_data=[{"details": "Odd", "due_date": due_date}], telegram_id=210001)
+
+    todo_ids: list = even_todo_ids + odd_todo_ids
+
+    assert [entry.chat_id for entry in claim(run, now=now, todo_ids=todo_ids, shard=Shard(index=1, count=2))] == [
+        odd_chat_id
+    ]
+    assert [entry.chat_id for entry in claim(run, now=now, todo_ids=todo_ids, shard=Shard(index=0, count=2))] == [
+        even_chat_id
+    ]
+
+
+def test_entries_missed_for_longer_than_the_grace_period_are_dropped(run, seed_todos):
+
+    now = datetime.now(UTC)
+
+    _, todo_ids = seed_todos(
+        todos_data=[
+            {"details": "Missed", "due_date": now - timedelta(seconds=SCHEDULER_GRACE_PERIOD + 60)},
+            {"details": "Late", "due_date": now - timedelta(seconds=SCHEDULER_GRACE_PERIOD - 60)}
+        ]
+    )
+
+    run(delete_missed_schedule_entries(due_before=now - timedelta(seconds=SCHEDULER_GRACE_PERIOD)))
+
+    assert [todo_id for todo_id, _ in retrieve_entries(run, todo_ids=todo_ids)] == todo_ids[1:]
+
+    # The entries still within the grace period are delivered on recovery
+    assert [due_entry.details for due_entry in claim(run, now=now, todo_ids=todo_ids)] == ["Late"]
+
+
+def test_expired_claims_are_claimed_again(run, seed_todos):
+
+    now = datetime.now(UTC)
+
+    _, todo_ids = seed_todos(todos_data=[{"details": "Crashed", "due_date": now - timedelta(minutes=1)}])
+
+    # Claimed by a dispatcher that stops before completing it
+    assert len(claim(run, now=now, todo_ids=todo_ids)) == 1
+
+    later = now + timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT - 1)
+
+    assert claim(run, now=later, todo_ids=todo_ids) == []
+
+    later = now + timedelta(seconds=SCHEDULER_CLAIM_TIMEOUT + 1)
+
+    assert [due_entry.details for due_entry in claim(run, now=later, todo_ids=todo_ids)] == ["Crashed"]
+
+
+def test_entries_are_stamped_when_created(run, seed_todos):
+
+    now = datetime.now(UTC)
+
+    _, first_todo_ids = seed_todos(todos_data=[{"details": "First", "due_date": now + timedelta(hours=1)}])
+    _, second_todo_ids = seed_todos(todos_data=[{"details": "Second", "due_date": now + timedelta(hours=1)}])
+
+    [(_, first_created_at)] = retrieve_entries(run, todo_ids=first_todo_ids)
+    [(_, second_created_at)] = retrieve_entries(run, todo_ids=second_todo_ids)
+
+    assert now.replace(tzinfo=None) <= first_created_at.replace(tzinfo=None) < second_created_at.replace(tzinfo=None)
@@ -0,0 +1,77 @@
+from asyncio import gather
+from itertools import count
+from zoneinfo import ZoneInfo
+
+import geocoding.timezone
+import handlers.conversation.todo
+from geocoding.timezone import resolve_timezone
+from handlers.conversation.todo import get_user_tzinfo
+from models.location.crud.create import create_location
+from models.user.crud.create import create_user
+from models.user.crud.retrieve import retrieve_user_record
+
+USER_TELEGRAM_ID: int = 1014
+
+
+def test_timezone_finder_is_created_once_and_shared(run, monkeypatch):
+
+    created = count()
+
+    class TimezoneFinderStub:
+
+        def __init__(self, in_memory: bool) -> None:
+            next(created)
+
+        def timezone_at(self, lat: float, lng: float) -> str:
+            return "Europe/Rome" if lng > 0 else "America/New_York"
+
+    monkeypatch.setattr(geocoding.timezone, "TimezoneFinder", TimezoneFinderStub)
+    monkeypatch.setattr(geocoding.timezone, "timezone_finder", None)
+
+    # Concurrent lookups (before the finder is created) and later ones
+    async def resolve_timezones() -> list:
+        return [
+            *await gather(*(resolve_timezone(latitude=41.9, longitude=12.5) for _ in range(10))),
+            await resolve_timezone(latitude=40.7, longitude=-74.0)
+        ]
+
+    assert run(resolve_timezones()) == 10 * ["Europe/Rome"] + ["America/New_York"]
+    assert next(created) == 1
+
+
+def test_missing_timezone_is_resolved_once_and_saved(run, monkeypatch):
+
+    resolved: list = []
+
+    async def resolve_timezone_stub(latitude: float, longitude: float) -> str:
+        resolved.append((latitude, longitude))
+
+        return "Europe/Rome"
+
+    monkeypatch.setattr(handlers.conversation.todo, "resolve_timezone", resolve_timezone_stub)
+
+    user_telegram_id: int = USER_TELEGRAM_ID
+
+    # A location saved before the timezone was stored
+    async def create_user_location() -> None:
+        user_id = await create_user(user_data={"first_name": "Test", "telegram_id": user_telegram_id})
+
+        await create_location(location_data={"user_id": user_id, "latitude": 41.9, "longitude": 12.5})
+
+    run(create_user_location())
+
+    assert run(get_user_tzinfo(user_telegram_id=user_telegram_id)) == ZoneInfo("Europe/Rome")
+    assert run(retrieve_user_record(user_telegram_id=user_telegram_id)).location.timezone == "Europe/Rome"
+
+    # The next to-dos use the saved timezone
+    assert run(get_user_tzinfo(user_telegram_id=user_telegram_id)) == ZoneInfo("Europe/Rome")
+    assert resolved == [(41.9, 12.5)]
+
+
+def test_user_without_location_has_no_timezone(run):
+
+    user_telegram_id: int = USER_TELEGRAM_ID + 100
+
+    run(create_user(user_data={"first_name": "Test", "telegram_id": user_telegram_id}))
+
+    assert run(get_user_tzinfo(user_telegram_id=user_telegram_id)) is None
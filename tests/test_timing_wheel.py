@@ -0,0 +1,68 @@
+from random import Random
+
+import pytest
+
+from scheduling.timing_wheel import TimingWheel
+
+
+def advance_reference(reference: dict, now: float, resolution: float) -> set:
+
+    # Fire every key due up to the end of the current tick
+    current_tick: int = int(now // resolution)
+
+    fired: set = {key for key, due_at in reference.items() if int(due_at // resolution) <= current_tick}
+
+    for key in fired:
+        del reference[key]
+
+    return fired
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_advance_matches_reference(seed: int) -> None:
+
+    random = Random(seed)
+
+    # Small levels, so the items cascade across all of them and the overflow
+    resolution: float = 60
+    now: float = random.uniform(0, 10 ** 9)
+
+    wheel = TimingWheel(now=now, resolution=resolution, slots=(8, 4, 3))
+    reference: dict = {}
+
+    for _ in range(2000):
+
+        operation: float = random.random()
+        key: int = random.randrange(200)
+
+        if operation < 0.5:
+
+            # Schedule (or reschedule) a key, also in the past and beyond the wheel
+            due_at: float = now + random.uniform(-5, 150) * resolution
+
+            wheel.schedule(key=key, due_at=due_at, item=key)
+            reference[key] = due_at
+
+        elif operation < 0.65:
+            assert wheel.cancel(key=key) == (reference.pop(key, None) is not None)
+
+        else:
+
+            # Advance by a random step, sometimes within the same tick
+            now += random.choice((0, random.uniform(0, resolution), random.uniform(0, 20 * resolution)))
+
+            fired: list = wheel.advance(now=now)
+
+            assert all(key == item for key, item in fired)
+            assert len(fired) == len({key for key, _ in fired})
+            assert {key for key, _ in fired} == advance_reference(reference=reference, now=now, resolution=resolution)
+
+        assert len(wheel) == len(reference)
+
+    # Everything left fires eventually
+    now += 200 * resolution
+
+    assert {key for key, _ in wheel.advance(now=now)} == advance_reference(
+        reference=reference, now=now, resolution=resolution
+    )
+    assert len(wheel) == 0
@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime, UTC
+from random import Random
+
+from telegram import Chat, Message, Update, User
+from updates.update_processor import PerUserUpdateProcessor
+
+MAX_CONCURRENT_UPDATES: int = 8
+USERS: int = 50
+UPDATES_PER_USER: int = 20
+
+
+def build_update(update_id: int, user_id: int) -> Update:
+
+    return Update(
+        update_id=update_id,
+        message=Message(
+            message_id=update_id,
+            date=datetime.now(UTC),
+            chat=Chat(id=user_id, type=Chat.PRIVATE),
+            from_user=User(id=user_id, first_name="Test", is_bot=False),
+            text="/todos"
+        )
+    )
+
+
+def test_updates_are_processed_in_order_per_user_and_concurrently_across_users(run):
+
+    random = Random(16)
+
+    # The updates of all the users, interleaved, as they'd arrive from Telegram
+    updates: list = [
+        build_update(update_id=sequence * USERS + user_id, user_id=user_id)
+        for sequence in range(UPDATES_PER_USER)
+        for user_id in range(1, USERS + 1)
+    ]
+
+    processed: dict = {user_id: [] for user_id in range(1, USERS + 1)}
+    in_progress: dict = {}
+    max_in_progress: list = [0]
+
+    async def handle(update: Update) -> None:
+
+        user_id: int = update.effective_user.id
+
+        # No two updates of the same user are ever processed at the same time
+        assert not in_progress.get(user_id)
+
+        in_progress[user_id] = True
+        max_in_progress[0] = max(max_in_progress[0], sum(in_progress.values()))
+
+        await asyncio.sleep(random.uniform(0, 0.002))
+
+        # A failing update doesn't stop the next ones of the same user
+        if update.update_id % 7 == 0:
+            in_progress[user_id] = False
+            raise ValueError()
+
+        processed[user_id].append(update.update_id)
+        in_progress[user_id] = False
+
+    async def process_updates(max_concurrent_updates: int) -> int:
+
+        processor = PerUserUpdateProcessor(max_concurrent_updates=max_concurrent_updates)
+        max_in_progress[0] = 0
+
+        # Every update gets its own task, as in the application
+        await asyncio.gather(
+            *(processor.process_update(update, handle(update)) for update in updates),
+            return_exceptions=True
+        )
+
+        # Return the peak number of updates processed at the same time
+        return max_in_progress[0]
+
+    peak_in_progress: int = run(process_updates(max_concurrent_updates=MAX_CONCURRENT_UPDATES))
+
+    for user_id, update_ids in processed.items():
+
+        expected: list = [
+            sequence * USERS + user_id
+            for sequence in range(UPDATES_PER_USER)
+            if (sequence * USERS + user_id) % 7
+        ]
+
+        assert update_ids == expected
+
+    # The users are served concurrently, up to the limit
+    # (with more users than the limit waiting, it's always reached)
+    assert peak_in_progress == MAX_CONCURRENT_UPDATES
+
+    # With a limit of one, the updates are processed one at a time
+    assert run(process_updates(max_concurrent_updates=1)) == 1
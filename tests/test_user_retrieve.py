@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from models.location.crud.create import create_location
+from models.todo.crud.create import create_todo
+from models.user.crud.create import create_user
+from models.user.crud.retrieve import retrieve_user
+from sqlalchemy.exc import InvalidRequestError
+
+USER_TELEGRAM_ID: int = 1002
+
+
+@pytest.fixture(scope="module")
+def user_id(session_loop):
+
+    async def create_user_data():
+
+        user_id = await create_user(
+            user_data={"first_name": "Test", "telegram_id": USER_TELEGRAM_ID}
+        )
+
+        await create_location(
+            location_data={"user_id": user_id, "latitude": 45.46, "longitude": 9.19}
+        )
+
+        for index in range(20):
+            await create_todo(
+                todo_data={
+                    "user_id": user_id,
+                    "details": f"Todo {index}",
+                    "due_date": datetime.now(UTC) + timedelta(days=index + 1),
+                    "utc_offset": 0
+                }
+            )
+
+        return user_id
+
+    return session_loop.run_until_complete(create_user_data())
+
+
+def test_retrieve_user_loads_no_relationships(run, statements, user_id):
+
+    user = run(retrieve_user(user_telegram_id=USER_TELEGRAM_ID))
+
+    assert user.id == user_id
+    assert len(statements) == 1
+
+    # The relationships are never loaded implicitly
+    with pytest.raises(InvalidRequestError):
+        user.location
+
+    with pytest.raises(InvalidRequestError):
+        user.todos
+
+
+def test_retrieve_user_with_location_uses_a_single_query(run, statements, user_id):
+
+    user = run(retrieve_user(user_telegram_id=USER_TELEGRAM_ID, with_location=True))
+
+    assert user.location.latitude == 45.46
+    assert len(statements) == 1
+
+
+def test_retrieve_user_with_todos_uses_one_query_per_relationship(run, statements, user_id):
+
+    user = run(
+        retrieve_user(user_telegram_id=USER_TELEGRAM_ID, with_location=True, with_todos=True)
+    )
+
+    # The to-dos are loaded with a single IN query, whatever their number
+    assert len(user.todos) == 20
+    assert len(statements) == 2